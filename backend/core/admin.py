@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Game, LibraryEntry, Review, Follow, ForumThread
+from .models import User, Game, LibraryEntry, Review, Follow, ForumPost, ForumThread, Job
 
 # Register your models here so they show up in the Admin Interface
 admin.site.register(User, UserAdmin)
@@ -9,3 +9,5 @@ admin.site.register(LibraryEntry)
 admin.site.register(Review)
 admin.site.register(Follow)
 admin.site.register(ForumThread)
+admin.site.register(ForumPost)
+admin.site.register(Job)
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        # Register signal handlers (rating aggregates, etc.)
+        from . import signals  # noqa: F401
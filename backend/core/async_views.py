@@ -0,0 +1,151 @@
+"""
+Async versions of the read-heavy endpoints, served instead of the DRF views
+when the project runs under ASGI (ASYNC_VIEWS, set by game_space/asgi.py).
+
+DRF views are sync only, so under ASGI every request would hold a thread.
+AsyncAPIView covers what these endpoints need from DRF (JWT authentication,
+query params, error responses, the GameSpaceJSONRenderer envelope) on top
+of Django's async View, and the handlers read through the async ORM,
+awaiting independent queries together with asyncio.gather.
+"""
+import asyncio
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.functional import classproperty
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.request import Request
+
+from . import feed
+from .authentication import CachedJWTAuthentication
+from .cache import CachedGameDetailMixin, CachedResponseMixin
+from .models import Game
+from .pagination import GameCursorPagination
+from .prefetch import aprefetch_game_context
+from .renderers import GameSpaceJSONRenderer
+from .serializers import GameSerializer
+from .views import GameListQueryMixin
+
+
+class AsyncAPIView(View):
+    """
+    Minimal async APIView for read-only JSON endpoints. Handlers are async
+    `get` methods returning self.render(data); raising a DRF APIException
+    produces the same error response as a DRF view. Views that include
+    CachedResponseMixin get its anonymous response cache.
+    """
+    http_method_names = ['get', 'head']
+    requires_authentication = False
+    renderer = GameSpaceJSONRenderer()
+    jwt_authentication = CachedJWTAuthentication()
+
+    async def dispatch(self, request, *args, **kwargs):
+        request = self.request = Request(request)
+        request.accepted_renderer = self.renderer
+        request.accepted_media_type = self.renderer.media_type
+        try:
+            request.user = await self.authenticate(request)
+            if self.requires_authentication and not request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            handler = getattr(self, request.method.lower(), None)
+            if handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            if isinstance(self, CachedResponseMixin) and self.is_cacheable(request):
+                return await self.cached(request, handler, *args, **kwargs)
+            return await handler(request, *args, **kwargs)
+        except exceptions.APIException as exc:
+            # Same shape as DRF's exception handler: scalar details become {"detail": ...}
+            detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            response = self.render(detail, status=exc.status_code)
+            if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                response['WWW-Authenticate'] = self.jwt_authentication.authenticate_header(request)
+            return response
+
+    async def authenticate(self, request):
+        """CachedJWTAuthentication, with a cache miss read through the async ORM."""
+        header = self.jwt_authentication.get_header(request)
+        raw_token = self.jwt_authentication.get_raw_token(header) if header is not None else None
+        if raw_token is None:
+            return AnonymousUser()
+        return await self.jwt_authentication.aget_user(self.jwt_authentication.get_validated_token(raw_token))
+
+    async def cached(self, request, handler, *args, **kwargs):
+        # Same keys and entries as the sync views (core/cache.py), so both share hits
+        key = self.get_cache_key(request)
+        entry = await cache.aget(key)
+        if entry is not None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            return self._finish(request, response, entry['etag'], entry['last_modified'])
+        response = await handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            self._store(key, response)
+        return response
+
+    def render(self, data, status=200):
+        response = HttpResponse(content_type='application/json', status=status)
+        response.content = self.renderer.render(data, self.renderer.media_type, {'response': response})
+        return response
+
+
+class AsyncGameListView(CachedResponseMixin, GameListQueryMixin, AsyncAPIView):
+    pagination_class = GameCursorPagination
+    # JWT user + page + library entries + recent reviews (the last two concurrently)
+    query_budget = 4
+
+    async def get(self, request):
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(self.get_queryset(), request, view=self)
+        fields = self.get_serializer_fields()
+        context = await aprefetch_game_context(
+            page, request.user,
+            include_library_entries=fields is None or 'user_library_entry' in fields,
+            include_reviews=fields is None or 'reviews' in fields,
+        )
+        serializer_kwargs = {'fields': fields} if fields is not None else {}
+        data = GameSerializer(page, many=True, context={'request': request, 'view': self, **context}, **serializer_kwargs).data
+        return self.render(paginator.get_paginated_response(data).data)
+
+
+class AsyncGameDetailView(CachedGameDetailMixin, AsyncAPIView):
+    # JWT user + game, library entry and recent reviews, read concurrently
+    query_budget = 4
+
+    async def get(self, request, pk):
+        # The serializer context only needs the game id, so all three reads start at once
+        try:
+            game, context = await asyncio.gather(
+                Game.objects.aget(pk=pk),
+                aprefetch_game_context([Game(pk=pk)], request.user),
+            )
+        except Game.DoesNotExist:
+            # The message get_object_or_404 gives the sync view
+            raise exceptions.NotFound(f'No {Game._meta.object_name} matches the given query.')
+        return self.render(GameSerializer(game, context={'request': request, 'view': self, **context}).data)
+
+
+class AsyncActivityFeedView(AsyncAPIView):
+    requires_authentication = True
+    # Same reads as ActivityFeedView, per FEED_READ_MODE
+    query_budget = classproperty(lambda cls: feed.read_query_budget())
+
+    async def get(self, request):
+        limit = feed.parse_page_size(request.query_params.get('page_size'))
+
+        if feed.FEED_READ_MODE == 'pull':
+            before = request.query_params.get('before')
+            feed_data, next_before = await feed.apull_feed(
+                request.user,
+                before=feed.parse_before(before) if before else None,
+                limit=limit,
+            )
+            return self.render({"success": True, "data": feed_data, "next_before": next_before})
+
+        cursor = request.query_params.get('cursor')
+        items, next_cursor = await feed.aread_feed(
+            request.user,
+            cursor=feed.decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        return self.render({"success": True, "data": [feed.serialize_item(item) for item in items], "next": next_cursor})
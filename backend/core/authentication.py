@@ -0,0 +1,180 @@
+"""
+JWT authentication without a user query per request.
+
+Access tokens carry the claims views read (user_id, username, role) plus the
+account's auth_version as `ver`. What the token cannot know -- whether the
+account was deactivated or its tokens revoked since the token was issued --
+is checked against a small per-process cache of each user's auth state, so a
+warm request touches no table at all. request.user is built from that state,
+so a token whose claims went stale (a rename, a role change) keeps working
+with the current ones until the client refreshes it.
+
+User saves evict the entry in the process that made them (core/signals.py);
+other processes pick the change up within AUTH_STATE_CACHE_TTL seconds.
+"""
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+User = get_user_model()
+
+# Users whose auth state is kept in the cache
+AUTH_STATE_CACHE_SIZE = getattr(settings, 'AUTH_STATE_CACHE_SIZE', 10_000)
+# Seconds a cached state is trusted, bounding staleness across processes
+AUTH_STATE_CACHE_TTL = getattr(settings, 'AUTH_STATE_CACHE_TTL', 60)
+
+VERSION_CLAIM = 'ver'
+
+STATE_FIELDS = ('id', 'username', 'role', 'is_active', 'auth_version', 'tokens_valid_after')
+# `db`: the alias the row was read from
+AuthState = namedtuple('AuthState', (*STATE_FIELDS, 'db'))
+# What the lightweight request.user is built from; anything else is loaded on access.
+# In model field order, as Model.from_db expects the values of a partial row.
+USER_FIELDS = tuple(
+    field.attname for field in User._meta.concrete_fields if field.attname in ('id', 'username', 'role', 'is_active')
+)
+
+
+class AuthStateCache:
+    """
+    Bounded per-process LRU of AuthState by user id (an int: simplejwt may
+    write the user_id claim as a string), each entry expiring after `ttl` seconds.
+    """
+
+    def __init__(self, max_size=AUTH_STATE_CACHE_SIZE, ttl=AUTH_STATE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """The user's state, or None when there is no such user."""
+        state = self._cached(user_id)
+        if state is None:
+            state = self.load(user_id)
+        return state
+
+    async def aget(self, user_id):
+        state = self._cached(user_id)
+        if state is None:
+            users = User.objects.filter(pk=user_id)
+            state = self._store(user_id, await users.values_list(*STATE_FIELDS).afirst(), users.db)
+        return state
+
+    def load(self, user_id):
+        """Reads the state from the database, refreshing the cached entry."""
+        users = User.objects.filter(pk=user_id)
+        return self._store(user_id, users.values_list(*STATE_FIELDS).first(), users.db)
+
+    def discard(self, user_id):
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._states.clear()
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._states.get(user_id)
+            if entry is None or entry[0] <= time.monotonic():
+                return None
+            self._states.move_to_end(user_id)
+            return entry[1]
+
+    def _store(self, user_id, row, db):
+        if row is None:
+            # Unknown ids are not cached: they cannot authenticate anyway
+            return None
+        state = AuthState(*row, db)
+        with self._lock:
+            self._states[user_id] = (time.monotonic() + self.ttl, state)
+            self._states.move_to_end(user_id)
+            while len(self._states) > self.max_size:
+                self._states.popitem(last=False)
+        return state
+
+
+states = AuthStateCache()
+
+
+# --- Token claims ---
+
+def stamp_claims(token, user):
+    """Copies the claims views read into `token` (a User or an AuthState)."""
+    token['username'] = user.username
+    token['role'] = user.role
+    token[VERSION_CLAIM] = user.auth_version
+    return token
+
+
+def check_token(token, state):
+    """
+    Raises unless `token` may still be used for the user in `state`: the
+    account must be active and the token issued after the last revocation.
+    Stale claims are no reason to refuse it: request_user() reads the
+    current ones from `state`.
+    """
+    if state is None:
+        raise exceptions.AuthenticationFailed('User not found', code='user_not_found')
+    if not state.is_active:
+        raise exceptions.AuthenticationFailed('User is inactive', code='user_inactive')
+    if is_revoked(token, state):
+        raise exceptions.AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+
+def is_revoked(token, state):
+    if state.tokens_valid_after is None:
+        return False
+    # iat has whole seconds: within the revocation's own second, only tokens stamped
+    # with the version it bumped to were issued after it (tokens without an iat never were)
+    revoked_at = int(state.tokens_valid_after.timestamp())
+    issued_at = token.get('iat', 0)
+    return issued_at < revoked_at or (issued_at == revoked_at and token.get(VERSION_CLAIM) != state.auth_version)
+
+
+def revoke_tokens(user):
+    """Revokes every token issued to `user` so far ("log out everywhere")."""
+    User.objects.filter(pk=user.pk).update(tokens_valid_after=timezone.now(), auth_version=F('auth_version') + 1)
+    states.discard(user.pk)
+
+
+# --- Authentication ---
+
+def request_user(state):
+    """
+    request.user for an authenticated request: a User instance holding only
+    USER_FIELDS, current as of `state` (other fields are deferred and loaded,
+    from the database the state came from, if something reads them).
+    """
+    return User.from_db(state.db, USER_FIELDS, [getattr(state, field) for field in USER_FIELDS])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication checking tokens against the cached auth state instead of loading the user row."""
+
+    def get_user(self, validated_token):
+        state = states.get(self.get_user_id(validated_token))
+        check_token(validated_token, state)
+        return request_user(state)
+
+    async def aget_user(self, validated_token):
+        state = await states.aget(self.get_user_id(validated_token))
+        check_token(validated_token, state)
+        return request_user(state)
+
+    @staticmethod
+    def get_user_id(validated_token):
+        try:
+            return int(validated_token[jwt_settings.USER_ID_CLAIM])
+        except (KeyError, TypeError, ValueError):
+            raise InvalidToken('Token contained no recognizable user identification')
@@ -0,0 +1,30 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from .passwords import hash_password, verify_password
+
+User = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """ModelBackend checking passwords through verify_password()."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            # Hash anyway, so the response time does not tell which usernames exist
+            hash_password(password)
+            return None
+        valid, rehashed = verify_password(password, user.password)
+        if not valid:
+            return None
+        if rehashed:
+            # Conditional, so a password changed meanwhile is not overwritten
+            User.objects.filter(pk=user.pk, password=user.password).update(password=rehashed)
+            user.password = rehashed
+        return user if self.user_can_authenticate(user) else None
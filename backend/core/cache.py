@@ -0,0 +1,123 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+# Rendered public responses are kept this long unless invalidated earlier
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+# Version counters: bumping one makes every cache key built from it unreachable,
+# so invalidation is O(1) and never has to enumerate stored responses.
+GLOBAL_VERSION_KEY = 'games:version'
+LIST_VERSION_KEY = 'games:list:version'
+
+
+def game_version_key(game_id):
+    return f'games:{game_id}:version'
+
+
+def _new_version():
+    # A counter that went missing (eviction, cache restart) must not restart at a
+    # value whose responses may still be stored; a clock reading never repeats one
+    return int(time.time() * 1000)
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        version = _new_version()
+        if not cache.add(key, version, None):
+            # Another process seeded it first
+            version = cache.get(key, version)
+    return version
+
+
+def _bump(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_version(), None)
+
+
+def invalidate_game(game_id):
+    # The game's detail page and every list (lists embed ratings and reviews)
+    _bump(game_version_key(game_id))
+    _bump(LIST_VERSION_KEY)
+
+
+def invalidate_game_lists():
+    _bump(LIST_VERSION_KEY)
+
+
+def invalidate_all():
+    # Used after bulk writes that bypass model signals
+    _bump(GLOBAL_VERSION_KEY)
+
+
+class CachedResponseMixin:
+    """
+    Caches the rendered JSON of anonymous GET requests. Keys are built from the
+    path, the normalized query string and the relevant version counters, so
+    changes signalled by core/signals.py invalidate them. Hits skip the ORM
+    and the serializers entirely, and carry ETag / Last-Modified so clients
+    can revalidate with a conditional GET and get a 304.
+    """
+
+    def get_cache_versions(self):
+        return [_get_version(GLOBAL_VERSION_KEY), _get_version(LIST_VERSION_KEY)]
+
+    def is_cacheable(self, request):
+        return (
+            request.method == 'GET'
+            and not request.user.is_authenticated
+            and getattr(request.accepted_renderer, 'format', None) == 'json'
+        )
+
+    def get_cache_key(self, request):
+        # Same parameters in any order map to the same entry
+        params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        raw = json.dumps([request.path, params, self.get_cache_versions()], default=str)
+        return 'response:' + hashlib.md5(raw.encode()).hexdigest()
+
+    def get(self, request, *args, **kwargs):
+        if not self.is_cacheable(request):
+            return super().get(request, *args, **kwargs)
+
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None:
+            response = HttpResponse(entry['content'], content_type=entry['content_type'])
+            return self._finish(request, response, entry['etag'], entry['last_modified'])
+
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 200:
+            response.add_post_render_callback(lambda rendered: self._store(key, rendered))
+        return response
+
+    def _store(self, key, response):
+        entry = {
+            'content': response.content,
+            'content_type': response['Content-Type'],
+            'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+            'last_modified': time.time(),
+        }
+        cache.set(key, entry, RESPONSE_CACHE_TIMEOUT)
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(entry['last_modified'])
+        patch_vary_headers(response, ['Authorization'])
+
+    def _finish(self, request, response, etag, last_modified):
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Authorization'])
+        return get_conditional_response(request, etag=etag, last_modified=int(last_modified), response=response)
+
+
+class CachedGameDetailMixin(CachedResponseMixin):
+    def get_cache_versions(self):
+        return [_get_version(GLOBAL_VERSION_KEY), _get_version(game_version_key(self.kwargs.get('pk')))]
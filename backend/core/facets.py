@@ -0,0 +1,197 @@
+"""
+Facet counts of the game catalog: how many games have each genre, developer,
+publisher and release year.
+
+Unfiltered counts are stored in GameFacetCount and kept up to date by the Game
+signals (core/signals.py), one counter UPDATE per changed facet value, so the
+sidebar of an unfiltered catalog is a single indexed read. Under filters the
+counts are computed by one grouped query: a GROUP BY per facet, each ranked
+with ROW_NUMBER() and trimmed to the top values, combined with UNION ALL.
+
+Facets are disjunctive: the counts of a facet ignore the filter on that same
+facet, so picking a genre still shows how many games the other genres have.
+
+Genres are counted case-insensitively, the way filter_games() matches them:
+'Action' and 'action' share one lowercased value, shown by its stored label
+(the most common spelling).
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, Count, F, OuterRef, Subquery, Value, When, Window
+from django.db.models.functions import Cast, Coalesce, ExtractYear, Lower, RowNumber
+from django.db.models.lookups import Exact
+
+from .models import Game, GameFacetCount
+
+FACETS = ('genre', 'developer', 'publisher', 'year')
+# Values returned per facet (?facet_limit=)
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def parse_limit(value):
+    try:
+        return min(max(int(value), 1), MAX_LIMIT)
+    except (TypeError, ValueError):
+        return DEFAULT_LIMIT
+
+
+def game_values(fields):
+    """The facet values of a game, from its Game.FACET_FIELDS values (empty ones are left out)."""
+    release_date = fields.get('release_date')
+    values = {
+        'genre': fields.get('genre'),
+        'developer': fields.get('developer'),
+        'publisher': fields.get('publisher'),
+        'year': str(release_date.year) if release_date else '',
+    }
+    return {facet: value for facet, value in values.items() if value}
+
+
+def facet_key(facet, value):
+    """The value `value` is counted by (a lowercased genre)."""
+    return value.lower() if facet == 'genre' else value
+
+
+def _value_expression(facet, spelling=False):
+    # `spelling`: the genre as stored rather than lowercased
+    if facet == 'year':
+        return Cast(ExtractYear('release_date'), CharField())
+    if facet == 'genre' and not spelling:
+        return Lower('genre')
+    return F(facet)
+
+
+def _label_expression(facet):
+    # Only genres are stored under a different label than their value
+    if facet != 'genre':
+        return F('facet_value')
+    label = GameFacetCount.objects.filter(facet=facet, value=OuterRef('facet_value')).values('label')[:1]
+    return Coalesce(Subquery(label), F('facet_value'))
+
+
+def filter_games(queryset, filters, skip=None):
+    """
+    Narrows a Game queryset by the facet `filters` ({facet: value}), except
+    the `skip` facet. Genres compare case-insensitively (game_genre_lower_idx).
+    """
+    for facet, value in filters.items():
+        if facet == skip:
+            continue
+        if facet == 'genre':
+            queryset = queryset.filter(Exact(Lower('genre'), value.lower()))
+        elif facet == 'year':
+            queryset = queryset.filter(release_date__year=value)
+        else:
+            queryset = queryset.filter(**{facet: value})
+    return queryset
+
+
+def _ranked(queryset, facet, value, count, limit, partition_by=None):
+    # The top `limit` rows (per `partition_by`) of a queryset, as (facet, value, count) rows
+    return queryset.annotate(
+        rank=Window(RowNumber(), partition_by=partition_by, order_by=[F(count).desc(), F(value).asc()]),
+    ).filter(rank__lte=limit).values_list(facet, value, count)
+
+
+def count_facets(querysets, limit=DEFAULT_LIMIT):
+    """
+    Counts the games of each facet value in one query. `querysets` maps every
+    facet to the (filtered) games its values are counted over. Returns
+    {facet: [{'value': ..., 'count': ...}]}, most frequent values first.
+    """
+    grouped = [
+        _ranked(
+            queryset.annotate(facet_value=_value_expression(facet))
+            .exclude(facet_value='').exclude(facet_value=None)
+            .order_by().values('facet_value')
+            .annotate(
+                games=Count('id'), facet_name=Value(facet, output_field=CharField()),
+                facet_label=_label_expression(facet),
+            ),
+            'facet_name', 'facet_label', 'games', limit,
+        )
+        for facet, queryset in querysets.items()
+    ]
+    return _collect(grouped[0].union(*grouped[1:], all=True))
+
+
+def stored_facets(limit=DEFAULT_LIMIT):
+    """The unfiltered counts, from the GameFacetCount table (one query)."""
+    return _collect(_ranked(
+        GameFacetCount.objects.filter(count__gt=0), 'facet', 'label', 'count', limit, partition_by=F('facet'),
+    ))
+
+
+def _collect(rows):
+    facets = {facet: [] for facet in FACETS}
+    for facet, value, count in rows:
+        facets[facet].append({'value': value, 'count': count})
+    for values in facets.values():
+        # UNION ALL keeps no order across the parts
+        values.sort(key=lambda row: (-row['count'], row['value']))
+    return facets
+
+
+# --- Stored counts ---
+
+def apply_change(old, new):
+    """
+    Moves one game from the facet values `old` to `new` (dicts as returned by
+    game_values(); empty for a created or deleted game). Counters are changed
+    with F() expressions, so concurrent writers never lose an update.
+    """
+    for facet in FACETS:
+        before, after = old.get(facet), new.get(facet)
+        before_key = facet_key(facet, before) if before else None
+        after_key = facet_key(facet, after) if after else None
+        if before_key == after_key:
+            continue
+        if before_key:
+            GameFacetCount.objects.filter(facet=facet, value=before_key, count__gt=0).update(count=F('count') - 1)
+        if after_key:
+            _increment(facet, after_key, after)
+
+
+def _increment(facet, value, label):
+    updated = GameFacetCount.objects.filter(facet=facet, value=value).update(
+        count=F('count') + 1,
+        # A value that had no games left takes the spelling of the one bringing it back
+        label=Case(When(count=0, then=Value(label)), default=F('label')),
+    )
+    if updated:
+        return
+    try:
+        # Savepoint: a concurrent first insert of the same value must not break the caller's transaction
+        with transaction.atomic():
+            GameFacetCount.objects.create(facet=facet, value=value, label=label, count=1)
+    except IntegrityError:
+        GameFacetCount.objects.filter(facet=facet, value=value).update(count=F('count') + 1)
+
+
+def rebuild():
+    """
+    Recomputes the stored counts and labels from the games table, one GROUP BY
+    per facet. Needed after writes that skip the Game signals (bulk_create,
+    update()). Returns the number of stored facet values.
+    """
+    rows = []
+    for facet in FACETS:
+        # Grouped by value and spelling; a value is labelled by its most common spelling
+        spellings = (
+            Game.objects.annotate(facet_value=_value_expression(facet), facet_label=_value_expression(facet, spelling=True))
+            .exclude(facet_value='').exclude(facet_value=None)
+            .order_by().values('facet_value', 'facet_label')
+            .annotate(games=Count('id'))
+            .values_list('facet_value', 'facet_label', 'games')
+        )
+        counts, labels = {}, {}
+        for value, label, games in sorted(spellings, key=lambda row: (-row[2], row[1])):
+            counts[value] = counts.get(value, 0) + games
+            labels.setdefault(value, label)
+        rows.extend(
+            GameFacetCount(facet=facet, value=value, label=labels[value], count=count) for value, count in counts.items()
+        )
+    with transaction.atomic():
+        GameFacetCount.objects.all().delete()
+        GameFacetCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,282 @@
+import asyncio
+import base64
+import binascii
+import heapq
+import json
+from datetime import datetime
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+
+from .models import FeedItem, Follow, ForumThread, LibraryEntry, Review, TimelineEntry
+
+# Actors with more followers than this are not fanned out on write;
+# their items are merged into followers' feeds at read time instead.
+FANOUT_MAX_FOLLOWERS = getattr(settings, 'FEED_FANOUT_MAX_FOLLOWERS', 5000)
+# 'timeline' reads the fanned-out timelines; 'pull' queries the source tables directly
+FEED_READ_MODE = getattr(settings, 'FEED_READ_MODE', 'timeline')
+FEED_PAGE_SIZE = 20
+FEED_MAX_PAGE_SIZE = 100
+# How many recent items of a newly followed user are copied into the follower's timeline
+FOLLOW_BACKFILL = 20
+
+
+# --- Write path ---
+
+def publish(actor_id, verb, game_id, created_at, rating=None, status=''):
+    """Records one activity and fans it out to the actor's followers' timelines."""
+    follower_ids = Follow.objects.filter(following_id=actor_id).values_list('follower_id', flat=True)
+    follower_count = follower_ids.count()
+    item = FeedItem.objects.create(
+        actor_id=actor_id,
+        verb=verb,
+        game_id=game_id,
+        rating=rating,
+        status=status or '',
+        created_at=created_at,
+        fanned_out=follower_count <= FANOUT_MAX_FOLLOWERS,
+    )
+    if item.fanned_out and follower_count:
+        TimelineEntry.objects.bulk_create(
+            (TimelineEntry(owner_id=owner_id, item=item, created_at=item.created_at) for owner_id in follower_ids.iterator()),
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+    return item
+
+
+def backfill_timeline(follower_id, actor_id):
+    # Copy the newly followed user's recent fanned-out items into the follower's timeline
+    items = FeedItem.objects.filter(actor_id=actor_id, fanned_out=True).order_by('-created_at', '-id')[:FOLLOW_BACKFILL]
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(owner_id=follower_id, item=item, created_at=item.created_at) for item in items],
+        ignore_conflicts=True,
+    )
+
+
+def prune_timeline(follower_id, actor_id):
+    TimelineEntry.objects.filter(owner_id=follower_id, item__actor_id=actor_id).delete()
+
+
+# --- Read path ---
+
+def encode_cursor(item):
+    position = [item.created_at.isoformat(), item.pk]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(encoded):
+    try:
+        timestamp, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (TypeError, ValueError):
+        raise NotFound('Invalid cursor')
+
+
+def _before(cursor, time_field, id_field):
+    timestamp, pk = cursor
+    return Q(**{f'{time_field}__lt': timestamp}) | Q(**{time_field: timestamp, f'{id_field}__lt': pk})
+
+
+def _feed_querysets(user, cursor, limit):
+    timeline = TimelineEntry.objects.filter(owner=user)
+    pulled = FeedItem.objects.filter(
+        fanned_out=False,
+        actor_id__in=Follow.objects.filter(follower=user).values('following_id'),
+    )
+    if cursor is not None:
+        timeline = timeline.filter(_before(cursor, 'created_at', 'item_id'))
+        pulled = pulled.filter(_before(cursor, 'created_at', 'id'))
+    return (
+        timeline.select_related('item__actor', 'item__game').order_by('-created_at', '-item_id')[:limit],
+        pulled.select_related('actor', 'game').order_by('-created_at', '-id')[:limit],
+    )
+
+
+def _merge_page(timeline_items, pulled_items, limit):
+    merged = heapq.merge(timeline_items, pulled_items, key=lambda item: (item.created_at, item.pk), reverse=True)
+    items = list(islice(merged, limit))
+    next_cursor = encode_cursor(items[-1]) if len(items) == limit else None
+    return items, next_cursor
+
+
+def read_feed(user, cursor=None, limit=FEED_PAGE_SIZE):
+    """
+    Returns (items, next_cursor) for the user's feed, newest first.
+    One range read on the user's timeline, plus one read of not-fanned-out
+    items of the accounts they follow; the two ordered streams are merged.
+    """
+    timeline, pulled = _feed_querysets(user, cursor, limit)
+    return _merge_page((entry.item for entry in timeline), pulled, limit)
+
+
+async def aread_feed(user, cursor=None, limit=FEED_PAGE_SIZE):
+    """read_feed() for async views: the timeline and pulled reads are awaited together."""
+    timeline, pulled = _feed_querysets(user, cursor, limit)
+    timeline_items, pulled_items = await asyncio.gather(
+        _alist(entry.item async for entry in timeline),
+        _alist(pulled),
+    )
+    return _merge_page(timeline_items, pulled_items, limit)
+
+
+async def _alist(rows):
+    return [row async for row in rows]
+
+
+def serialize_item(item):
+    data = {
+        "type": item.verb,
+        "user": item.actor.username,
+        "game": item.game.title,
+        "timestamp": item.created_at,
+    }
+    if item.verb == FeedItem.Verbs.REVIEW:
+        data["rating"] = item.rating
+    else:
+        data["status"] = item.status
+    return data
+
+
+# --- Pull path (no fan-out) ---
+# Each source lazily yields feed dicts newest first; heapq.merge combines the
+# ordered streams and the consumer stops as soon as a page is full, so at most
+# `limit` rows are pulled from any table and nothing is sorted in Python.
+# Rows are ordered by (timestamp, kind, id), so rows sharing a timestamp, in one
+# table or across tables, still have a strict order the cursor can resume from.
+
+def _pull_before(rows, time_field, kind, before):
+    # Rows strictly after `before` = (timestamp, kind, id) in the merged newest-first order
+    if before is None:
+        return rows
+    timestamp, before_kind, pk = before
+    condition = Q(**{f'{time_field}__lt': timestamp})
+    if kind < before_kind:
+        condition |= Q(**{time_field: timestamp})
+    elif kind == before_kind:
+        condition |= Q(**{time_field: timestamp, 'id__lt': pk})
+    return rows.filter(condition)
+
+
+def _review_rows(following_ids, before, limit):
+    reviews = _pull_before(Review.objects.filter(user_id__in=following_ids), 'created_at', 'REVIEW', before)
+    return reviews.select_related('user', 'game').order_by('-created_at', '-id')[:limit]
+
+
+def _review_item(r):
+    return {"type": "REVIEW", "user": r.user.username, "game": r.game.title, "rating": r.rating, "timestamp": r.created_at}
+
+
+def _library_rows(following_ids, before, limit):
+    entries = _pull_before(LibraryEntry.objects.filter(user_id__in=following_ids), 'added_at', 'STATUS', before)
+    return entries.select_related('user', 'game').order_by('-added_at', '-id')[:limit]
+
+
+def _library_item(l):
+    return {"type": "STATUS", "user": l.user.username, "game": l.game.title, "status": l.status, "timestamp": l.added_at}
+
+
+def _thread_rows(following_ids, before, limit):
+    threads = _pull_before(ForumThread.objects.filter(user_id__in=following_ids), 'created_at', 'THREAD', before)
+    return threads.select_related('user', 'game').order_by('-created_at', '-id')[:limit]
+
+
+def _thread_item(t):
+    return {"type": "THREAD", "user": t.user.username, "game": t.game.title, "title": t.title, "timestamp": t.created_at}
+
+
+# (rows queryset, row -> feed dict) per activity source
+PULL_SOURCES = [(_review_rows, _review_item), (_library_rows, _library_item), (_thread_rows, _thread_item)]
+
+
+def _keyed(row, to_item):
+    # Feed dicts carry no ids; the merge key is kept next to the item
+    item = to_item(row)
+    return (item["timestamp"], item["type"], row.pk), item
+
+
+def _stream(rows, to_item, limit):
+    for row in rows.iterator(chunk_size=limit):
+        yield _keyed(row, to_item)
+
+
+def _merge_pulled(streams, limit):
+    merged = list(islice(heapq.merge(*streams, key=lambda keyed: keyed[0], reverse=True), limit))
+    items = [item for _, item in merged]
+    next_before = encode_pull_cursor(merged[-1][0]) if len(merged) == limit else None
+    return items, next_before
+
+
+def encode_pull_cursor(key):
+    timestamp, kind, pk = key
+    return base64.urlsafe_b64encode(json.dumps([timestamp.isoformat(), kind, pk]).encode()).decode()
+
+
+def pull_feed(user, before=None, limit=FEED_PAGE_SIZE):
+    """
+    Returns (items, next_before) by k-way merging the followed users' activity
+    straight from the source tables. `before` is a (timestamp, kind, id)
+    position: pass the returned next_before through parse_before() to get the
+    next (older) page, without OFFSET.
+    """
+    following_ids = list(Follow.objects.filter(follower=user).values_list('following_id', flat=True))
+    if not following_ids:
+        return [], None
+
+    streams = [_stream(rows(following_ids, before, limit), to_item, limit) for rows, to_item in PULL_SOURCES]
+    page = _merge_pulled(streams, limit)
+    for stream in streams:
+        # Release the cursors of the sources that were not drained
+        stream.close()
+    return page
+
+
+async def apull_feed(user, before=None, limit=FEED_PAGE_SIZE):
+    """
+    pull_feed() for async views. The sources are independent, so their reads
+    are awaited together; each is bounded by `limit`, so they are read in full
+    and merged afterwards.
+    """
+    following_ids = [following_id async for following_id in
+                     Follow.objects.filter(follower=user).values_list('following_id', flat=True)]
+    if not following_ids:
+        return [], None
+
+    pages = await asyncio.gather(*(_alist(rows(following_ids, before, limit)) for rows, _ in PULL_SOURCES))
+    streams = [[_keyed(row, to_item) for row in page] for page, (_, to_item) in zip(pages, PULL_SOURCES)]
+    return _merge_pulled(streams, limit)
+
+
+def read_query_budget():
+    """Queries one feed page costs in the current FEED_READ_MODE, JWT user included (views' query_budget)."""
+    if FEED_READ_MODE == 'pull':
+        # Followed ids, then one read per source
+        return 2 + len(PULL_SOURCES)
+    # Timeline range + not-fanned-out items
+    return 3
+
+
+def parse_page_size(value):
+    try:
+        limit = min(int(value), FEED_MAX_PAGE_SIZE)
+    except (TypeError, ValueError):
+        limit = FEED_PAGE_SIZE
+    return max(limit, 1)
+
+
+def parse_before(value):
+    """
+    Decodes a pull-mode next_before cursor. A bare ISO timestamp is still
+    accepted and means everything strictly older than it.
+    """
+    try:
+        return datetime.fromisoformat(value), '', 0
+    except ValueError:
+        pass
+    try:
+        timestamp, kind, pk = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return datetime.fromisoformat(timestamp), str(kind), int(pk)
+    except (binascii.Error, TypeError, ValueError):
+        raise NotFound('Invalid before timestamp')
@@ -0,0 +1,132 @@
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Game, LibraryEntry
+
+# Rows validated and inserted per round trip (one multi-row INSERT within SQLite's 999 parameters)
+IMPORT_BATCH_SIZE = 200
+# Upper bound on the rows of one import request
+IMPORT_MAX_ITEMS = getattr(settings, 'LIBRARY_IMPORT_MAX_ITEMS', 10000)
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_FIELDS = ['game', 'title', 'status', 'added_at']
+
+CREATED = 'created'
+EXISTS = 'exists'
+INVALID = 'invalid'
+
+
+class ImportTooLarge(Exception):
+    pass
+
+
+def _parse_row(row):
+    """(game_id, status, error) for one uploaded {game, status} item."""
+    if not isinstance(row, dict):
+        return None, None, 'Expected an object with "game" and "status".'
+    game = row.get('game', row.get('game_id'))
+    try:
+        game_id = int(game)
+    except (TypeError, ValueError):
+        return None, None, 'Game ID is required.'
+    status = row.get('status') or LibraryEntry._meta.get_field('status').default
+    status = str(status).strip().upper()
+    if status not in LibraryEntry.Status.values:
+        return game_id, None, f'Invalid status "{status}".'
+    return game_id, status, None
+
+
+def _import_batch(user, rows, seen):
+    parsed = [_parse_row(row) for row in rows]
+    game_ids = {game_id for game_id, status, error in parsed if error is None}
+    # One query for the games that exist, one for the ones already in the library
+    valid = set(Game.objects.filter(pk__in=game_ids).values_list('pk', flat=True))
+    owned = set(
+        LibraryEntry.objects.filter(user=user, game_id__in=valid).values_list('game_id', flat=True)
+    )
+
+    results, entries = [], []
+    for game_id, status, error in parsed:
+        if error is None and game_id not in valid:
+            error = 'Game not found.'
+        if error is not None:
+            results.append({'game': game_id, 'result': INVALID, 'error': error})
+        elif game_id in owned or game_id in seen:
+            results.append({'game': game_id, 'result': EXISTS})
+        else:
+            seen.add(game_id)
+            entries.append(LibraryEntry(user=user, game_id=game_id, status=status))
+            results.append({'game': game_id, 'result': CREATED})
+
+    if entries:
+        # unique_library_entry absorbs entries added concurrently since the lookup above.
+        # Those rows keep their own added_at, which tells them apart from the inserted ones.
+        LibraryEntry.objects.bulk_create(entries, ignore_conflicts=True)
+        stored = set(
+            LibraryEntry.objects.filter(user=user, game_id__in=[entry.game_id for entry in entries])
+            .values_list('game_id', 'added_at')
+        )
+        skipped = {entry.game_id for entry in entries if (entry.game_id, entry.added_at) not in stored}
+        for result in results:
+            if result['result'] == CREATED and result['game'] in skipped:
+                result['result'] = EXISTS
+    return results
+
+
+def import_entries(user, rows, max_items=IMPORT_MAX_ITEMS):
+    """
+    Adds the uploaded {game, status} items to the user's library in one
+    transaction and returns one compact result per item, in input order.
+
+    `rows` may be any iterable, including a lazily parsed request body; it is
+    consumed in batches of IMPORT_BATCH_SIZE, each costing two lookups, one
+    multi-row INSERT and one read of the inserted keys. Games already in the
+    library are left unchanged. bulk_create skips the post_save signal, so
+    imports are not published to followers' activity feeds (trending picks
+    them up from added_at).
+    """
+    rows = iter(rows)
+    results, seen = [], set()
+    with transaction.atomic():
+        while True:
+            batch = list(islice(rows, IMPORT_BATCH_SIZE))
+            if not batch:
+                break
+            if len(results) + len(batch) > max_items:
+                raise ImportTooLarge(f'At most {max_items} items can be imported at once.')
+            results.extend(_import_batch(user, batch, seen))
+    return results
+
+
+def summarize(results):
+    summary = {CREATED: 0, EXISTS: 0, INVALID: 0}
+    for result in results:
+        summary[result['result']] += 1
+    return summary
+
+
+def status_counts(user):
+    """Entries per status plus the total, in one aggregate query over the user's library."""
+    return LibraryEntry.objects.filter(user=user).aggregate(
+        total=Count('id'),
+        **{status: Count('id', filter=Q(status=status)) for status in LibraryEntry.Status.values},
+    )
+
+
+def iter_export(user, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yields the user's library as lists of flat rows, oldest first, with one streamed query."""
+    rows = (
+        LibraryEntry.objects.filter(user=user)
+        .order_by('added_at', 'id')
+        .values_list('game_id', 'game__title', 'status', 'added_at')
+    )
+    chunk = []
+    for game_id, title, status, added_at in rows.iterator(chunk_size=chunk_size):
+        chunk.append({'game': game_id, 'title': title, 'status': status, 'added_at': added_at.isoformat()})
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
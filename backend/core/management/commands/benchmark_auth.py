@@ -0,0 +1,73 @@
+import logging
+import random
+from unittest import mock
+
+from django.conf import settings
+from django.core.management.base import CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from core import authentication
+from core.management.commands.benchmark_endpoints import Command as BenchmarkEndpoints
+from core.models import Game
+from core.serializers import CustomTokenObtainPairSerializer
+
+# Authenticated reads the SPA makes constantly
+DEFAULT_SCENARIOS = 'activity feed,library,forum threads,games,mutual follows,recommendations'
+
+
+class Command(BenchmarkEndpoints):
+    help = (
+        'Runs the authenticated read endpoints once with simplejwt\'s JWTAuthentication (a user '
+        'query per request) and once with CachedJWTAuthentication (claims plus the cached auth '
+        'state), reporting latency and queries per request for both.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per scenario (they also warm the cache).')
+        parser.add_argument('--user', help='Username to benchmark as (default: the user following the most accounts).')
+        parser.add_argument('--only', default=DEFAULT_SCENARIOS, help='Comma separated benchmark_endpoints scenario names.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.user = self.get_user(options['user'])
+        self.password = None
+        self.game_ids = list(Game.objects.values_list('id', flat=True)[:1000])
+        if not self.game_ids:
+            raise CommandError('No games found; run generate_load_data first.')
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.refresh_token = str(token)
+        self.auth = Client(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.anon = Client()
+
+        only = options['only'].split(',')
+        scenarios = [scenario for scenario in self.get_scenarios() if scenario[0] in only and not scenario[2]]
+        if not scenarios:
+            raise CommandError(f'No read scenario named {options["only"]!r}.')
+
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('core.middleware').setLevel(logging.ERROR)
+
+        results = {}
+        # Views copy DEFAULT_AUTHENTICATION_CLASSES when they are imported, so the class attribute is patched
+        for label, auth_class in (('jwt', JWTAuthentication), ('cached', authentication.CachedJWTAuthentication)):
+            self.stdout.write(f'\n{auth_class.__name__}:')
+            authentication.states.clear()
+            with mock.patch.object(APIView, 'authentication_classes', [auth_class]), \
+                    override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+                for name, _, _, request in scenarios:
+                    results[label, name] = self.measure(request, False, options['warmup'], options['requests'])
+                    self.report(name, results[label, name])
+
+        self.stdout.write('\nCached against JWTAuthentication:')
+        for name, _, _, _ in scenarios:
+            before, after = results['jwt', name], results['cached', name]
+            change = (after['p50_ms'] / before['p50_ms'] - 1) * 100 if before['p50_ms'] else 0
+            self.stdout.write(
+                f"  {name:<26} queries {before['queries_mean']:.1f} -> {after['queries_mean']:.1f}  "
+                f"p50 {change:+6.1f}%"
+            )
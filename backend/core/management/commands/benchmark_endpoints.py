@@ -0,0 +1,258 @@
+import itertools
+import json
+import logging
+import random
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from core import urls
+from core.models import Follow, ForumThread, Game, LibraryEntry, Review, User
+from core.serializers import CustomTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Drives every endpoint in core/urls.py through the Django test client and reports '
+        'p50/p95/p99 latency and queries per request. Run it against generate_load_data output.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=50, help='Measured requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per scenario.')
+        parser.add_argument('--user', help='Username to benchmark as (default: the user following the most accounts).')
+        parser.add_argument('--password', default='loadtest-password', help="The benchmark user's password, for the login scenario.")
+        parser.add_argument('--only', help='Comma separated scenario names to run.')
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+        parser.add_argument('--baseline', help='Compare against a previous --output file.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Relative p95 slowdown (or any extra query) reported as a regression against --baseline.',
+        )
+        parser.add_argument('--fail-on-regression', action='store_true', help='Exit with an error when regressions are found.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.user = self.get_user(options['user'])
+        self.password = options['password']
+        self.game_ids = list(Game.objects.values_list('id', flat=True)[:1000])
+        if not self.game_ids:
+            raise CommandError('No games found; run generate_load_data first.')
+
+        # The tokens login issues, claims included
+        token = CustomTokenObtainPairSerializer.get_token(self.user)
+        self.refresh_token = str(token)
+        self.auth = Client(HTTP_AUTHORIZATION=f'Bearer {token.access_token}')
+        self.anon = Client()
+
+        scenarios = self.get_scenarios()
+        covered = {name for _, name, _, _ in scenarios}
+        missing = sorted(pattern.name for pattern in urls.urlpatterns if pattern.name not in covered)
+        if missing:
+            self.stdout.write(self.style.WARNING(f'No scenario for: {", ".join(missing)}'))
+        if options['only']:
+            only = set(options['only'].split(','))
+            scenarios = [scenario for scenario in scenarios if scenario[0] in only]
+
+        # 4xx warnings and over-budget logs would drown the report
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('core.middleware').setLevel(logging.ERROR)
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for label, name, write, request in scenarios:
+                results[label] = self.measure(request, write, options['warmup'], options['requests'])
+                self.report(label, results[label])
+
+        regressions = []
+        if options['baseline']:
+            with open(options['baseline']) as fh:
+                baseline = json.load(fh)['results']
+            regressions = self.compare(baseline, results, options['tolerance'])
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({
+                    'created_at': timezone.now().isoformat(),
+                    'database': connection.vendor,
+                    'user': self.user.username,
+                    'requests': options['requests'],
+                    'results': results,
+                }, fh, indent=2)
+
+        if regressions and options['fail_on_regression']:
+            raise CommandError(f'{len(regressions)} scenario(s) regressed: {", ".join(regressions)}')
+
+    def get_user(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User {username!r} does not exist.')
+        user = User.objects.order_by('-following_count').first()
+        if user is None:
+            raise CommandError('No users found; run generate_load_data first.')
+        return user
+
+    def game_id(self):
+        return self.rng.choice(self.game_ids)
+
+    def get_scenarios(self):
+        """(label, url name, writes?, request callable) for every endpoint in core/urls.py."""
+        user = self.user
+        entry_id = LibraryEntry.objects.filter(user=user).values_list('id', flat=True).first()
+        most_followed = User.objects.order_by('-follower_count').values_list('id', flat=True).first()
+        followed_id = Follow.objects.filter(follower=user).values_list('following_id', flat=True).first()
+        other_id = User.objects.exclude(pk=user.pk).exclude(followers__follower=user).values_list('id', flat=True).first()
+        busiest_game = (
+            ForumThread.objects.values('game').annotate(threads=Count('id')).order_by('-threads')
+            .values_list('game', flat=True).first()
+        ) or self.game_ids[0]
+        most_reviewed = Game.objects.order_by('-review_count').values_list('id', flat=True).first()
+        others_review = Review.objects.exclude(user=user).order_by('-id').values_list('id', flat=True).first()
+        busiest_thread = ForumThread.objects.order_by('-reply_count').values_list('id', flat=True).first()
+        reviewed = set(Review.objects.filter(user=user).values_list('game_id', flat=True))
+        owned = set(LibraryEntry.objects.filter(user=user).values_list('game_id', flat=True))
+        unreviewed = [game_id for game_id in self.game_ids if game_id not in reviewed] or self.game_ids
+        unowned = [game_id for game_id in self.game_ids if game_id not in owned] or self.game_ids
+        counter = itertools.count()
+        auth, anon = self.auth, self.anon
+
+        scenarios = [
+            ('register', 'register', True, lambda: self.register(next(counter))),
+            ('login', 'login', False, lambda: anon.post(reverse('login'), {'username': user.username, 'password': self.password})),
+            ('token refresh', 'token_refresh', False, lambda: anon.post(reverse('token_refresh'), {'refresh': self.refresh_token})),
+            ('token revoke', 'token-revoke', True, lambda: auth.post(reverse('token-revoke'))),
+            ('profile', 'user-profile', False, lambda: auth.get(reverse('user-profile'))),
+            ('games', 'game-list', False, lambda: auth.get(reverse('game-list'))),
+            ('games (anonymous)', 'game-list', False, lambda: anon.get(reverse('game-list'))),
+            ('games page_size=100', 'game-list', False, lambda: auth.get(reverse('game-list'), {'page_size': 100})),
+            ('games compact', 'game-list', False, lambda: auth.get(reverse('game-list'), {'compact': 'true', 'page_size': 100})),
+            ('games trending', 'game-list', False, lambda: auth.get(reverse('game-list'), {'trending': 'true'})),
+            ('games search', 'game-list', False, lambda: auth.get(reverse('game-list'), {'search': self.rng.choice(['sha', 'legend', 'star', 'knight'])})),
+            ('games genre', 'game-list', False, lambda: auth.get(reverse('game-list'), {'genre': 'rpg'})),
+            ('game facets', 'game-facets', False, lambda: anon.get(reverse('game-facets'))),
+            ('game facets genre', 'game-facets', False, lambda: auth.get(reverse('game-facets'), {'genre': 'rpg'})),
+            ('game detail', 'game-detail', False, lambda: auth.get(reverse('game-detail', args=[self.game_id()]))),
+            ('game detail (anonymous)', 'game-detail', False, lambda: anon.get(reverse('game-detail', args=[self.game_id()]))),
+            ('similar games', 'game-similar', False, lambda: anon.get(reverse('game-similar', args=[self.game_id()]))),
+            ('recommendations', 'user-recommendations', False, lambda: auth.get(reverse('user-recommendations'))),
+            ('library', 'library-list-create', False, lambda: auth.get(reverse('library-list-create'))),
+            ('library status', 'library-list-create', False, lambda: auth.get(reverse('library-list-create'), {'status': 'PLAYING'})),
+            ('library add', 'library-list-create', True, lambda: auth.post(reverse('library-list-create'), {
+                'game': self.rng.choice(unowned), 'status': 'WISHLIST',
+            })),
+            ('library import', 'library-import', True, lambda: auth.post(
+                reverse('library-import'),
+                json.dumps([{'game': game_id, 'status': 'WISHLIST'} for game_id in self.rng.sample(unowned, min(len(unowned), 200))]),
+                content_type='application/json',
+            )),
+            ('library export', 'library-export', False, lambda: auth.get(reverse('library-export'))),
+            ('review', 'create-review', True, lambda: auth.post(reverse('create-review'), {
+                'game_id': self.rng.choice(unreviewed), 'rating': self.rng.randint(1, 10), 'comment': 'Benchmark review',
+            })),
+            ('game reviews', 'game-reviews', False, lambda: anon.get(reverse('game-reviews', args=[most_reviewed]))),
+            ('game reviews helpful', 'game-reviews', False, lambda: auth.get(
+                reverse('game-reviews', args=[most_reviewed]), {'ordering': '-helpful_count'},
+            )),
+            ('review summary', 'game-review-summary', False, lambda: anon.get(reverse('game-review-summary', args=[most_reviewed]))),
+            ('activity feed', 'activity-feed', False, lambda: auth.get(reverse('activity-feed'))),
+            ('followers', 'user-followers', False, lambda: auth.get(reverse('user-followers', args=[most_followed]))),
+            ('following', 'user-following', False, lambda: auth.get(reverse('user-following', args=[user.pk]))),
+            ('mutual follows', 'social-mutuals', False, lambda: auth.get(reverse('social-mutuals'))),
+            ('follow suggestions', 'social-suggestions', False, lambda: auth.get(reverse('social-suggestions'))),
+            ('forum threads', 'forum-threads', False, lambda: auth.get(reverse('forum-threads', args=[busiest_game]))),
+            ('forum thread create', 'forum-threads', True, lambda: auth.post(reverse('forum-threads', args=[busiest_game]), {
+                'title': 'Benchmark thread', 'content': '...',
+            })),
+            ('metrics', 'metrics', False, lambda: auth.get(reverse('metrics'))),
+        ]
+        if busiest_thread is not None:
+            scenarios += [
+                ('forum posts', 'forum-posts', False, lambda: auth.get(reverse('forum-posts', args=[busiest_thread]))),
+                ('forum reply', 'forum-posts', True, lambda: auth.post(reverse('forum-posts', args=[busiest_thread]), {
+                    'content': 'Benchmark reply',
+                })),
+            ]
+        if entry_id is not None:
+            scenarios += [
+                ('library entry', 'library-detail', False, lambda: auth.get(reverse('library-detail', args=[entry_id]))),
+                ('library entry update', 'library-detail', True, lambda: auth.patch(
+                    reverse('library-detail', args=[entry_id]), {'status': 'COMPLETED'}, content_type='application/json',
+                )),
+            ]
+        if others_review is not None:
+            scenarios.append(('review helpful vote', 'review-helpful', True, lambda: auth.post(
+                reverse('review-helpful', args=[others_review]),
+            )))
+        if other_id is not None:
+            scenarios.append(('follow', 'follow-user', True, lambda: auth.post(reverse('follow-user', args=[other_id]))))
+        if followed_id is not None:
+            scenarios.append(('unfollow', 'unfollow-user', True, lambda: auth.delete(reverse('unfollow-user', args=[followed_id]))))
+        return scenarios
+
+    def register(self, n):
+        return self.anon.post(reverse('register'), {
+            'username': f'bench_{n}', 'email': f'bench_{n}@example.com', 'password': 'bench-password',
+        })
+
+    def measure(self, request, write, warmup, count):
+        timings, queries, statuses = [], [], set()
+        for i in range(warmup + count):
+            # Writes are rolled back so every run sees the same data
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = request()
+                    if response.streaming:
+                        b''.join(response.streaming_content)
+                    elapsed = time.perf_counter() - started
+                if write:
+                    transaction.set_rollback(True)
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured))
+                statuses.add(response.status_code)
+
+        percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        return {
+            'p50_ms': round(percentiles[49], 3),
+            'p95_ms': round(percentiles[94], 3),
+            'p99_ms': round(percentiles[98], 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries_mean': round(statistics.fmean(queries), 2),
+            'queries_max': max(queries),
+            'status': sorted(statuses),
+        }
+
+    def report(self, label, result):
+        self.stdout.write(
+            f"{label:<26} p50 {result['p50_ms']:8.2f} ms  p95 {result['p95_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+            f"{result['queries_mean']:6.1f} queries  {','.join(map(str, result['status']))}"
+        )
+
+    def compare(self, baseline, results, tolerance):
+        regressions = []
+        self.stdout.write('\nAgainst baseline:')
+        for label, result in results.items():
+            before = baseline.get(label)
+            if before is None:
+                continue
+            slower = result['p95_ms'] > before['p95_ms'] * (1 + tolerance)
+            more_queries = result['queries_max'] > before['queries_max']
+            change = (result['p95_ms'] / before['p95_ms'] - 1) * 100 if before['p95_ms'] else 0
+            line = f"  {label:<26} p95 {change:+6.1f}%  queries {before['queries_max']} -> {result['queries_max']}"
+            if slower or more_queries:
+                regressions.append(label)
+                self.stdout.write(self.style.ERROR(line + '  REGRESSION'))
+            else:
+                self.stdout.write(line)
+        return regressions
@@ -0,0 +1,118 @@
+import http.client
+import itertools
+import json
+import os
+import statistics
+import subprocess
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import CommandError
+
+from core.management.commands.benchmark_servers import Command as BenchmarkServers
+from core.models import Game, User
+from core.serializers import CustomTokenObtainPairSerializer
+
+
+class Command(BenchmarkServers):
+    help = (
+        'Starts the project under a WSGI server and floods /api/auth/login/ from many client '
+        'addresses while other clients read the game list and the activity feed. Reports login '
+        'throughput and statuses, and the p50/p95/p99 latency of the other endpoints with and '
+        'without the storm, for each PASSWORD_HASH_MODE.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=300, help='Login attempts in the storm.')
+        parser.add_argument('--login-concurrency', type=int, default=32, help='Concurrent login clients.')
+        parser.add_argument('--addresses', type=int, default=100, help='Loopback addresses the logins come from (127.0.0.2 and up).')
+        parser.add_argument('--requests', type=int, default=300, help='Measured requests to the other endpoints.')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients on the other endpoints.')
+        parser.add_argument('--modes', default='inline,pool', help='Comma separated PASSWORD_HASH_MODE values to compare.')
+        parser.add_argument('--password', default='loadtest-password', help='Password of the generated users.')
+        parser.add_argument('--workers', type=int, default=1, help='gunicorn worker processes.')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker.')
+        parser.add_argument('--user', help='Username the other endpoints are requested as.')
+
+    def handle(self, *args, **options):
+        usernames = list(User.objects.order_by('id').values_list('username', flat=True)[:options['logins']])
+        if not usernames or not Game.objects.exists():
+            raise CommandError('No data found; run generate_load_data first.')
+        user = self.get_user(options['user'])
+        headers = {'Authorization': f'Bearer {CustomTokenObtainPairSerializer.get_token(user).access_token}'}
+        paths = list(itertools.islice(itertools.cycle(['/api/games/', '/api/social/feed/']), options['requests']))
+        accounts = itertools.cycle(usernames)
+        addresses = itertools.cycle(f'127.0.0.{2 + i % 250}' for i in range(options['addresses']))
+        logins = [(next(addresses), next(accounts)) for _ in range(options['logins'])]
+
+        for mode in options['modes'].split(','):
+            port = self.free_port()
+            process = subprocess.Popen(
+                [arg.format(port=port) for arg in self.wsgi_command(options)],
+                env={**os.environ, 'PASSWORD_HASH_MODE': mode},
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                base = f'http://127.0.0.1:{port}'
+                self.wait_until_ready(base, process)
+                self.run(base, paths[:options['concurrency']], headers, options['concurrency'])  # warm up
+                idle = self.run(base, paths, headers, options['concurrency'])
+
+                storm_result = {}
+                storm = threading.Thread(target=lambda: storm_result.update(
+                    self.storm(port, logins, options['password'], options['login_concurrency'])
+                ))
+                storm.start()
+                # Let the storm build up before measuring
+                time.sleep(0.5)
+                during = self.run(base, paths, headers, options['concurrency'])
+                storm.join()
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+            self.stdout.write(f'\nPASSWORD_HASH_MODE={mode}:')
+            self.report('reads, idle', idle)
+            self.report('reads, login storm', during)
+            statuses = ', '.join(f'{status}: {count}' for status, count in sorted(storm_result['statuses'].items(), key=str))
+            self.stdout.write(
+                f'{"logins":<24} {storm_result["rps"]:>8} req/s  p50 {storm_result["p50_ms"]:>8.2f}ms  '
+                f'p95 {storm_result["p95_ms"]:>8.2f}ms  ({statuses})'
+            )
+
+    def storm(self, port, logins, password, concurrency):
+        statuses, timings = Counter(), []
+        lock = threading.Lock()
+
+        def login(attempt):
+            address, username = attempt
+            body = json.dumps({'username': username, 'password': password})
+            started = time.perf_counter()
+            # Each login from its own source address, so the per-IP throttle sees many clients
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60, source_address=(address, 0))
+            try:
+                connection.request('POST', '/api/auth/login/', body, {'Content-Type': 'application/json'})
+                status = connection.getresponse().status
+            except OSError:
+                status = 'error'
+            finally:
+                connection.close()
+            with lock:
+                statuses[status] += 1
+                timings.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(login, logins))
+        wall = time.perf_counter() - started
+
+        percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+        return {
+            'statuses': statuses,
+            # Completed logins only: refusals are cheap and would flatter the rate
+            'rps': round(statuses[200] / wall, 1) if wall else 0,
+            'p50_ms': percentiles[49],
+            'p95_ms': percentiles[94],
+        }
@@ -0,0 +1,90 @@
+import json
+import statistics
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from core.renderers import GameSpaceJSONRenderer
+
+
+class StdlibEnvelopeRenderer(JSONRenderer):
+    # The previous renderer: wraps the payload in a new dict and encodes with the stdlib
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render({"success": True, "data": data}, accepted_media_type, renderer_context)
+
+
+def make_catalog(size):
+    # Shaped like GameSerializer output, five embedded reviews per game
+    created = datetime(2026, 1, 1, 12, 30, tzinfo=timezone.utc)
+    return [
+        {
+            'id': i,
+            'user_library_entry': {'id': i, 'status': 'PLAYING'} if i % 3 == 0 else None,
+            'reviews': [
+                {'id': i * 5 + r, 'user': r, 'game': i, 'rating': (i + r) % 10 + 1,
+                 'comment': 'Great pacing, the boss fights are memorable.', 'created_at': created.isoformat()}
+                for r in range(5)
+            ],
+            'title': f'Game Title {i}',
+            'description': 'An open world action adventure with a long, detailed store description. ' * 4,
+            'developer': f'Studio {i % 50}',
+            'publisher': f'Publisher {i % 20}',
+            'release_date': date(2020, 1 + i % 12, 1 + i % 28),
+            'cover_image_url': f'https://example.com/covers/{i}.jpg',
+            'genre': 'RPG',
+            'average_rating': Decimal('8.25'),
+            'review_count': 120 + i,
+        }
+        for i in range(size)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks the stdlib JSON envelope renderer against GameSpaceJSONRenderer on catalog-sized payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000', help='Comma separated catalog sizes.')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Write the results as JSON to this file.')
+
+    def handle(self, *args, **options):
+        context = {'response': SimpleNamespace(status_code=200)}
+        fast = GameSpaceJSONRenderer()
+        fallback = GameSpaceJSONRenderer()
+        fallback.fast = False
+
+        renderers = [
+            ('stdlib envelope (before)', lambda data: StdlibEnvelopeRenderer().render(data, renderer_context=context)),
+            ('GameSpaceJSONRenderer stdlib', lambda data: fallback.render(data, renderer_context=context)),
+        ]
+        if fast.fast:
+            renderers.append(('GameSpaceJSONRenderer orjson', lambda data: fast.render(data, renderer_context=context)))
+            renderers.append(('GameSpaceJSONRenderer streamed', lambda data: b''.join(
+                fast.iter_render(data[i:i + 200] for i in range(0, len(data), 200))
+            )))
+        else:
+            self.stdout.write(self.style.WARNING('orjson is not installed; only the stdlib paths are measured.'))
+
+        results = []
+        for size in [int(s) for s in options['sizes'].split(',')]:
+            data = make_catalog(size)
+            self.stdout.write(f'\n{size} games')
+            baseline = None
+            for name, render in renderers:
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    body = render(data)
+                    timings.append(time.perf_counter() - started)
+                median = statistics.median(timings)
+                baseline = baseline or median
+                results.append({'renderer': name, 'size': size, 'median_ms': median * 1000, 'bytes': len(body)})
+                self.stdout.write(f'  {name:<32} {median * 1000:9.2f} ms  {baseline / median:5.1f}x  {len(body) / 1024:9.0f} KiB')
+
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump(results, fh, indent=2)
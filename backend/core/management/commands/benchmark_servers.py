@@ -0,0 +1,148 @@
+import importlib.util
+import itertools
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.management.commands.benchmark_endpoints import Command as BenchmarkEndpoints
+from core.models import Game
+
+
+class Command(BaseCommand):
+    help = (
+        'Starts the project under a WSGI server and under uvicorn (ASGI, async views) and '
+        'drives the game list, game detail and activity feed endpoints with concurrent '
+        'clients, reporting throughput and p50/p95/p99 latency for each server.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Measured requests per server.')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client connections.')
+        parser.add_argument('--workers', type=int, default=1, help='Server processes (gunicorn and uvicorn).')
+        parser.add_argument('--threads', type=int, default=8, help='Threads per gunicorn worker.')
+        parser.add_argument('--only', choices=['wsgi', 'asgi'], help='Benchmark one server.')
+        parser.add_argument('--user', help='Username to request as (default: the user following the most accounts).')
+
+    def handle(self, *args, **options):
+        if importlib.util.find_spec('uvicorn') is None and options['only'] != 'wsgi':
+            raise CommandError('uvicorn is not installed (pip install uvicorn).')
+        user = self.get_user(options['user'])
+        game_ids = list(Game.objects.values_list('id', flat=True)[:1000])
+        if not game_ids:
+            raise CommandError('No games found; run generate_load_data first.')
+
+        # Authenticated requests skip the anonymous response cache, so every one reaches the views
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        ids = itertools.cycle(game_ids)
+        paths = [
+            path
+            for _ in range(options['requests'] // 3 + 1)
+            for path in ('/api/games/', f'/api/games/{next(ids)}/', '/api/social/feed/')
+        ][:options['requests']]
+
+        servers = [('wsgi', self.wsgi_command(options)), ('asgi', self.asgi_command(options))]
+        for label, command in servers:
+            if options['only'] and options['only'] != label:
+                continue
+            port = self.free_port()
+            process = subprocess.Popen(
+                [arg.format(port=port) for arg in command],
+                env={**os.environ, 'ASYNC_VIEWS': '1' if label == 'asgi' else '0'},
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            )
+            try:
+                base = f'http://127.0.0.1:{port}'
+                self.wait_until_ready(base, process)
+                self.run(base, paths[:options['concurrency']], headers, options['concurrency'])  # warm up
+                result = self.run(base, paths, headers, options['concurrency'])
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+            self.report(f'{label} ({command[2]})', result)
+
+    get_user = BenchmarkEndpoints.get_user
+
+    def wsgi_command(self, options):
+        if importlib.util.find_spec('gunicorn') is not None:
+            return [
+                sys.executable, '-m', 'gunicorn', 'game_space.wsgi:application', '--bind', '127.0.0.1:{port}',
+                '--workers', str(options['workers']), '--threads', str(options['threads']),
+            ]
+        # Django's threaded development server: one thread per request, a single process
+        return [sys.executable, '-m', 'django', 'runserver', '127.0.0.1:{port}', '--noreload', '--skip-checks']
+
+    def asgi_command(self, options):
+        return [
+            sys.executable, '-m', 'uvicorn', 'game_space.asgi:application', '--host', '127.0.0.1',
+            '--port', '{port}', '--workers', str(options['workers']), '--log-level', 'warning',
+        ]
+
+    @staticmethod
+    def free_port():
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    @staticmethod
+    def wait_until_ready(base, process, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f'Server exited with status {process.returncode}.')
+            try:
+                urllib.request.urlopen(f'{base}/api/games/?page_size=1', timeout=1).read()
+                return
+            except (urllib.error.URLError, ConnectionError, OSError):
+                time.sleep(0.2)
+        raise CommandError(f'Server did not start within {timeout}s.')
+
+    def run(self, base, paths, headers, concurrency):
+        timings, errors = [], []
+        lock = threading.Lock()
+
+        def fetch(path):
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(urllib.request.Request(base + path, headers=headers), timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError) as exc:
+                with lock:
+                    errors.append(exc)
+                return
+            elapsed = (time.perf_counter() - started) * 1000
+            with lock:
+                timings.append(elapsed)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(fetch, paths))
+        wall = time.perf_counter() - started
+
+        percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else (timings or [0]) * 99
+        return {
+            'requests': len(timings),
+            'errors': len(errors),
+            'rps': round(len(timings) / wall, 1) if wall else 0,
+            'p50_ms': round(percentiles[49], 3),
+            'p95_ms': round(percentiles[94], 3),
+            'p99_ms': round(percentiles[98], 3),
+        }
+
+    def report(self, label, result):
+        line = (
+            f'{label:<24} {result["rps"]:>8} req/s  p50 {result["p50_ms"]:>8.2f}ms  '
+            f'p95 {result["p95_ms"]:>8.2f}ms  p99 {result["p99_ms"]:>8.2f}ms'
+        )
+        if result['errors']:
+            line += f'  ({result["errors"]} errors)'
+        self.stdout.write(line)
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core import recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds item-item similarities (cosine over library co-occurrence) and stores the top-K '
+        'neighbours of every game. Uses NumPy/SciPy sparse matrices when they are installed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--engine', choices=['auto', 'numpy', 'python'], default='auto')
+        parser.add_argument('--top-k', type=int, default=recommendations.TOP_K, help='Neighbours stored per game.')
+        parser.add_argument(
+            '--min-overlap', type=int, default=recommendations.MIN_OVERLAP,
+            help='Libraries two games must share to be neighbours.',
+        )
+        parser.add_argument('--games', help='Comma separated game ids to refresh instead of rebuilding everything.')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        if options['games']:
+            try:
+                game_ids = [int(game_id) for game_id in options['games'].split(',')]
+            except ValueError:
+                raise CommandError('--games expects comma separated ids.')
+            recommendations.refresh_games(game_ids, options['top_k'], options['min_overlap'])
+            self.stdout.write(self.style.SUCCESS(
+                f'Refreshed the neighbours of {len(game_ids)} games in {time.monotonic() - started:.2f}s.'
+            ))
+            return
+
+        try:
+            rows = recommendations.build_all(options['engine'], options['top_k'], options['min_overlap'])
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {rows} neighbours in {time.monotonic() - started:.2f}s.'
+        ))
@@ -0,0 +1,253 @@
+import bisect
+import itertools
+import random
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import social
+from core.models import Follow, ForumPost, ForumThread, Game, LibraryEntry, Review, User
+
+GENRES = ['Action', 'Action-Adventure', 'RPG', 'Strategy', 'Shooter', 'Puzzle', 'Racing', 'Sports', 'Simulation', 'Horror']
+WORDS = [
+    'Shadow', 'Legend', 'Iron', 'Star', 'Dungeon', 'Empire', 'Echo', 'Crimson', 'Frontier', 'Galaxy',
+    'Knight', 'Rogue', 'Storm', 'Night', 'Quest', 'Chronicle', 'Drift', 'Harbor', 'Atlas', 'Ember',
+]
+COMMENTS = [
+    'Great pacing, the boss fights are memorable.', 'Gorgeous world but the story drags.',
+    'Best co-op I have played this year.', 'Too grindy for me.', 'A masterpiece.', '',
+]
+
+
+class PowerLaw:
+    """Draws indexes 0..n-1 with probability proportional to 1 / (rank + 1) ** exponent."""
+
+    def __init__(self, rng, n, exponent):
+        self.rng = rng
+        # Shuffle which ids are popular so popularity is not correlated with insertion order
+        self.order = list(range(n))
+        rng.shuffle(self.order)
+        self.cum_weights = list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(n)))
+
+    def sample(self):
+        position = bisect.bisect(self.cum_weights, self.rng.random() * self.cum_weights[-1])
+        return self.order[min(position, len(self.order) - 1)]
+
+    def distinct(self, k):
+        # k distinct indexes (k is small relative to n, so rejection is cheap)
+        k = min(k, len(self.order))
+        picked = set()
+        attempts = 0
+        while len(picked) < k and attempts < k * 20:
+            picked.add(self.sample())
+            attempts += 1
+        return picked
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    # bulk_create honors auto_now_add; switch it off so the generated history keeps its spread
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = (
+        'Generates synthetic load-test data with bulk_create: users, games, a power-law follow graph, '
+        'library entries, reviews, forum threads and replies, then rebuilds the derived tables.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100_000)
+        parser.add_argument('--games', type=int, default=20_000)
+        parser.add_argument('--reviews', type=int, default=1_000_000)
+        parser.add_argument('--library-entries', type=int, default=2_000_000)
+        parser.add_argument('--follows', type=int, default=2_000_000, help='Approximate number of follow edges.')
+        parser.add_argument('--threads', type=int, default=50_000)
+        parser.add_argument('--posts', type=int, default=500_000, help='Forum replies, spread over the new threads.')
+        parser.add_argument('--exponent', type=float, default=1.1, help='Power-law exponent for popularity.')
+        parser.add_argument('--days', type=int, default=365, help='Spread activity over this many days.')
+        parser.add_argument('--password', default='loadtest-password', help='Password of every generated user.')
+        parser.add_argument('--prefix', default='load', help='Username prefix of the generated users.')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--skip-derived', action='store_true', help='Do not rebuild aggregates, search, facets, trending and feed.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=f"{options['prefix']}_").exists():
+            raise CommandError(f"Users prefixed '{options['prefix']}_' already exist; pick another --prefix.")
+
+        self.rng = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = options['days']
+
+        started = time.monotonic()
+        with transaction.atomic():
+            user_ids = self.create_users(options['users'], options['prefix'], options['password'])
+            game_ids = self.create_games(options['games'])
+            self.create_follows(user_ids, options['follows'], options['exponent'])
+            with explicit_timestamps(
+                LibraryEntry._meta.get_field('added_at'),
+                Review._meta.get_field('created_at'),
+                ForumThread._meta.get_field('created_at'),
+                ForumPost._meta.get_field('created_at'),
+            ):
+                self.create_pairs(
+                    'library entries', LibraryEntry, user_ids, game_ids, options['library_entries'], options['exponent'],
+                    lambda user_id, game_id: LibraryEntry(
+                        user_id=user_id, game_id=game_id, added_at=self.timestamp(),
+                        status=self.rng.choice(LibraryEntry.Status.values),
+                    ),
+                )
+                self.create_pairs(
+                    'reviews', Review, user_ids, game_ids, options['reviews'], options['exponent'],
+                    lambda user_id, game_id: Review(
+                        user_id=user_id, game_id=game_id, created_at=self.timestamp(),
+                        rating=min(10, max(1, round(self.rng.gauss(7, 2)))), comment=self.rng.choice(COMMENTS),
+                    ),
+                )
+                threads = self.create_threads(user_ids, game_ids, options['threads'], options['exponent'])
+                self.create_posts(user_ids, threads, options['posts'])
+
+        if not options['skip_derived']:
+            # bulk_create skips signals: rebuild everything they would have maintained
+            self.stdout.write('Refreshing follow and forum reply counters...')
+            social.refresh_counts()
+            thread_ids = list(threads)
+            for start in range(0, len(thread_ids), self.batch_size):
+                ForumThread.refresh_reply_counters(thread_ids[start:start + self.batch_size])
+            for command, kwargs in [
+                ('rebuild_rating_aggregates', {}),
+                ('reindex_search', {}),
+                ('rebuild_facets', {}),
+                ('refresh_trending', {'full': True}),
+                ('rebuild_feed', {}),
+                ('build_recommendations', {}),
+            ]:
+                self.stdout.write(f'Running {command}...')
+                call_command(command, stdout=self.stdout, **kwargs)
+
+        self.stdout.write(self.style.SUCCESS(f'Load data generated in {time.monotonic() - started:.1f}s.'))
+
+    def timestamp(self):
+        return self.now - timedelta(seconds=self.rng.randrange(max(self.days, 1) * 86400))
+
+    def bulk_insert(self, label, model, objects, **kwargs):
+        total = 0
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                model.objects.bulk_create(batch, **kwargs)
+                total += len(batch)
+                batch = []
+        if batch:
+            model.objects.bulk_create(batch, **kwargs)
+            total += len(batch)
+        self.stdout.write(f'  {total} {label}')
+        return total
+
+    def create_users(self, count, prefix, password):
+        # One hash with the default hasher (PASSWORD_HASHERS), shared by every generated user
+        password_hash = make_password(password)
+        self.bulk_insert('users', User, (
+            User(
+                username=f'{prefix}_{i}', email=f'{prefix}_{i}@example.com', password=password_hash,
+                date_joined=self.timestamp(),
+            )
+            for i in range(count)
+        ))
+        return list(User.objects.filter(username__startswith=f'{prefix}_').values_list('id', flat=True))
+
+    def create_games(self, count):
+        first_id = (Game.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+        self.bulk_insert('games', Game, (
+            Game(
+                title=f'{self.rng.choice(WORDS)} {self.rng.choice(WORDS)} {i}',
+                description=' '.join(self.rng.choices(WORDS, k=40)),
+                developer=f'Studio {i % 500}',
+                publisher=f'Publisher {i % 120}',
+                release_date=date(2000, 1, 1) + timedelta(days=self.rng.randrange(26 * 365)),
+                genre=self.rng.choice(GENRES),
+            )
+            for i in range(count)
+        ))
+        return list(Game.objects.filter(id__gte=first_id).values_list('id', flat=True))
+
+    def activity(self, count, total):
+        # Heavy-tailed per-user activity (a few power users, a long tail of lurkers), scaled to `total`
+        weights = [self.rng.paretovariate(1.5) for _ in range(count)]
+        scale = total / sum(weights) if weights else 0
+        return [int(weight * scale + self.rng.random()) for weight in weights]
+
+    def create_follows(self, user_ids, total, exponent):
+        popularity = PowerLaw(self.rng, len(user_ids), exponent)
+        out_degrees = self.activity(len(user_ids), total)
+
+        def follows():
+            for follower_id, degree in zip(user_ids, out_degrees):
+                for index in popularity.distinct(degree):
+                    if user_ids[index] != follower_id:
+                        yield Follow(follower_id=follower_id, following_id=user_ids[index])
+
+        self.bulk_insert('follows', Follow, follows())
+
+    def create_pairs(self, label, model, user_ids, game_ids, total, exponent, build):
+        # One row per (user, game) at most, matching the unique constraints
+        popularity = PowerLaw(self.rng, len(game_ids), exponent)
+        counts = self.activity(len(user_ids), total)
+
+        def rows():
+            for user_id, count in zip(user_ids, counts):
+                for index in popularity.distinct(count):
+                    yield build(user_id, game_ids[index])
+
+        self.bulk_insert(label, model, rows())
+
+    def create_threads(self, user_ids, game_ids, total, exponent):
+        # Returns {thread id: created_at} of the new threads
+        if not user_ids or not game_ids:
+            return {}
+        first_id = (ForumThread.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+        popularity = PowerLaw(self.rng, len(game_ids), exponent)
+
+        def threads():
+            for _ in range(total):
+                created_at = self.timestamp()
+                yield ForumThread(
+                    user_id=self.rng.choice(user_ids), game_id=game_ids[popularity.sample()],
+                    title=f'{self.rng.choice(WORDS)} discussion', content=' '.join(self.rng.choices(WORDS, k=30)),
+                    created_at=created_at, last_activity_at=created_at,
+                )
+
+        self.bulk_insert('forum threads', ForumThread, threads())
+        return dict(ForumThread.objects.filter(id__gte=first_id).values_list('id', 'created_at'))
+
+    def create_posts(self, user_ids, started, total):
+        if not user_ids or not started:
+            return
+
+        def posts():
+            # A few busy threads, most with a handful of replies; always after the thread itself
+            for thread_id, count in zip(started, self.activity(len(started), total)):
+                span = max((self.now - started[thread_id]).total_seconds(), 1)
+                for _ in range(count):
+                    yield ForumPost(
+                        thread_id=thread_id, user_id=self.rng.choice(user_ids),
+                        content=' '.join(self.rng.choices(WORDS, k=15)),
+                        created_at=started[thread_id] + timedelta(seconds=self.rng.random() * span),
+                    )
+
+        self.bulk_insert('forum replies', ForumPost, posts())
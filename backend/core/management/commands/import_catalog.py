@@ -0,0 +1,171 @@
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count, islice
+from multiprocessing import get_context
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import cache, catalog, facets, search
+from core.models import Game, GameTrendingScore
+
+# Game fields a catalog dump provides; an upsert overwrites all of them (missing values are stored empty)
+CATALOG_FIELDS = ['title', 'description', 'developer', 'publisher', 'release_date', 'cover_image_url', 'genre']
+# Rejected records printed per file; the rest are only counted
+ERRORS_SHOWN = 20
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports game catalog dumps (CSV with a header row, or NDJSON) in constant memory, '
+        'upserting batches of games keyed on Game.external_id (the "external_id" or "id" '
+        'column). Progress is checkpointed to <file>.import-state after every committed batch, '
+        'so an interrupted import continues where it stopped with --resume.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Catalog files (.csv, .ndjson or .jsonl).')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='File format (default: from the extension).')
+        parser.add_argument('--batch-size', type=int, default=2000, help='Records per upsert transaction.')
+        parser.add_argument(
+            '--workers', type=int, default=0,
+            help='Processes decoding and validating batches in parallel (0: in this process).',
+        )
+        parser.add_argument('--id-prefix', default='', help='Prepended to every id, e.g. "igdb:" to keep sources apart.')
+        parser.add_argument('--resume', action='store_true', help="Continue from each file's checkpoint.")
+        parser.add_argument('--progress-every', type=float, default=5.0, help='Seconds between progress lines.')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        text_fields = {
+            field.name: field.max_length
+            for field in Game._meta.get_fields()
+            if field.name in ('external_id', *CATALOG_FIELDS) and field.get_internal_type() in ('CharField', 'TextField')
+        }
+        executor = None
+        if options['workers'] > 0:
+            # Spawned workers only import core.catalog, never the models or a database connection
+            executor = ProcessPoolExecutor(max_workers=options['workers'], mp_context=get_context('spawn'))
+        try:
+            for path in options['paths']:
+                self.import_file(path, text_fields, executor, options)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+            # bulk_create skips the Game signals: recount the facets, drop every cached game response
+            facets.rebuild()
+            cache.invalidate_all()
+
+    def import_file(self, path, text_fields, executor, options):
+        fmt = options['format'] or catalog.detect_format(path)
+        if fmt is None:
+            raise CommandError(f'Cannot tell the format of {path}; pass --format.')
+        if not os.path.exists(path):
+            raise CommandError(f'{path} does not exist.')
+
+        state_path = f'{path}.import-state'
+        fingerprint = self.fingerprint(path)
+        skip = 0
+        if options['resume'] and os.path.exists(state_path):
+            with open(state_path) as fh:
+                state = json.load(fh)
+            if state.get('file') == fingerprint:
+                skip = state['records']
+                self.stdout.write(f'{path}: resuming after record {skip:,}.')
+            else:
+                self.stdout.write(self.style.WARNING(f'{path}: changed since the checkpoint, starting over.'))
+
+        games_before = Game.objects.count()
+        stats = {'records': skip, 'upserted': 0, 'rejected': 0}
+        started = last_report = time.monotonic()
+        batches = self.prepared_batches(
+            catalog.read_records(path, fmt, skip), skip + 1, text_fields, executor, options,
+        )
+        for records, games, errors in batches:
+            with transaction.atomic():
+                stats['upserted'] += self.upsert(games)
+            stats['records'] += records
+            self.save_state(state_path, fingerprint, stats['records'])
+            for number, message in errors[:max(ERRORS_SHOWN - stats['rejected'], 0)]:
+                self.stderr.write(f'{path}: record {number}: {message}')
+            stats['rejected'] += len(errors)
+
+            now = time.monotonic()
+            if now - last_report >= options['progress_every']:
+                last_report = now
+                self.report(path, stats, skip, now - started)
+
+        if os.path.exists(state_path):
+            os.remove(state_path)
+        self.report(path, stats, skip, time.monotonic() - started)
+        self.stdout.write(self.style.SUCCESS(
+            f'{path}: done, {Game.objects.count() - games_before:,} new games.'
+        ))
+
+    def prepared_batches(self, records, first, text_fields, executor, options):
+        """
+        Yields (record count, games, errors) per batch, in file order. With
+        workers, at most two batches per worker are read ahead, which keeps
+        memory bounded however fast the file is read.
+        """
+        numbers = count(first, options['batch_size'])
+        chunks = iter(lambda: list(islice(records, options['batch_size'])), [])
+        if executor is None:
+            for chunk in chunks:
+                yield (len(chunk), *catalog.prepare_batch(chunk, next(numbers), text_fields, options['id_prefix']))
+            return
+
+        pending = deque()
+        for chunk in chunks:
+            pending.append((len(chunk), executor.submit(
+                catalog.prepare_batch, chunk, next(numbers), text_fields, options['id_prefix'],
+            )))
+            if len(pending) >= 2 * options['workers']:
+                size, future = pending.popleft()
+                yield (size, *future.result())
+        while pending:
+            size, future = pending.popleft()
+            yield (size, *future.result())
+
+    def upsert(self, games):
+        """Inserts or updates a batch of games by external_id. Returns the number of distinct games written."""
+        # The last record of an id wins, as it would have in separate batches
+        games = list({game['external_id']: game for game in games}.values())
+        if not games:
+            return 0
+        saved = Game.objects.bulk_create(
+            [Game(**game) for game in games],
+            update_conflicts=True, unique_fields=['external_id'], update_fields=CATALOG_FIELDS,
+        )
+        game_ids = [game.pk for game in saved]
+        # What the Game signals would have done: trending rows for new games, search index entries
+        GameTrendingScore.objects.bulk_create(
+            [GameTrendingScore(game_id=game_id, refreshed_at=timezone.now()) for game_id in game_ids],
+            ignore_conflicts=True,
+        )
+        search.index_games(game_ids)
+        return len(games)
+
+    @staticmethod
+    def fingerprint(path):
+        stat = os.stat(path)
+        return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    @staticmethod
+    def save_state(state_path, fingerprint, records):
+        # Written after the batch commits: a crash in between only repeats an idempotent upsert
+        with open(f'{state_path}.tmp', 'w') as fh:
+            json.dump({'file': fingerprint, 'records': records}, fh)
+        os.replace(f'{state_path}.tmp', state_path)
+
+    def report(self, path, stats, skip, elapsed):
+        rate = (stats['records'] - skip) / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{path}: {stats['records']:,} records, {stats['upserted']:,} upserted, "
+            f"{stats['rejected']:,} rejected, {rate:,.0f} records/s"
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core import cache, facets
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the stored facet counts (games per genre, developer, publisher and release year).'
+
+    def handle(self, *args, **options):
+        self.stdout.write('Counting games per facet value...')
+        total = facets.rebuild()
+        cache.invalidate_game_lists()
+        self.stdout.write(self.style.SUCCESS(f'Facet counts rebuilt for {total} facet values.'))
@@ -0,0 +1,64 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from core import feed
+from core.models import FeedItem, Follow, LibraryEntry, Review, TimelineEntry
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds feed items and follower timelines from existing reviews and library entries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        followers = defaultdict(list)
+        for follower_id, following_id in Follow.objects.values_list('follower_id', 'following_id').iterator():
+            followers[following_id].append(follower_id)
+
+        sources = [
+            (Review.objects.values_list('user_id', 'game_id', 'created_at', 'rating'), FeedItem.Verbs.REVIEW),
+            (LibraryEntry.objects.values_list('user_id', 'game_id', 'added_at', 'status'), FeedItem.Verbs.STATUS),
+        ]
+
+        created = 0
+        with transaction.atomic():
+            TimelineEntry.objects.all().delete()
+            FeedItem.objects.all().delete()
+
+            for rows, verb in sources:
+                batch = []
+                for actor_id, game_id, created_at, value in rows.iterator(chunk_size=batch_size):
+                    batch.append(FeedItem(
+                        actor_id=actor_id,
+                        verb=verb,
+                        game_id=game_id,
+                        created_at=created_at,
+                        rating=value if verb == FeedItem.Verbs.REVIEW else None,
+                        status=value if verb == FeedItem.Verbs.STATUS else '',
+                        fanned_out=len(followers[actor_id]) <= feed.FANOUT_MAX_FOLLOWERS,
+                    ))
+                    if len(batch) >= batch_size:
+                        created += self._write(batch, followers)
+                        batch = []
+                if batch:
+                    created += self._write(batch, followers)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {created} feed items.'))
+
+    def _write(self, items, followers):
+        # bulk_create sets primary keys on SQLite and PostgreSQL
+        items = FeedItem.objects.bulk_create(items)
+        TimelineEntry.objects.bulk_create(
+            (
+                TimelineEntry(owner_id=owner_id, item_id=item.pk, created_at=item.created_at)
+                for item in items if item.fanned_out
+                for owner_id in followers[item.actor_id]
+            ),
+            batch_size=1000,
+        )
+        return len(items)
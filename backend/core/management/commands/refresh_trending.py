@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.trending import refresh_trending
+
+
+class Command(BaseCommand):
+    help = 'Refreshes the materialized, time-decayed trending scores of all games.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute all scores instead of applying new events only.')
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running as a background worker, refreshing every N seconds.',
+        )
+
+    def handle(self, *args, **options):
+        full = options['full']
+        while True:
+            started = time.monotonic()
+            touched = refresh_trending(full=full)
+            self.stdout.write(self.style.SUCCESS(
+                f'Trending scores refreshed ({touched} games with new activity) in {time.monotonic() - started:.2f}s.'
+            ))
+            if not options['interval']:
+                break
+            # Subsequent runs only need the incremental pass
+            full = False
+            time.sleep(options['interval'])
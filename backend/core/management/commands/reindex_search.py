@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core import cache
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index of the games catalog (SQLite FTS5 table or PostgreSQL GIN index).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias to reindex.')
+
+    def handle(self, *args, **options):
+        self.stdout.write('Reindexing games...')
+        total = rebuild_index(using=options['database'])
+        cache.invalidate_game_lists()
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {total} games.'))
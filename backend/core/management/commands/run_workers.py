@@ -0,0 +1,62 @@
+import logging
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core import tasks
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Runs background job workers (core/tasks.py): rating refreshes, feed fan-out.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help='Worker threads, each with its own connection.')
+        parser.add_argument('--batch-size', type=int, default=tasks.BATCH_SIZE, help='Jobs claimed per batch.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when no job is due.')
+        parser.add_argument('--once', action='store_true', help='Run every due job, then exit.')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            started = time.monotonic()
+            ran = tasks.run_pending(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Ran {ran} jobs in {time.monotonic() - started:.2f}s.'))
+            return
+
+        stop = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self.work, args=(stop, options['batch_size'], options['poll_interval']),
+                name=f'job-worker-{i}', daemon=True,
+            )
+            for i in range(max(options['threads'], 1))
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f'{len(workers)} workers running, Ctrl+C to stop.')
+        try:
+            while any(worker.is_alive() for worker in workers):
+                time.sleep(0.5)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping after the current batches...')
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def work(self, stop, batch_size, poll_interval):
+        try:
+            while not stop.is_set():
+                try:
+                    claimed = tasks.run_batch(batch_size)
+                except Exception:
+                    # e.g. a lost database connection; retried on the next poll
+                    logger.exception('Job batch failed')
+                    connection.close()
+                    claimed = 0
+                if not claimed:
+                    stop.wait(poll_interval)
+        finally:
+            connection.close()
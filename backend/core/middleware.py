@@ -0,0 +1,180 @@
+import logging
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from .profiling import QueryBudgetExceeded, get_query_budget, registry
+
+logger = logging.getLogger(__name__)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.started = perf_counter()
+        self.query_count = 0
+        self.sql_seconds = 0.0
+        self.view_started = None
+        self.view_finished = None
+        self.view_sql_start = 0.0
+        self.sql_seconds_in_view = 0.0
+        self.render_seconds = 0.0
+        self.finished = None
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook: time every query
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.sql_seconds += perf_counter() - started
+
+    @property
+    def sql_ms(self):
+        return self.sql_seconds * 1000
+
+    @property
+    def serialize_ms(self):
+        # Time spent in the view outside of SQL: for DRF views this is mostly serialization
+        if self.view_started is None or self.view_finished is None:
+            return 0.0
+        return max(self.view_finished - self.view_started - self.sql_seconds_in_view, 0.0) * 1000
+
+    @property
+    def render_ms(self):
+        return self.render_seconds * 1000
+
+    @property
+    def total_ms(self):
+        return ((self.finished or perf_counter()) - self.started) * 1000
+
+    def server_timing(self):
+        return ', '.join([
+            f'db;dur={self.sql_ms:.2f};desc="{self.query_count} queries"',
+            f'serialize;dur={self.serialize_ms:.2f}',
+            f'render;dur={self.render_ms:.2f}',
+            f'total;dur={self.total_ms:.2f}',
+        ])
+
+
+class QueryProfilingMiddleware:
+    """
+    Records query count, SQL time, serialization time and render time for every
+    request. The numbers are sent back in a Server-Timing header and aggregated
+    per route for /api/_metrics. Views may declare a `query_budget`; requests
+    that exceed it are logged and counted, or raise QueryBudgetExceeded with
+    QUERY_BUDGET_STRICT (tests).
+    """
+
+    # Async-capable, so async views stay async under ASGI instead of being run in a thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'PROFILING_ENABLED', True)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.enabled:
+            return self.get_response(request)
+
+        profile = request._profile = RequestProfile()
+        with connection.execute_wrapper(profile):
+            response = self.get_response(request)
+
+        if response.streaming:
+            # Streamed bodies run their queries while being sent; finish the profile afterwards
+            response.streaming_content = self._profile_stream(request, response, response.streaming_content, profile)
+            return response
+
+        self._finish(request, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        if not self.enabled:
+            return await self.get_response(request)
+
+        profile = request._profile = RequestProfile()
+        # The async ORM runs this request's queries in its thread-sensitive executor
+        # thread (connections are per thread), so the wrapper is installed there
+        await sync_to_async(_push_wrapper)(profile)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_pop_wrapper)(profile)
+
+        if response.streaming:
+            response.streaming_content = self._profile_stream(request, response, response.streaming_content, profile)
+            return response
+
+        self._finish(request, response, profile)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        profile = getattr(request, '_profile', None)
+        if profile is not None:
+            profile.view_started = perf_counter()
+            profile.view_sql_start = profile.sql_seconds
+
+    def process_template_response(self, request, response):
+        # DRF responses pass through here after the view and before rendering
+        profile = getattr(request, '_profile', None)
+        if profile is not None:
+            self._end_view(profile)
+            render_started = perf_counter()
+
+            def rendered(response):
+                profile.render_seconds = perf_counter() - render_started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def _end_view(self, profile):
+        if profile.view_started is not None and profile.view_finished is None:
+            profile.view_finished = perf_counter()
+            profile.sql_seconds_in_view = profile.sql_seconds - profile.view_sql_start
+
+    def _profile_stream(self, request, response, content, profile):
+        self._end_view(profile)
+        try:
+            with connection.execute_wrapper(profile):
+                yield from content
+        finally:
+            self._finish(request, response, profile, send_header=False)
+
+    def _finish(self, request, response, profile, send_header=True):
+        self._end_view(profile)
+        profile.finished = perf_counter()
+
+        match = getattr(request, 'resolver_match', None)
+        route = '/' + match.route if match is not None else 'unmatched'
+        view_class = getattr(match.func, 'view_class', None) if match is not None else None
+        budget = get_query_budget(view_class, request.method)
+        over_budget = budget is not None and profile.query_count > budget
+        registry.record(route, profile, over_budget=over_budget)
+        if over_budget:
+            if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+                raise QueryBudgetExceeded(
+                    f'{request.method} {request.path} ran {profile.query_count} queries, budget is {budget}'
+                )
+            logger.warning(
+                '%s %s ran %d queries (budget %d)', request.method, request.path, profile.query_count, budget,
+            )
+        if send_header:
+            response['Server-Timing'] = profile.server_timing()
+            response['Timing-Allow-Origin'] = '*'
+
+
+def _push_wrapper(profile):
+    connection.execute_wrappers.append(profile)
+
+
+def _pop_wrapper(profile):
+    connection.execute_wrappers.remove(profile)
@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:07
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_rating_aggregates(apps, schema_editor):
+    # Existing games start from their reviews, so the first rating delta after the deploy adds to real totals
+    Game = apps.get_model('core', 'Game')
+    Review = apps.get_model('core', 'Review')
+    games = {}
+    buckets = (
+        Review.objects.values('game_id', 'rating').annotate(total=Count('id'))
+        .order_by('game_id').values_list('game_id', 'rating', 'total')
+    )
+    for game_id, rating, total in buckets:
+        game = games.setdefault(game_id, Game(pk=game_id, review_count=0, rating_sum=0))
+        game.review_count += total
+        game.rating_sum += rating * total
+        if 1 <= rating <= 10:
+            setattr(game, f'rating_{rating}_count', total)
+    for game in games.values():
+        game.average_rating = round(game.rating_sum / game.review_count, 2)
+    Game.objects.bulk_update(
+        games.values(),
+        ['review_count', 'rating_sum', 'average_rating', *(f'rating_{value}_count' for value in range(1, 11))],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_alter_game_average_rating'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='rating_10_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_6_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_7_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_8_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_9_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='rating_sum',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_rating_aggregates, migrations.RunPython.noop),
+    ]
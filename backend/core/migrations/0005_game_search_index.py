@@ -0,0 +1,43 @@
+from django.db import migrations
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS core_game_fts USING fts5("
+    "title, developer, publisher, tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+)
+SQLITE_POPULATE = (
+    "INSERT INTO core_game_fts (rowid, title, developer, publisher) "
+    "SELECT id, title, developer, publisher FROM core_game"
+)
+POSTGRES_CREATE = (
+    "CREATE INDEX IF NOT EXISTS core_game_search_gin ON core_game USING GIN (("
+    "to_tsvector('simple'::regconfig, coalesce(\"core_game\".\"title\", '') || ' ' || "
+    "coalesce(\"core_game\".\"developer\", '') || ' ' || coalesce(\"core_game\".\"publisher\", ''))))"
+)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(SQLITE_CREATE)
+        schema_editor.execute(SQLITE_POPULATE)
+    elif vendor == 'postgresql':
+        schema_editor.execute(POSTGRES_CREATE)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS core_game_fts")
+    elif vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS core_game_search_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_game_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
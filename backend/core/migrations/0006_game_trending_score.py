@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:11
+
+import django.db.models.deletion
+from django.utils import timezone
+from django.db import migrations, models
+
+
+def create_trending_rows(apps, schema_editor):
+    # Every game gets a row so trending pages can be served from the score index.
+    # Scores start at zero; run `manage.py refresh_trending --full` to compute them.
+    Game = apps.get_model('core', 'Game')
+    GameTrendingScore = apps.get_model('core', 'GameTrendingScore')
+    now = timezone.now()
+    GameTrendingScore.objects.bulk_create(
+        (GameTrendingScore(game_id=game_id, score=0.0, refreshed_at=now) for game_id in Game.objects.values_list('id', flat=True)),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_game_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameTrendingScore',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending', serialize=False, to='core.game')),
+                ('score', models.FloatField(default=0.0)),
+                ('refreshed_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['score', 'game'], name='trending_score_idx')],
+            },
+        ),
+        migrations.RunPython(create_trending_rows, migrations.RunPython.noop),
+    ]
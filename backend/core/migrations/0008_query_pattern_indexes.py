@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-17 16:17
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_activity_feed'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='forumthread',
+            index=models.Index(fields=['game', '-created_at'], name='thread_game_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='forumthread',
+            index=models.Index(fields=['user', '-created_at'], name='thread_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(django.db.models.functions.text.Lower('genre'), name='game_genre_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='libraryentry',
+            index=models.Index(fields=['user', '-added_at'], name='library_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['user', '-created_at'], name='review_user_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['game', '-created_at'], name='review_game_recent_idx'),
+        ),
+        # Single-column FK indexes made redundant by the composite indexes above
+        migrations.AlterField(
+            model_name='forumthread',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='threads', to='core.game'),
+        ),
+        migrations.AlterField(
+            model_name='forumthread',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='threads', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='libraryentry',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='library', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='core.game'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
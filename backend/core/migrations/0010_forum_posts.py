@@ -0,0 +1,59 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_last_activity(apps, schema_editor):
+    # Existing threads have no replies yet: their last activity is their creation
+    ForumThread = apps.get_model('core', 'ForumThread')
+    ForumThread.objects.update(last_activity_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_background_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ForumPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RemoveIndex(
+            model_name='forumthread',
+            name='thread_game_recent_idx',
+        ),
+        migrations.AddField(
+            model_name='forumthread',
+            name='last_activity_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='forumthread',
+            name='reply_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_last_activity, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='forumthread',
+            index=models.Index(fields=['game', '-last_activity_at', '-id'], name='thread_game_activity_idx'),
+        ),
+        migrations.AddField(
+            model_name='forumpost',
+            name='thread',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='posts', to='core.forumthread'),
+        ),
+        migrations.AddField(
+            model_name='forumpost',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='forum_posts', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
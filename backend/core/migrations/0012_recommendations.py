@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_social_graph'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('game', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='neighbours', to='core.game')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='core.game')),
+            ],
+            options={
+                'verbose_name_plural': 'Game Similarities',
+                'indexes': [models.Index(fields=['game', '-score'], name='similarity_game_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('game', 'similar'), name='unique_game_similarity')],
+            },
+        ),
+    ]
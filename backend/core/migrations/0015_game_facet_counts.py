@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:43
+
+from django.db import migrations, models
+from django.db.models import CharField, Count, F
+from django.db.models.functions import Cast, ExtractYear, Lower
+
+
+def backfill_facet_counts(apps, schema_editor):
+    Game = apps.get_model('core', 'Game')
+    GameFacetCount = apps.get_model('core', 'GameFacetCount')
+    expressions = {
+        'genre': Lower('genre'), 'developer': F('developer'), 'publisher': F('publisher'),
+        'year': Cast(ExtractYear('release_date'), CharField()),
+    }
+    for facet, expression in expressions.items():
+        counts = (
+            Game.objects.annotate(facet_value=expression).exclude(facet_value='').exclude(facet_value=None)
+            .order_by().values('facet_value').annotate(games=Count('id')).values_list('facet_value', 'games')
+        )
+        GameFacetCount.objects.bulk_create(
+            (GameFacetCount(facet=facet, value=value, count=count) for value, count in counts), batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_game_external_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(max_length=20)),
+                ('value', models.CharField(max_length=255)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['facet', '-count', 'value'], name='facet_count_idx')],
+                'constraints': [models.UniqueConstraint(fields=('facet', 'value'), name='unique_game_facet_value')],
+            },
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
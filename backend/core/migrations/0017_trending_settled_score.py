@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:02
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def settle_existing_scores(apps, schema_editor):
+    # Existing scores were computed up to refreshed_at; treat all of it as settled
+    GameTrendingScore = apps.get_model('core', 'GameTrendingScore')
+    GameTrendingScore.objects.update(settled_score=F('score'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_review_helpfulness'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gametrendingscore',
+            name='settled_score',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(settle_existing_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:40
+
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import Lower
+
+
+def label_facet_values(apps, schema_editor):
+    Game = apps.get_model('core', 'Game')
+    GameFacetCount = apps.get_model('core', 'GameFacetCount')
+    GameFacetCount.objects.update(label=F('value'))
+    # Genres are shown in their most common spelling
+    spellings = (
+        Game.objects.exclude(genre='').exclude(genre=None)
+        .annotate(key=Lower('genre')).order_by().values('key', 'genre')
+        .annotate(games=Count('id')).values_list('key', 'genre', 'games')
+    )
+    labels = {}
+    for key, genre, games in sorted(spellings, key=lambda row: (-row[2], row[1])):
+        labels.setdefault(key, genre)
+    for key, label in labels.items():
+        GameFacetCount.objects.filter(facet='genre', value=key).update(label=label)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_trending_settled_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamefacetcount',
+            name='label',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(label_facet_values, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,12 @@
-from django.db import models
+from collections import Counter
+
+from django.db import models, transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Lower, Round
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.conf import settings
+from django.utils import timezone
 
 # --- 1. Custom User Model (Page 12) ---
 class User(AbstractUser):
@@ -13,16 +18,56 @@ class User(AbstractUser):
     role = models.CharField(max_length=20, choices=Roles.choices, default=Roles.GAMER)
     avatar_url = models.TextField(blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
+    # Denormalized from Follow by core/social.py, in the same transaction as the edge
+    follower_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    # Access tokens carry `ver` (core/authentication.py): bumped whenever a claim in them
+    # or the account's standing changes, so a refresh within the second of a revocation
+    # can still tell tokens issued after it from those issued before
+    auth_version = models.PositiveIntegerField(default=0)
+    # Tokens issued before this moment are revoked (deactivation, "log out everywhere")
+    tokens_valid_after = models.DateTimeField(null=True, blank=True)
 
     # We replace the default username login with email if desired, 
     # but for now we keep username required as per AbstractUser default.
     REQUIRED_FIELDS = ['email', 'role']
 
+    # Copied into tokens as claims
+    CLAIM_FIELDS = ('username', 'role')
+    # Changing one of these also revokes every token issued so far
+    REVOKING_FIELDS = ('is_active',)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored claims, so save() can tell when issued tokens go stale
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_auth = {
+            name: loaded[name] for name in (*cls.CLAIM_FIELDS, *cls.REVOKING_FIELDS) if name in loaded
+        }
+        return instance
+
+    def save(self, *args, **kwargs):
+        loaded = getattr(self, '_loaded_auth', {})
+        changed = {name for name, value in loaded.items() if getattr(self, name) != value}
+        if changed:
+            bumped = ['auth_version']
+            self.auth_version += 1
+            if changed & set(self.REVOKING_FIELDS):
+                self.tokens_valid_after = timezone.now()
+                bumped.append('tokens_valid_after')
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], *bumped}
+        super().save(*args, **kwargs)
+        self._loaded_auth = {name: getattr(self, name) for name in loaded}
+
     def __str__(self):
         return self.username
 
 # --- 2. Game Model (Page 12) ---
 class Game(models.Model):
+    # Stable id from the catalog the game was imported from (`manage.py import_catalog` upserts on it)
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     developer = models.CharField(max_length=255, blank=True)
@@ -30,15 +75,164 @@ class Game(models.Model):
     release_date = models.DateField(null=True, blank=True)
     cover_image_url = models.TextField(blank=True, null=True)
     genre = models.CharField(max_length=100, blank=True)
-    # Average rating is updated automatically when reviews are added
+    # Average rating is derived from review_count / rating_sum whenever a review changes
     average_rating = models.DecimalField(max_digits=4, decimal_places=2, default=0.00)
 
+    # Stored rating aggregates, kept up to date with F() expressions (see apply_rating_change)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveBigIntegerField(default=0)
+    # Rating histogram: one counter per possible rating (1-10)
+    rating_1_count = models.PositiveIntegerField(default=0)
+    rating_2_count = models.PositiveIntegerField(default=0)
+    rating_3_count = models.PositiveIntegerField(default=0)
+    rating_4_count = models.PositiveIntegerField(default=0)
+    rating_5_count = models.PositiveIntegerField(default=0)
+    rating_6_count = models.PositiveIntegerField(default=0)
+    rating_7_count = models.PositiveIntegerField(default=0)
+    rating_8_count = models.PositiveIntegerField(default=0)
+    rating_9_count = models.PositiveIntegerField(default=0)
+    rating_10_count = models.PositiveIntegerField(default=0)
+
+    RATING_VALUES = range(1, 11)
+    RATING_HISTOGRAM_FIELDS = [f'rating_{value}_count' for value in RATING_VALUES]
+
+    @classmethod
+    def apply_rating_change(cls, game_id, old_rating=None, new_rating=None):
+        """
+        Applies a single review change (create: new only, delete: old only,
+        update: both) to the stored aggregates in one UPDATE statement.
+        """
+        cls.apply_rating_changes(game_id, [(old_rating, new_rating)])
+
+    @classmethod
+    def apply_rating_changes(cls, game_id, changes):
+        """
+        Applies several (old_rating, new_rating) review changes of one game in
+        a single UPDATE statement. Every column is computed from its current
+        value in the database, so concurrent writers never overwrite each other
+        and no review rows are scanned.
+        """
+        count_delta = sum_delta = 0
+        histogram = Counter()
+        for old_rating, new_rating in changes:
+            old_rating = int(old_rating) if old_rating is not None else None
+            new_rating = int(new_rating) if new_rating is not None else None
+            if old_rating == new_rating:
+                continue
+            count_delta += (new_rating is not None) - (old_rating is not None)
+            sum_delta += (new_rating or 0) - (old_rating or 0)
+            if old_rating in cls.RATING_VALUES:
+                histogram[old_rating] -= 1
+            if new_rating in cls.RATING_VALUES:
+                histogram[new_rating] += 1
+        histogram = {rating: delta for rating, delta in histogram.items() if delta}
+        if not (count_delta or sum_delta or histogram):
+            return
+
+        updates = {
+            'review_count': F('review_count') + count_delta,
+            'rating_sum': F('rating_sum') + sum_delta,
+            # All right-hand sides see the pre-update row, so the new average
+            # is computed from the new sum and count directly.
+            'average_rating': Case(
+                When(
+                    review_count__gt=-count_delta,
+                    then=Round(
+                        Cast(F('rating_sum') + sum_delta, FloatField()) / (F('review_count') + count_delta),
+                        2,
+                    ),
+                ),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        }
+        for rating, delta in histogram.items():
+            field = f'rating_{rating}_count'
+            updates[field] = F(field) + delta
+
+        cls.objects.filter(pk=game_id).update(**updates)
+
+    def rating_histogram(self):
+        return {value: getattr(self, f'rating_{value}_count') for value in self.RATING_VALUES}
+
+    # Read by the facet counters (core/facets.py)
+    FACET_FIELDS = ('genre', 'developer', 'publisher', 'release_date')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored facet fields, so signals can move the game between facet counts
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        instance._loaded_facets = {name: loaded[name] for name in cls.FACET_FIELDS if name in loaded}
+        return instance
+
+    @classmethod
+    def refresh_rating_aggregates(cls, game_ids):
+        """
+        Recomputes the stored aggregates of several games from their reviews:
+        one grouped query for all of them and one bulk UPDATE. Idempotent, so
+        queued refreshes of the same game can be collapsed into one. Queued
+        rating deltas of these games that the recount already covers are
+        discarded; later ones still apply on top of it.
+        """
+        from django.db.models import Count, IntegerField
+        games = {
+            game_id: cls(pk=game_id, review_count=0, rating_sum=0, **{field: 0 for field in cls.RATING_HISTOGRAM_FIELDS})
+            for game_id in game_ids
+        }
+        none = Value(None, output_field=IntegerField())
+        with transaction.atomic():
+            # A worker applying a delta the recount misses waits here instead of being overwritten below
+            list(cls.objects.select_for_update().filter(pk__in=games).order_by('pk').values_list('pk', flat=True))
+            # Reviews and queued deltas in one statement, so both are read from the same snapshot:
+            # every delta read here belongs to a review the recount counts
+            buckets = (
+                Review.objects.filter(game_id__in=games)
+                .values('game_id', 'rating')
+                .annotate(total=Count('id'), job_id=none)
+                .values_list('game_id', 'rating', 'total', 'job_id')
+            )
+            deltas = (
+                Job.objects.filter(name='ratings.apply', payload__game_id__in=list(games))
+                .annotate(job_game=none, job_rating=none, job_total=none)
+                .values_list('job_game', 'job_rating', 'job_total', 'id')
+            )
+            covered = []
+            for game_id, rating, total, job_id in buckets.union(deltas, all=True):
+                if job_id is not None:
+                    covered.append(job_id)
+                    continue
+                game = games[game_id]
+                game.review_count += total
+                game.rating_sum += rating * total
+                if rating in cls.RATING_VALUES:
+                    setattr(game, f'rating_{rating}_count', total)
+            for game in games.values():
+                game.average_rating = round(game.rating_sum / game.review_count, 2) if game.review_count else 0.0
+            Job.objects.filter(pk__in=covered).delete()
+            cls.objects.bulk_update(
+                games.values(), ['review_count', 'rating_sum', 'average_rating', *cls.RATING_HISTOGRAM_FIELDS],
+            )
+
     def update_average_rating(self):
-        # Calculate the average from all related reviews
-        from django.db.models import Avg
-        average = self.reviews.aggregate(Avg('rating'))['rating__avg'] or 0.0
-        self.average_rating = round(average, 2)
-        self.save()
+        # Full recalculation from the reviews table. Only needed to repair drift;
+        # review writes apply their deltas (apply_rating_changes(), 'ratings.apply' jobs).
+        from django.db.models import Count
+        buckets = dict(
+            self.reviews.values('rating').annotate(total=Count('id')).values_list('rating', 'total')
+        )
+        self.review_count = sum(buckets.values())
+        self.rating_sum = sum(rating * total for rating, total in buckets.items())
+        for value in self.RATING_VALUES:
+            setattr(self, f'rating_{value}_count', buckets.get(value, 0))
+        self.average_rating = round(self.rating_sum / self.review_count, 2) if self.review_count else 0.0
+        self.save(update_fields=['review_count', 'rating_sum', 'average_rating', *self.RATING_HISTOGRAM_FIELDS])
+
+    class Meta:
+        indexes = [
+            # Matches the LOWER(genre) = ... comparison used for case-insensitive genre filtering
+            models.Index(Lower('genre'), name='game_genre_lower_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -52,53 +246,287 @@ class LibraryEntry(models.Model):
         DROPPED = 'DROPPED', 'Dropped'
         WISHLIST = 'WISHLIST', 'Wishlist'
 
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='library')
+    # user_id lookups are served by unique_library_entry / library_user_recent_idx
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='library', db_index=False)
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='library_entries')
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.PLAYING)
     added_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the stored status so a status change can be published to the feed
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = dict(zip(field_names, values)).get('status')
+        return instance
+
     class Meta:
         # Page 13: Unique Key to ensure a user cannot add the same game twice
         constraints = [
             models.UniqueConstraint(fields=['user', 'game'], name='unique_library_entry')
         ]
+        indexes = [
+            # A user's library / feed activity, newest first
+            models.Index(fields=['user', '-added_at'], name='library_user_recent_idx'),
+        ]
         verbose_name_plural = "Library Entries"
 
 # --- 4. Reviews (Page 13) ---
 class Review(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews')
-    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='reviews')
+    # FK lookups are served by the composite indexes below
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='reviews', db_index=False)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='reviews', db_index=False)
     # Page 16: Strict validation 1-10
     rating = models.IntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(10)] 
     )
     comment = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized from ReviewVote (see core/signals.py), so "most helpful first" reads an index
+    helpful_count = models.PositiveIntegerField(default=0)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the rating/game as stored, so signals can apply the exact delta on update.
+        # Partial loads (.only() / .defer()) without both leave the previous values unknown
+        instance = super().from_db(db, field_names, values)
+        if 'rating' in field_names and 'game_id' in field_names:
+            loaded = dict(zip(field_names, values))
+            instance._loaded_rating = loaded['rating']
+            instance._loaded_game_id = loaded['game_id']
+        return instance
 
     class Meta:
         # Page 13: Prevent review bombing (one review per game per user)
         constraints = [
             models.UniqueConstraint(fields=['user', 'game'], name='unique_user_game_review')
         ]
+        indexes = [
+            # A user's reviews newest first (activity feed)
+            models.Index(fields=['user', '-created_at'], name='review_user_recent_idx'),
+            # A game's reviews in each order of its review list (keyset pagination, id breaks ties);
+            # the newest also feed the five embedded in GameSerializer
+            models.Index(fields=['game', '-created_at', '-id'], name='review_game_recent_idx'),
+            models.Index(fields=['game', '-rating', '-id'], name='review_game_rating_idx'),
+            models.Index(fields=['game', '-helpful_count', '-id'], name='review_game_helpful_idx'),
+        ]
 
 # --- 5. Follows (Page 13) ---
 class Follow(models.Model):
-    follower = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='following')
-    following = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='followers')
+    # Lookups are served by unique_follow (by follower) and the recency indexes below
+    follower = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='following', db_index=False)
+    following = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='followers', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=['follower', 'following'], name='unique_follow')
         ]
+        indexes = [
+            # Follower / following lists, most recent first (keyset pagination)
+            models.Index(fields=['following', '-created_at', '-id'], name='follow_followers_recent_idx'),
+            models.Index(fields=['follower', '-created_at', '-id'], name='follow_following_recent_idx'),
+        ]
 
 # --- 6. Forum Threads (Page 13) ---
 class ForumThread(models.Model):
-    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='threads')
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='threads')
+    # FK lookups are served by the composite indexes below
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='threads', db_index=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='threads', db_index=False)
     title = models.CharField(max_length=255)
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Denormalized from the thread's posts on every reply (see core/signals.py),
+    # so thread lists never count or scan replies
+    reply_count = models.PositiveIntegerField(default=0)
+    last_activity_at = models.DateTimeField(default=timezone.now)
+
+    @classmethod
+    def refresh_reply_counters(cls, thread_ids=None):
+        """
+        Recomputes reply_count / last_activity_at from the posts in one UPDATE.
+        Only needed after bulk inserts or to repair drift; replies update the
+        counters as they are written.
+        """
+        from django.db.models import Count, OuterRef, Subquery
+        from django.db.models.functions import Coalesce, Greatest
+        posts = ForumPost.objects.filter(thread=OuterRef('pk')).order_by().values('thread')
+        threads = cls.objects.all() if thread_ids is None else cls.objects.filter(pk__in=thread_ids)
+        return threads.update(
+            reply_count=Coalesce(Subquery(posts.annotate(total=Count('id')).values('total')), 0),
+            last_activity_at=Greatest(
+                'created_at',
+                Coalesce(Subquery(posts.annotate(latest=models.Max('created_at')).values('latest')), 'created_at'),
+            ),
+        )
+
+    class Meta:
+        indexes = [
+            # A game's forum, most recently active threads first (keyset pagination)
+            models.Index(fields=['game', '-last_activity_at', '-id'], name='thread_game_activity_idx'),
+            # A user's threads newest first (pull-mode activity feed)
+            models.Index(fields=['user', '-created_at'], name='thread_user_recent_idx'),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return self.title
+
+
+class ForumPost(models.Model):
+    # Replies of a thread are read in id order through the thread FK index
+    thread = models.ForeignKey(ForumThread, on_delete=models.CASCADE, related_name='posts')
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='forum_posts')
+    content = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f'Reply to {self.thread_id}'
+
+# --- 7. Trending Scores ---
+# Materialized, time-decayed popularity per game (refreshed by `manage.py refresh_trending`)
+class GameTrendingScore(models.Model):
+    game = models.OneToOneField(Game, on_delete=models.CASCADE, primary_key=True, related_name='trending')
+    score = models.FloatField(default=0.0)
+    # The part of the score from events older than trending.SETTLE_WINDOW at refreshed_at
+    settled_score = models.FloatField(default=0.0)
+    refreshed_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            # Trending pages walk this index backwards: ORDER BY score DESC, game_id DESC
+            models.Index(fields=['score', 'game'], name='trending_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.game_id}: {self.score:.3f}'
+
+# --- 8. Activity Feed ---
+# One FeedItem per activity, written once; TimelineEntry rows fan it out to followers.
+class FeedItem(models.Model):
+    class Verbs(models.TextChoices):
+        REVIEW = 'REVIEW', 'Review'
+        STATUS = 'STATUS', 'Library Status'
+
+    actor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_items')
+    verb = models.CharField(max_length=20, choices=Verbs.choices)
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='feed_items')
+    rating = models.IntegerField(null=True, blank=True)
+    status = models.CharField(max_length=20, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    # False for actors above FEED_FANOUT_MAX_FOLLOWERS: read-time merged instead of fanned out
+    fanned_out = models.BooleanField(default=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['actor', '-created_at', '-id'], name='feeditem_actor_recent_idx'),
+            models.Index(
+                fields=['-created_at', '-id'], name='feeditem_pull_recent_idx',
+                condition=models.Q(fanned_out=False),
+            ),
+        ]
+
+
+class TimelineEntry(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='timeline')
+    item = models.ForeignKey(FeedItem, on_delete=models.CASCADE, related_name='timeline_entries')
+    # Copy of item.created_at so a feed page is a single range read on (owner, created_at)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'item'], name='unique_timeline_entry')
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-item'], name='timeline_owner_recent_idx'),
+        ]
+        verbose_name_plural = "Timeline Entries"
+
+# --- 9. Background Jobs ---
+# Post-write side effects queued by core/tasks.py and executed by `manage.py run_workers`.
+class Job(models.Model):
+    class States(models.TextChoices):
+        PENDING = 'PENDING', 'Pending'
+        RUNNING = 'RUNNING', 'Running'
+        FAILED = 'FAILED', 'Failed'
+
+    name = models.CharField(max_length=100)
+    # Jobs with the same key collapse into one while pending (NULL: never deduplicated)
+    key = models.CharField(max_length=255, null=True, blank=True)
+    payload = models.JSONField(default=dict)
+    state = models.CharField(max_length=20, choices=States.choices, default=States.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key'], name='unique_pending_job_key',
+                condition=models.Q(state='PENDING'),
+            ),
+        ]
+        indexes = [
+            # Workers claim the oldest due jobs
+            models.Index(fields=['state', 'run_after', 'id'], name='job_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.name} ({self.state})'
+
+# --- 10. Recommendations ---
+# Top-K most similar games per game (item-item cosine), built by `manage.py build_recommendations`.
+class GameSimilarity(models.Model):
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='neighbours', db_index=False)
+    similar = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='similar_to')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['game', 'similar'], name='unique_game_similarity')
+        ]
+        indexes = [
+            # A game's neighbours best first: /similar/ and the seeds of user recommendations
+            models.Index(fields=['game', '-score'], name='similarity_game_score_idx'),
+        ]
+        verbose_name_plural = "Game Similarities"
+
+    def __str__(self):
+        return f'{self.game_id} ~ {self.similar_id}: {self.score:.3f}'
+
+# --- 11. Facet Counts ---
+# Games per genre / developer / publisher / release year, kept up to date by core/facets.py.
+class GameFacetCount(models.Model):
+    facet = models.CharField(max_length=20)
+    # Counted by: genres are lowercased, so 'Action' and 'action' share a row
+    value = models.CharField(max_length=255)
+    # Shown for the value: the most common spelling as of the last rebuild
+    label = models.CharField(max_length=255, blank=True)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='unique_game_facet_value')
+        ]
+        indexes = [
+            # A facet's values, most frequent first
+            models.Index(fields=['facet', '-count', 'value'], name='facet_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.facet}={self.value}: {self.count}'
+
+
+# --- 12. Review Votes ---
+# "This review was helpful", once per user and review; counted in Review.helpful_count.
+class ReviewVote(models.Model):
+    # Lookups by review are served by unique_review_vote
+    review = models.ForeignKey(Review, on_delete=models.CASCADE, related_name='votes', db_index=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='review_votes')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['review', 'user'], name='unique_review_vote')
+        ]
@@ -0,0 +1,160 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over a single ordering field plus the primary key
+    as tie-breaker. The cursor stores the (value, pk) of the last row of the
+    page, so the next page is a WHERE ... ORDER BY ... LIMIT query that stays
+    cheap at any depth and is stable while rows are inserted.
+
+    The view tells the paginator what to order by through get_keyset_ordering(),
+    returning e.g. '-average_rating'. NULL values always sort last. A view may
+    also name the tie-breaker column through get_keyset_tiebreak() when a
+    joined column equal to the primary key lets the database walk an index
+    (e.g. 'trending__game' for the trending table).
+    """
+    page_size = 24
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Fetch one extra row to find out whether there is a next page
+        return self.set_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Async views: the same page, read with the async ORM."""
+        return self.set_page([obj async for obj in self.get_page_queryset(queryset, request, view)])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        ordering = view.get_keyset_ordering() if hasattr(view, 'get_keyset_ordering') else 'pk'
+        self.descending = ordering.startswith('-')
+        self.field = ordering.lstrip('-')
+        if self.field == 'id':
+            self.field = 'pk'
+        self.tiebreak = view.get_keyset_tiebreak() if hasattr(view, 'get_keyset_tiebreak') else 'pk'
+        self.value_field = None if self.field == 'pk' else self.get_value_field(queryset, self.field)
+        self.nullable = self.value_field is not None and getattr(self.value_field, 'null', True)
+
+        queryset = queryset.order_by(*self.get_order_by())
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_cursor_filter(*cursor))
+
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    @staticmethod
+    def get_value_field(queryset, field):
+        # The model field or annotation output field the ordering values come from
+        annotation = queryset.query.annotations.get(field)
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(field)
+
+    def get_order_by(self):
+        tiebreak = f'-{self.tiebreak}' if self.descending else self.tiebreak
+        if self.field == 'pk':
+            return [tiebreak]
+        if not self.nullable:
+            return [f'-{self.field}' if self.descending else self.field, tiebreak]
+        expression = F(self.field).desc(nulls_last=True) if self.descending else F(self.field).asc(nulls_last=True)
+        return [expression, tiebreak]
+
+    def get_cursor_filter(self, value, pk):
+        after = 'lt' if self.descending else 'gt'
+        if self.field == 'pk':
+            return Q(**{f'{self.tiebreak}__{after}': pk})
+        if value is None:
+            # Already inside the trailing NULL block: only the tie-breaker moves
+            return Q(**{f'{self.field}__isnull': True, f'{self.tiebreak}__{after}': pk})
+        condition = (
+            Q(**{f'{self.field}__{after}': value})
+            | Q(**{self.field: value, f'{self.tiebreak}__{after}': pk})
+        )
+        if self.nullable:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+    def get_position(self, obj):
+        value = None if self.field == 'pk' else getattr(obj, self.field)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+        elif isinstance(value, decimal.Decimal):
+            value = str(value)
+        return [value, obj.pk]
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            # Typed by the ordering field, so a tampered value is a bad cursor and not a database error
+            if value is not None and self.value_field is not None:
+                value = self.value_field.to_python(value)
+            return value, int(pk)
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.get_position(self.page[-1])))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+
+class GameCursorPagination(KeysetPagination):
+    page_size = 24
+    max_page_size = 100
+
+
+class ForumPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+
+class ReviewPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+
+
+class SocialPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 200
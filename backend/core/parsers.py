@@ -0,0 +1,44 @@
+import codecs
+import csv
+import json
+
+from rest_framework.parsers import BaseParser
+
+
+class StreamingParser(BaseParser):
+    """
+    Parses a line-oriented request body lazily: parse() returns a generator
+    reading the stream as it is consumed, so bulk uploads are processed in
+    bounded memory instead of being loaded into request.body first.
+    The generator must be consumed while the request is being handled.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding') or 'utf-8'
+        return self.iter_rows(codecs.iterdecode(stream, encoding))
+
+    def iter_rows(self, lines):
+        raise NotImplementedError
+
+
+class NDJSONParser(StreamingParser):
+    """One JSON object per line. Lines that are not valid JSON are yielded as None."""
+    media_type = 'application/x-ndjson'
+
+    def iter_rows(self, lines):
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield None
+
+
+class CSVParser(StreamingParser):
+    """CSV with a header row; every following row becomes a dict keyed by the header."""
+    media_type = 'text/csv'
+
+    def iter_rows(self, lines):
+        yield from csv.DictReader(lines)
@@ -0,0 +1,105 @@
+"""
+Password hashing off the request threads.
+
+Hashing is deliberately CPU-heavy, so a burst of logins or signups hashed on
+the WSGI threads leaves no CPU (and no free threads) for other endpoints.
+In 'pool' mode the hashes run on a small process pool instead: at most
+PASSWORD_HASH_WORKERS cores hash at once, and once PASSWORD_HASH_MAX_PENDING
+requests are waiting for it new ones are refused with a 503 rather than
+queueing up behind each other.
+
+Logins go through core.backends.PooledModelBackend, which also upgrades
+hashes made by an older hasher (PASSWORD_HASHERS, settings 13) as users log in.
+The pool processes import this module without setting Django up, so it must
+not touch models.
+"""
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from rest_framework import exceptions
+
+# 'pool': hash on a process pool; 'inline': on the request thread (Django's default behaviour)
+HASH_MODE = getattr(settings, 'PASSWORD_HASH_MODE', 'pool')
+# Processes hashing at once, per server process
+HASH_WORKERS = getattr(settings, 'PASSWORD_HASH_WORKERS', 2)
+# Requests waiting for (or using) the pool before further ones are refused
+MAX_PENDING = getattr(settings, 'PASSWORD_HASH_MAX_PENDING', 16)
+
+
+class HashingBusy(exceptions.APIException):
+    status_code = 503
+    default_detail = 'Too many sign-ins in progress, please retry shortly.'
+    default_code = 'hashing_busy'
+    # Sent as Retry-After by DRF's exception handler
+    wait = 1
+
+
+# --- Pool ---
+# Run in the pool processes, which only need the hasher settings
+
+def _hash(password):
+    return make_password(password)
+
+
+def _verify(password, encoded):
+    # Django decides whether the stored hash is outdated (other hasher, weaker parameters)
+    rehashed = []
+    valid = check_password(password, encoded, setter=lambda raw: rehashed.append(make_password(raw)))
+    return valid, rehashed[0] if rehashed else None
+
+
+class HashPool:
+    def __init__(self, workers=HASH_WORKERS, max_pending=MAX_PENDING):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+        try:
+            try:
+                return self._get_executor().submit(func, *args).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory): start a fresh pool once
+                self.shutdown()
+                return self._get_executor().submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: forking a threaded server process can copy held locks
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=get_context('spawn'))
+            return self._executor
+
+
+pool = HashPool()
+
+
+def _run(func, *args):
+    if HASH_MODE == 'inline':
+        return func(*args)
+    return pool.run(func, *args)
+
+
+def hash_password(password):
+    """The encoded hash of `password` with the preferred hasher."""
+    return _run(_hash, password)
+
+
+def verify_password(password, encoded):
+    """(valid, rehashed): `rehashed` is a new encoding to store when `encoded` is outdated, else None."""
+    return _run(_verify, password, encoded)
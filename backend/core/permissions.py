@@ -12,4 +12,11 @@ class IsAdminOrReadOnly(permissions.BasePermission):
             return True
 
         # Write permissions are only allowed to the admin
-        return request.user.is_authenticated and request.user.role == 'ADMIN'
\ No newline at end of file
+        return request.user.is_authenticated and request.user.role == 'ADMIN'
+
+class IsAdmin(permissions.BasePermission):
+    """
+    Only Admins, for every method.
+    """
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and request.user.role == 'ADMIN'
@@ -0,0 +1,88 @@
+import asyncio
+from collections import defaultdict
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import LibraryEntry, Review
+
+# How many of the newest reviews GameSerializer embeds per game
+RECENT_REVIEWS_PER_GAME = 5
+
+
+def _context_querysets(games, user, include_library_entries, include_reviews):
+    game_ids = {game.pk for game in games}
+    library_entries = recent_reviews = None
+    if game_ids:
+        if include_library_entries and user is not None and user.is_authenticated:
+            library_entries = LibraryEntry.objects.filter(user=user, game_id__in=game_ids).only('id', 'status', 'game_id')
+        if include_reviews:
+            recent_reviews = (
+                Review.objects.filter(game_id__in=game_ids)
+                .annotate(position=Window(RowNumber(), partition_by=[F('game_id')], order_by=F('created_at').desc()))
+                .filter(position__lte=RECENT_REVIEWS_PER_GAME)
+                .order_by('game_id', 'position')
+            )
+    return library_entries, recent_reviews
+
+
+def _build_context(entries, reviews):
+    recent_reviews = defaultdict(list)
+    for review in reviews:
+        recent_reviews[review.game_id].append(review)
+    return {
+        'library_entries_by_game': {entry.game_id: entry for entry in entries},
+        'recent_reviews_by_game': recent_reviews,
+    }
+
+
+def prefetch_game_context(games, user, include_library_entries=True, include_reviews=True):
+    """
+    Loads everything GameSerializer needs for a page of games in two queries:
+    the requesting user's library entries and the newest reviews of every game
+    (one windowed query, ROW_NUMBER() per game). The result is merged into the
+    serializer context, and GameSerializer reads from it instead of querying per game.
+    Data for fields that are not being rendered is skipped.
+    """
+    entries, reviews = _context_querysets(games, user, include_library_entries, include_reviews)
+    return _build_context(entries or [], reviews or [])
+
+
+async def _alist(queryset):
+    return [] if queryset is None else [obj async for obj in queryset]
+
+
+async def aprefetch_game_context(games, user, include_library_entries=True, include_reviews=True):
+    """prefetch_game_context() for async views; the two independent queries are awaited together."""
+    entries, reviews = await asyncio.gather(
+        *(_alist(queryset) for queryset in _context_querysets(games, user, include_library_entries, include_reviews))
+    )
+    return _build_context(entries, reviews)
+
+
+class GamePrefetchMixin:
+    """
+    Generic view mixin: when a page of objects is serialized with many=True,
+    batch-load the per-game data GameSerializer needs before serialization.
+    Views listing something other than games override get_prefetch_games().
+    """
+
+    def get_prefetch_games(self, objects):
+        return objects
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            objects = list(args[0])
+            args = (objects, *args[1:])
+            context = kwargs.get('context') or self.get_serializer_context()
+            fields = kwargs.get('fields')
+            kwargs['context'] = {
+                **context,
+                **prefetch_game_context(
+                    self.get_prefetch_games(objects),
+                    self.request.user,
+                    include_library_entries=fields is None or 'user_library_entry' in fields,
+                    include_reviews=fields is None or 'reviews' in fields,
+                ),
+            }
+        return super().get_serializer(*args, **kwargs)
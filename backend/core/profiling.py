@@ -0,0 +1,89 @@
+import bisect
+import threading
+from collections import defaultdict
+
+# Histogram bucket upper bounds (the last bucket is everything above)
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+QUERY_BUCKETS = [0, 1, 2, 3, 5, 10, 20, 50, 100]
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def get_query_budget(view_class, method):
+    """
+    A view's `query_budget`: an int for every method, or a dict of per-method
+    budgets ({'GET': 4}); methods without one are not checked.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(method.upper())
+    return budget
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+    def as_dict(self):
+        labels = [f'<={bound}' for bound in self.bounds] + [f'>{self.bounds[-1]}']
+        return {'buckets': dict(zip(labels, self.counts)), 'sum': round(self.total, 3)}
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.over_budget = 0
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.sql_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.serialize_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.render_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.total_ms = Histogram(LATENCY_BUCKETS_MS)
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'over_query_budget': self.over_budget,
+            'queries': self.queries.as_dict(),
+            'sql_ms': self.sql_ms.as_dict(),
+            'serialize_ms': self.serialize_ms.as_dict(),
+            'render_ms': self.render_ms.as_dict(),
+            'total_ms': self.total_ms.as_dict(),
+        }
+
+
+class MetricsRegistry:
+    """Per-route request metrics, aggregated in process memory."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = defaultdict(RouteMetrics)
+
+    def record(self, route, profile, over_budget=False):
+        with self._lock:
+            metrics = self._routes[route]
+            metrics.requests += 1
+            metrics.over_budget += over_budget
+            metrics.queries.observe(profile.query_count)
+            metrics.sql_ms.observe(profile.sql_ms)
+            metrics.serialize_ms.observe(profile.serialize_ms)
+            metrics.render_ms.observe(profile.render_ms)
+            metrics.total_ms.observe(profile.total_ms)
+
+    def snapshot(self):
+        with self._lock:
+            return {route: metrics.as_dict() for route, metrics in sorted(self._routes.items())}
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+registry = MetricsRegistry()
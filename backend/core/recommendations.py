@@ -0,0 +1,226 @@
+import math
+from collections import Counter, defaultdict
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import Game, GameSimilarity, LibraryEntry
+
+# Listed in requirements.txt; without them build_all() falls back to the (much slower) 'python' engine
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+# Neighbours stored per game
+TOP_K = getattr(settings, 'RECOMMENDATION_TOP_K', 20)
+# Games sharing fewer libraries than this are never neighbours (tiny overlaps are noise)
+MIN_OVERLAP = getattr(settings, 'RECOMMENDATION_MIN_OVERLAP', 2)
+# Libraries above this size (collectors, bots) relate everything to everything: left out of co-occurrences
+MAX_LIBRARY_SIZE = getattr(settings, 'RECOMMENDATION_MAX_LIBRARY_SIZE', 1000)
+# Library activity refreshes a game's neighbours after this long; more activity meanwhile shares the job
+REFRESH_DELAY = timedelta(seconds=getattr(settings, 'RECOMMENDATION_REFRESH_DELAY_SECONDS', 300))
+# Games per refresh pass (and per transaction when saving a full build)
+BATCH_SIZE = 500
+# Ids per IN (...) lookup, within SQLite's parameter limit
+LOOKUP_CHUNK = 500
+RECOMMENDATION_LIMIT = 20
+
+
+def interactions():
+    # Library entries are the interaction matrix; dropping a game is not an endorsement
+    return LibraryEntry.objects.exclude(status=LibraryEntry.Status.DROPPED)
+
+
+def _chunks(ids, size=LOOKUP_CHUNK):
+    ids = iter(ids)
+    while chunk := list(islice(ids, size)):
+        yield chunk
+
+
+def _top(candidates, top_k):
+    # Best scores first; ties broken by game id so both engines agree
+    return sorted(candidates, key=lambda pair: (-pair[1], pair[0]))[:top_k]
+
+
+# --- Similarity ---
+# cosine(g, h) = co(g, h) / sqrt(n(g) * n(h)): n counts the libraries holding a game,
+# co the libraries of at most MAX_LIBRARY_SIZE games holding both.
+
+def neighbours(game_ids, top_k=TOP_K, min_overlap=MIN_OVERLAP):
+    """
+    {game_id: [(similar_id, score), ...]} for the given games, computed from
+    the libraries that hold them. Cost grows with those libraries only, which
+    makes this the incremental refresh path.
+    """
+    return {game_id: _top(scores.items(), top_k) for game_id, scores in similarities(game_ids, min_overlap).items()}
+
+
+def similarities(game_ids, min_overlap=MIN_OVERLAP):
+    """{game_id: {similar_id: score}} for the given games: every neighbour, before the top-K cut."""
+    game_ids = set(game_ids)
+    holders = defaultdict(list)
+    for chunk in _chunks(game_ids):
+        for user_id, game_id in interactions().filter(game_id__in=chunk).values_list('user_id', 'game_id').iterator(chunk_size=5000):
+            holders[user_id].append(game_id)
+
+    libraries = defaultdict(list)
+    for chunk in _chunks(holders):
+        for user_id, game_id in interactions().filter(user_id__in=chunk).values_list('user_id', 'game_id').iterator(chunk_size=5000):
+            libraries[user_id].append(game_id)
+
+    co = defaultdict(Counter)
+    for user_id, library in libraries.items():
+        if len(library) > MAX_LIBRARY_SIZE:
+            continue
+        for game_id in holders[user_id]:
+            co[game_id].update(library)
+
+    candidates = set(game_ids).union(*(counts.keys() for counts in co.values()))
+    totals = {}
+    for chunk in _chunks(candidates):
+        totals.update(
+            interactions().filter(game_id__in=chunk).order_by()
+            .values('game_id').annotate(total=Count('id')).values_list('game_id', 'total')
+        )
+
+    result = {}
+    for game_id in game_ids:
+        counts = co.get(game_id, {})
+        result[game_id] = {
+            other_id: overlap / math.sqrt(totals[game_id] * totals[other_id])
+            for other_id, overlap in counts.items()
+            if other_id != game_id and overlap >= min_overlap
+        }
+    return result
+
+
+def _all_neighbours_numpy(top_k, min_overlap, block_size=BATCH_SIZE):
+    """Every game's neighbours from sparse matrix products, one block of games at a time."""
+    users, games = [], []
+    for user_id, game_id in interactions().values_list('user_id', 'game_id').iterator(chunk_size=10_000):
+        users.append(user_id)
+        games.append(game_id)
+    if not users:
+        return {}
+    user_ids, user_index = np.unique(users, return_inverse=True)
+    game_ids, game_index = np.unique(games, return_inverse=True)
+    # users x games, 1 where the game is in the user's library
+    matrix = sparse.csr_matrix(
+        (np.ones(len(users)), (user_index, game_index)), shape=(len(user_ids), len(game_ids)),
+    )
+    totals = np.asarray(matrix.sum(axis=0)).ravel()
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+    counted = matrix[np.flatnonzero(sizes <= MAX_LIBRARY_SIZE)]
+    counted_t = counted.T.tocsr()
+
+    result = {}
+    for start in range(0, len(game_ids), block_size):
+        # block x games co-occurrence counts
+        overlaps = (counted_t[start:start + block_size] @ counted).tocsr()
+        for row in range(overlaps.shape[0]):
+            index = start + row
+            columns = overlaps.indices[overlaps.indptr[row]:overlaps.indptr[row + 1]]
+            values = overlaps.data[overlaps.indptr[row]:overlaps.indptr[row + 1]]
+            keep = (columns != index) & (values >= min_overlap)
+            columns, values = columns[keep], values[keep]
+            scores = values / np.sqrt(totals[index] * totals[columns])
+            order = np.lexsort((game_ids[columns], -scores))[:top_k]
+            result[int(game_ids[index])] = [(int(game_ids[columns[i]]), float(scores[i])) for i in order]
+    return result
+
+
+def save_neighbours(result):
+    """Replaces the stored neighbours of the games in `result`."""
+    with transaction.atomic():
+        for chunk in _chunks(result):
+            GameSimilarity.objects.filter(game_id__in=chunk).delete()
+        GameSimilarity.objects.bulk_create(
+            (
+                GameSimilarity(game_id=game_id, similar_id=similar_id, score=score)
+                for game_id, pairs in result.items()
+                for similar_id, score in pairs
+            ),
+            batch_size=300,
+        )
+
+
+def _rescore_references(scores):
+    """
+    Other games' stored rows pointing at the games in `scores` get the new
+    score (cosine is symmetric), or are removed when the pair no longer
+    qualifies. Their lists are not re-ranked; the next full build does that.
+    """
+    changed, removed = [], []
+    for chunk in _chunks(scores):
+        rows = GameSimilarity.objects.filter(similar_id__in=chunk).exclude(game_id__in=list(scores))
+        for row in rows.only('id', 'game_id', 'similar_id', 'score'):
+            score = scores[row.similar_id].get(row.game_id)
+            if score is None:
+                removed.append(row.pk)
+            elif score != row.score:
+                row.score = score
+                changed.append(row)
+    GameSimilarity.objects.bulk_update(changed, ['score'], batch_size=300)
+    for chunk in _chunks(removed):
+        GameSimilarity.objects.filter(pk__in=chunk).delete()
+
+
+def refresh_games(game_ids, top_k=TOP_K, min_overlap=MIN_OVERLAP):
+    game_ids = list(game_ids)
+    for start in range(0, len(game_ids), BATCH_SIZE):
+        scores = similarities(game_ids[start:start + BATCH_SIZE], min_overlap)
+        with transaction.atomic():
+            save_neighbours({game_id: _top(pairs.items(), top_k) for game_id, pairs in scores.items()})
+            _rescore_references(scores)
+
+
+def build_all(engine='auto', top_k=TOP_K, min_overlap=MIN_OVERLAP):
+    """
+    Rebuilds the neighbours of every game. The 'numpy' engine (NumPy and SciPy
+    installed) multiplies sparse matrices in one pass; 'python' walks the games
+    in batches with neighbours(). Both store the same result. Returns the
+    number of neighbour rows stored.
+    """
+    if engine == 'auto':
+        engine = 'numpy' if np is not None else 'python'
+    game_ids = list(Game.objects.order_by('id').values_list('id', flat=True))
+    if engine == 'numpy':
+        if np is None:
+            raise RuntimeError('The numpy engine needs NumPy and SciPy installed.')
+        computed = _all_neighbours_numpy(top_k, min_overlap)
+        for start in range(0, len(game_ids), BATCH_SIZE):
+            save_neighbours({game_id: computed.get(game_id, []) for game_id in game_ids[start:start + BATCH_SIZE]})
+    else:
+        refresh_games(game_ids, top_k, min_overlap)
+    return GameSimilarity.objects.count()
+
+
+# --- Read path ---
+
+def similar_games(game_id, limit=TOP_K):
+    return (
+        GameSimilarity.objects.filter(game_id=game_id)
+        .select_related('similar')
+        .order_by('-score', 'similar_id')[:limit]
+    )
+
+
+def recommend(user, limit=RECOMMENDATION_LIMIT):
+    """
+    Games similar to the ones in the user's library, scored by the sum of
+    their similarities to it, best first. One query over the stored
+    neighbours; games the user already has (even dropped) are left out.
+    """
+    seeds = interactions().filter(user=user).values('game_id')
+    owned = LibraryEntry.objects.filter(user=user).values('game_id')
+    return (
+        Game.objects.filter(similar_to__game__in=seeds)
+        .exclude(pk__in=owned)
+        .annotate(recommendation_score=Sum('similar_to__score'))
+        .order_by('-recommendation_score', 'id')[:limit]
+    )
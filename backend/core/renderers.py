@@ -1,20 +1,135 @@
-from rest_framework.renderers import JSONRenderer
+import csv
+import io
+import json
+
+from django.conf import settings
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json encoder
+    orjson = None
+
 
 class GameSpaceJSONRenderer(JSONRenderer):
+    # Use orjson when installed (JSON_FAST_RENDERER can switch it off)
+    fast = orjson is not None and getattr(settings, 'JSON_FAST_RENDERER', True)
+
     def render(self, data, accepted_media_type=None, renderer_context=None):
+        renderer_context = renderer_context or {}
         status_code = renderer_context['response'].status_code
-        
-        # Default structure
-        response_data = {
-            "success": True,
-            "data": data
-        }
-
-        # If it's an error (400, 404, 500, etc.)
-        if status_code >= 400:
-            response_data["success"] = False
-            response_data["error"] = data
-            if "data" in response_data:
+        success = status_code < 400
+
+        # Indented output (browsable API) keeps the stdlib path
+        if not self.fast or self.get_indent(accepted_media_type, renderer_context):
+            # Default structure
+            response_data = {
+                "success": True,
+                "data": data
+            }
+
+            # If it's an error (400, 404, 500, etc.)
+            if not success:
+                response_data["success"] = False
+                response_data["error"] = data
                 del response_data["data"]
-        
-        return super().render(response_data, accepted_media_type, renderer_context)
\ No newline at end of file
+
+            return super().render(response_data, accepted_media_type, renderer_context)
+
+        # Fast path: encode the payload once and write the envelope around the
+        # bytes, without building a wrapper dict
+        return b''.join((
+            b'{"success":true,"data":' if success else b'{"success":false,"error":',
+            self.encode(data),
+            b'}',
+        ))
+
+    @staticmethod
+    def encode(data):
+        return orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+
+    def iter_render(self, chunks, envelope=None):
+        """
+        Streams a successful list response: `chunks` yields lists of already
+        serialized items, and each chunk is encoded and sent as soon as it is
+        ready, so the full list never has to be held in memory.
+        With an `envelope` dict, data is that object with the list under "results".
+        """
+        encode = self.encode if self.fast else _stdlib_encode
+        if envelope:
+            yield b'{"success":true,"data":{' + encode(envelope)[1:-1] + b',"results":['
+        else:
+            yield b'{"success":true,"data":['
+        first = True
+        for chunk in chunks:
+            if not chunk:
+                continue
+            body = encode(list(chunk))[1:-1]  # items without the surrounding brackets
+            yield body if first else b',' + body
+            first = False
+        yield b']}}' if envelope else b']}'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """Newline-delimited JSON: one object per line, no envelope (bulk exports)."""
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return b''.join(self.iter_render([data if isinstance(data, list) else [data]]))
+
+    def iter_render(self, chunks):
+        encode = GameSpaceJSONRenderer.encode if GameSpaceJSONRenderer.fast else _stdlib_encode
+        for chunk in chunks:
+            if chunk:
+                yield b''.join(encode(row) + b'\n' for row in chunk)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row built from `header` (the keys of the first row by
+    default). Rows are dicts; errors and other non-list payloads are not
+    tabular, so views only select this renderer for exports.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.iter_render([rows]))
+
+    def iter_render(self, chunks, header=None):
+        buffer = io.StringIO()
+        writer = None
+        for chunk in chunks:
+            if not chunk:
+                continue
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=header or list(chunk[0]), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if writer is None and header:
+            yield (','.join(header) + '\r\n').encode()
+
+
+if orjson is not None:
+    # Datetimes go through DRF's encoder so both paths produce identical output
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+else:
+    _ORJSON_OPTIONS = 0
+
+_drf_encoder = JSONEncoder()
+
+
+def _default(obj):
+    return _drf_encoder.default(obj)
+
+
+def _stdlib_encode(data):
+    return json.dumps(data, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':')).encode()
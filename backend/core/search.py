@@ -0,0 +1,137 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import Game
+
+# SQLite: FTS5 virtual table keyed by game id (rowid). The prefix indexes make
+# "zel*"-style queries a direct index lookup instead of a term-list scan.
+SQLITE_FTS_TABLE = 'core_game_fts'
+SQLITE_CREATE_FTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+    "title, developer, publisher, tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')"
+)
+
+# PostgreSQL: expression GIN index over the same document; the query below
+# repeats the expression verbatim so the planner can use the index.
+POSTGRES_INDEX = 'core_game_search_gin'
+POSTGRES_DOCUMENT = (
+    "to_tsvector('simple'::regconfig, coalesce(\"core_game\".\"title\", '') || ' ' || "
+    "coalesce(\"core_game\".\"developer\", '') || ' ' || coalesce(\"core_game\".\"publisher\", ''))"
+)
+POSTGRES_CREATE_INDEX = f'CREATE INDEX IF NOT EXISTS {POSTGRES_INDEX} ON core_game USING GIN (({POSTGRES_DOCUMENT}))'
+
+SEARCH_FIELDS = ['title', 'developer', 'publisher']
+
+
+def _vendor(using='default'):
+    return connections[using].vendor
+
+
+def _terms(query):
+    return re.findall(r'\w+', query.lower())
+
+
+def search_games(queryset, query):
+    """
+    Filters a Game queryset down to full-text matches of `query` and annotates
+    `search_rank` (lower is more relevant). Every term is matched as a prefix,
+    so the results stay useful while the user is still typing.
+    Databases without a search index fall back to the old icontains filter.
+    """
+    terms = _terms(query)
+    if not terms:
+        # Still annotated: list views order by search_rank
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    vendor = _vendor(queryset.db)
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT bm25({SQLITE_FTS_TABLE}, 10.0, 2.0, 1.0) FROM {SQLITE_FTS_TABLE} '
+                f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = "core_game"."id"',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == 'postgresql':
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT id FROM core_game WHERE {POSTGRES_DOCUMENT} @@ to_tsquery('simple'::regconfig, %s)",
+                (tsquery,),
+            )
+        ).annotate(
+            # Negated so that, like bm25(), lower means more relevant
+            search_rank=RawSQL(
+                f"-ts_rank({POSTGRES_DOCUMENT}, to_tsquery('simple'::regconfig, %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+# --- Index maintenance (SQLite only; the PostgreSQL index is maintained by the database) ---
+
+def index_game(game, using='default'):
+    if _vendor(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s', [game.pk])
+        cursor.execute(
+            f'INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, developer, publisher) VALUES (%s, %s, %s, %s)',
+            [game.pk, game.title, game.developer, game.publisher],
+        )
+
+
+def index_games(game_ids, using='default', chunk_size=500):
+    """(Re)indexes many games from their stored rows, for bulk writes that skip the signals."""
+    if _vendor(using) != 'sqlite':
+        return
+    game_ids = list(game_ids)
+    with connections[using].cursor() as cursor:
+        for start in range(0, len(game_ids), chunk_size):
+            chunk = game_ids[start:start + chunk_size]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid IN ({placeholders})', chunk)
+            cursor.execute(
+                f'INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, developer, publisher) '
+                f'SELECT id, title, developer, publisher FROM core_game WHERE id IN ({placeholders})',
+                chunk,
+            )
+
+
+def unindex_game(game_id, using='default'):
+    if _vendor(using) != 'sqlite':
+        return
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = %s', [game_id])
+
+
+def rebuild_index(using='default'):
+    """Rebuilds the search index from the games table in bulk. Returns the number of indexed games."""
+    connection = connections[using]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(SQLITE_CREATE_FTS)
+            cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE}')
+            cursor.execute(
+                f'INSERT INTO {SQLITE_FTS_TABLE} (rowid, title, developer, publisher) '
+                'SELECT id, title, developer, publisher FROM core_game'
+            )
+            cursor.execute(f"INSERT INTO {SQLITE_FTS_TABLE} ({SQLITE_FTS_TABLE}) VALUES ('optimize')")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(POSTGRES_CREATE_INDEX)
+            cursor.execute(f'REINDEX INDEX {POSTGRES_INDEX}')
+    return Game.objects.using(using).count()
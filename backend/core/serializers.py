@@ -1,7 +1,10 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from .authentication import CachedJWTAuthentication, check_token, stamp_claims, states
 from .models import Game, LibraryEntry
+from .passwords import hash_password
 
 User = get_user_model()
 
@@ -14,18 +17,24 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ['id', 'email', 'username', 'password', 'role']
 
     def create(self, validated_data):
-        # We must use create_user to ensure password is hashed
-        user = User.objects.create_user(
-            email=validated_data['email'],
-            username=validated_data['username'],
-            password=validated_data['password'],
-            role=validated_data.get('role', 'GAMER')
+        # What create_user does, with the password hashed on the hashing pool (core/passwords.py)
+        user = User(
+            email=User.objects.normalize_email(validated_data['email']),
+            username=User.normalize_username(validated_data['username']),
+            role=validated_data.get('role', 'GAMER'),
+            password=hash_password(validated_data['password']),
         )
+        user.save()
         return user
 
 # --- 2. Custom Login Serializer (Page 15 requirement) ---
 # We extend the default JWT serializer to add User data to the response
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        # Claims read by CachedJWTAuthentication, copied into the access token too
+        return stamp_claims(super().get_token(user), user)
+
     def validate(self, attrs):
         # The default validation generates the tokens
         data = super().validate(attrs)
@@ -40,24 +49,59 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         }
         return data
 
+class CustomTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        # Refreshing is where tokens pick up changed claims: the refresh token itself only
+        # has to be unrevoked, and the new access token is stamped with the current state
+        refresh = self.token_class(attrs['refresh'])
+        state = states.load(CachedJWTAuthentication.get_user_id(refresh))
+        check_token(refresh, state)
+        stamp_claims(refresh, state)
+
+        data = {'access': str(refresh.access_token)}
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+        return data
+
 # --- 3. Public Profile Serializer ---
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
-        fields = ['id', 'username', 'role', 'avatar_url', 'bio', 'date_joined']
+        fields = ['id', 'username', 'role', 'avatar_url', 'bio', 'date_joined', 'follower_count', 'following_count']
+        read_only_fields = ['follower_count', 'following_count']
 
 
 class GameSerializer(serializers.ModelSerializer):
     user_library_entry = serializers.SerializerMethodField()
     reviews = serializers.SerializerMethodField()
 
+    # Fields left out of the compact representation used by catalogue grids
+    COMPACT_EXCLUDE = ['reviews', 'description']
+
+    def __init__(self, *args, **kwargs):
+        # Optional `fields` argument restricts the output to the given field names
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         model = Game
-        fields = '__all__'
+        # Internal rating aggregates stay out of the payload (review_count and average_rating are kept)
+        exclude = ['rating_sum', *Game.RATING_HISTOGRAM_FIELDS]
     
     def get_user_library_entry(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            # Batched path: list views preload the user's entries (see core/prefetch.py)
+            entries = self.context.get('library_entries_by_game')
+            if entries is not None:
+                entry = entries.get(obj.pk)
+                return {'id': entry.id, 'status': entry.status} if entry else None
             try:
                 entry = LibraryEntry.objects.get(user=request.user, game=obj)
                 return {
@@ -70,7 +114,11 @@ class GameSerializer(serializers.ModelSerializer):
 
     def get_reviews(self, obj):
         # Return last 5 reviews
-        reviews = obj.reviews.all().order_by('-created_at')[:5]
+        recent_reviews = self.context.get('recent_reviews_by_game')
+        if recent_reviews is not None:
+            reviews = recent_reviews.get(obj.pk, [])
+        else:
+            reviews = obj.reviews.all().order_by('-created_at')[:5]
         return ReviewSerializer(reviews, many=True).data
 
 # --- 5. Library Entry Serializer ---
@@ -86,6 +134,27 @@ class LibraryEntrySerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         # The view handles passing the user, but we double check here if needed
         return super().create(validated_data)
+
+# --- 5b. Library Listing Serializers ---
+# The library page only needs a summary of each game. Nesting GameSerializer would
+# look up the entry being listed again and load the game's reviews for every row.
+class LibraryGameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Game
+        fields = ['id', 'title', 'cover_image_url', 'genre', 'release_date', 'average_rating']
+
+
+class LibraryEntryListSerializer(serializers.ModelSerializer):
+    game_details = LibraryGameSerializer(source='game', read_only=True)
+
+    class Meta:
+        model = LibraryEntry
+        fields = ['id', 'user', 'game', 'game_details', 'status', 'added_at']
+
+    @classmethod
+    def only_fields(cls):
+        # Columns to load with select_related('game'): nothing else is rendered
+        return ['id', 'user', 'game', 'status', 'added_at', *(f'game__{name}' for name in LibraryGameSerializer.Meta.fields)]
     
 from .models import Review # Ensure Review is imported
 
@@ -102,8 +171,39 @@ class ReviewSerializer(serializers.ModelSerializer):
     def validate(self, data):
         # Optional: Custom validation logic can go here
         return data
-    
-from .models import Follow, ForumThread
+
+
+# --- 6b. Review Listing Serializers ---
+class ReviewListSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = Review
+        fields = ['id', 'game', 'user', 'username', 'rating', 'comment', 'created_at', 'helpful_count']
+
+    @classmethod
+    def only_fields(cls):
+        # With select_related('user') only the username is read from the join
+        return ['id', 'game', 'user', 'user__username', 'rating', 'comment', 'created_at', 'helpful_count']
+
+
+class ReviewSummarySerializer(serializers.ModelSerializer):
+    """A game's rating distribution, read from its stored aggregates (no review is scanned)."""
+    game = serializers.IntegerField(source='pk', read_only=True)
+    histogram = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Game
+        fields = ['game', 'review_count', 'average_rating', 'histogram']
+
+    @classmethod
+    def only_fields(cls):
+        return ['id', 'review_count', 'average_rating', *Game.RATING_HISTOGRAM_FIELDS]
+
+    def get_histogram(self, obj):
+        return obj.rating_histogram()
+
+from .models import Follow, ForumPost, ForumThread, GameSimilarity
 
 # ... existing serializers ...
 
@@ -113,8 +213,72 @@ class ForumThreadSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = ForumThread
-        fields = ['id', 'game', 'user', 'username', 'title', 'content', 'created_at']
-        read_only_fields = ['user', 'created_at', 'game']
+        fields = ['id', 'game', 'user', 'username', 'title', 'content', 'created_at', 'reply_count', 'last_activity_at']
+        read_only_fields = ['user', 'created_at', 'game', 'reply_count', 'last_activity_at']
+
+    @classmethod
+    def only_fields(cls):
+        # Columns the list needs; with select_related('user') only the username is read from the join
+        return ['id', 'game', 'user', 'user__username', 'title', 'content', 'created_at', 'reply_count', 'last_activity_at']
+
+
+class ForumPostSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username', read_only=True)
+
+    class Meta:
+        model = ForumPost
+        fields = ['id', 'thread', 'user', 'username', 'content', 'created_at']
+        read_only_fields = ['thread', 'user', 'created_at']
+
+    @classmethod
+    def only_fields(cls):
+        return ['id', 'thread', 'user', 'user__username', 'content', 'created_at']
+
+# --- 7b. Social Graph Serializers ---
+class SocialUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'avatar_url', 'follower_count', 'following_count']
+
+
+class FollowerSerializer(serializers.ModelSerializer):
+    """A row of a follower list: the user on the following end of the edge."""
+    user_field = 'follower'
+    user = SocialUserSerializer(source='follower', read_only=True)
+    followed_at = serializers.DateTimeField(source='created_at', read_only=True)
+
+    class Meta:
+        model = Follow
+        fields = ['id', 'user', 'followed_at']
+
+    @classmethod
+    def only_fields(cls):
+        # Columns to load with select_related(user_field)
+        return ['id', 'created_at', 'follower', 'following', *(f'{cls.user_field}__{name}' for name in SocialUserSerializer.Meta.fields)]
+
+
+class FollowingSerializer(FollowerSerializer):
+    user_field = 'following'
+    user = SocialUserSerializer(source='following', read_only=True)
+
+# --- 7c. Recommendation Serializers ---
+class SimilarGameSerializer(serializers.ModelSerializer):
+    game = LibraryGameSerializer(source='similar', read_only=True)
+
+    class Meta:
+        model = GameSimilarity
+        fields = ['game', 'score']
+
+    @classmethod
+    def only_fields(cls):
+        return ['id', 'game', 'score', 'similar', *(f'similar__{name}' for name in LibraryGameSerializer.Meta.fields)]
+
+
+class RecommendedGameSerializer(LibraryGameSerializer):
+    recommendation_score = serializers.FloatField(read_only=True)
+
+    class Meta(LibraryGameSerializer.Meta):
+        fields = [*LibraryGameSerializer.Meta.fields, 'recommendation_score']
 
 # --- 8. Feed Item Serializer (Helper) ---
 # We don't use a ModelSerializer here because the Feed is a custom object
@@ -125,4 +289,5 @@ class FeedItemSerializer(serializers.Serializer):
     # Optional fields depending on type
     rating = serializers.IntegerField(required=False)
     status = serializers.CharField(required=False)
+    title = serializers.CharField(required=False)
     timestamp = serializers.DateTimeField()
@@ -0,0 +1,260 @@
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import authentication, cache, facets, feed, recommendations, search, social, tasks
+from .models import (
+    FeedItem, Follow, ForumPost, ForumThread, Game, GameTrendingScore, LibraryEntry, Review, ReviewVote, User,
+)
+
+
+# --- 1. Rating Aggregates ---
+# Keep Game.review_count / rating_sum / histogram in sync with every review write.
+# Each write records its rating delta as a 'ratings.apply' job in its own transaction;
+# a worker sums the deltas of a batch into one UPDATE per game (core/tasks.py).
+# When the previous rating is unknown the game is recounted instead, and a burst
+# of those collapses into a single pending 'ratings.refresh'.
+def defer_rating_change(game_id, old_rating=None, new_rating=None):
+    # int(): views may assign the raw request value to game_id
+    tasks.defer_in_transaction('ratings.apply', {'game_id': int(game_id), 'old': old_rating, 'new': new_rating})
+
+
+def defer_rating_refresh(*game_ids):
+    for game_id in {int(game_id) for game_id in game_ids if game_id is not None}:
+        tasks.defer('ratings.refresh', {'game_id': game_id}, key=f'ratings.refresh:{game_id}')
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        # Fixtures carry their own aggregates
+        return
+
+    if created:
+        defer_rating_change(instance.game_id, new_rating=instance.rating)
+    elif not hasattr(instance, '_loaded_rating'):
+        # Instance was not loaded from the database, so the previous rating is unknown
+        defer_rating_refresh(instance.game_id)
+    elif instance._loaded_game_id != instance.game_id:
+        defer_rating_change(instance._loaded_game_id, old_rating=instance._loaded_rating)
+        defer_rating_change(instance.game_id, new_rating=instance.rating)
+    elif instance._loaded_rating != instance.rating:
+        defer_rating_change(instance.game_id, instance._loaded_rating, instance.rating)
+
+    if not {'rating', 'game_id'} & instance.get_deferred_fields():
+        instance._loaded_rating = instance.rating
+        instance._loaded_game_id = instance.game_id
+
+
+@receiver(pre_delete, sender=Review)
+def review_deleting(sender, instance, **kwargs):
+    if not hasattr(instance, '_loaded_rating'):
+        # Partially loaded or never loaded: read the stored rating/game while the row still exists
+        stored = Review.objects.filter(pk=instance.pk).values_list('rating', 'game_id').first()
+        if stored is not None:
+            instance._loaded_rating, instance._loaded_game_id = stored
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    # Set by review_deleting; the row is gone, so deferred fields can no longer be read
+    game_id = getattr(instance, '_loaded_game_id', None)
+    if game_id is not None:
+        defer_rating_change(game_id, old_rating=instance._loaded_rating)
+
+
+# --- 2. Search Index ---
+# Keep the SQLite FTS5 table in sync with the games table.
+@receiver(post_save, sender=Game)
+def game_saved(sender, instance, raw=False, using='default', update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(search.SEARCH_FIELDS):
+        # e.g. rating aggregate refreshes; nothing searchable changed
+        return
+    search.index_game(instance, using=using)
+
+
+@receiver(post_delete, sender=Game)
+def game_deleted(sender, instance, using='default', **kwargs):
+    search.unindex_game(instance.pk, using=using)
+
+
+# --- 3. Trending Scores ---
+# New games start with an empty trending row; scores come from `manage.py refresh_trending`.
+@receiver(post_save, sender=Game)
+def game_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        GameTrendingScore.objects.get_or_create(game=instance, defaults={'refreshed_at': timezone.now()})
+
+
+# --- 4. Activity Feed ---
+# Publish reviews and library changes, fanned out to followers' timelines (core/feed.py)
+# by a background job once the write has committed.
+def defer_publish(actor_id, verb, game_id, created_at, rating=None, status=''):
+    tasks.defer('feed.publish', {
+        'actor_id': actor_id, 'verb': verb, 'game_id': game_id,
+        'created_at': created_at.isoformat(), 'rating': rating, 'status': status,
+    })
+
+
+@receiver(post_save, sender=Review)
+def review_published(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        defer_publish(instance.user_id, FeedItem.Verbs.REVIEW, instance.game_id, instance.created_at, rating=instance.rating)
+
+
+@receiver(post_save, sender=LibraryEntry)
+def library_entry_published(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created or getattr(instance, '_loaded_status', instance.status) != instance.status:
+        defer_publish(instance.user_id, FeedItem.Verbs.STATUS, instance.game_id, timezone.now(), status=instance.status)
+    instance._loaded_status = instance.status
+
+
+@receiver(post_save, sender=Follow)
+def follow_created(sender, instance, created, raw=False, **kwargs):
+    social.graph.edge_changed(instance.follower_id, instance.following_id)
+    if created and not raw:
+        feed.backfill_timeline(instance.follower_id, instance.following_id)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    social.graph.edge_changed(instance.follower_id, instance.following_id)
+    feed.prune_timeline(instance.follower_id, instance.following_id)
+
+
+# --- 5. Response Cache ---
+# Cached public game responses embed game fields, ratings and the newest reviews.
+# (Library entries only reach public payloads through trending, see refresh_trending.)
+# Purged after commit, so a concurrent reader cannot re-cache the pre-commit state;
+# bumping a version counter is cheaper than queueing a job for it.
+@receiver(post_save, sender=Game)
+@receiver(post_delete, sender=Game)
+def game_changed(sender, instance, **kwargs):
+    transaction.on_commit(partial(cache.invalidate_game, instance.pk))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def review_changed(sender, instance, **kwargs):
+    # The stored copy first: a deleted row's deferred fields can no longer be loaded
+    game_id = getattr(instance, '_loaded_game_id', None) or instance.game_id
+    transaction.on_commit(partial(cache.invalidate_game, game_id))
+
+
+# --- 6. Forum Counters ---
+# Keep ForumThread.reply_count / last_activity_at in step with the thread's posts,
+# with one UPDATE computed from the stored values (safe under concurrent replies).
+@receiver(post_save, sender=ForumPost)
+def forum_post_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ForumThread.objects.filter(pk=instance.thread_id).update(
+            reply_count=F('reply_count') + 1,
+            last_activity_at=Greatest('last_activity_at', instance.created_at),
+        )
+
+
+@receiver(post_delete, sender=ForumPost)
+def forum_post_deleted(sender, instance, **kwargs):
+    # last_activity_at is left alone: the thread was still active then
+    ForumThread.objects.filter(pk=instance.thread_id, reply_count__gt=0).update(reply_count=F('reply_count') - 1)
+
+
+# --- 7. Recommendations ---
+# Library changes refresh the game's stored neighbours after REFRESH_DELAY, one job per game
+# however much activity it sees meanwhile (full rebuilds: `manage.py build_recommendations`).
+@receiver(post_save, sender=LibraryEntry)
+@receiver(post_delete, sender=LibraryEntry)
+def library_entry_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        tasks.defer(
+            'recommendations.refresh', {'game_id': instance.game_id},
+            key=f'recommendations.refresh:{instance.game_id}', delay=recommendations.REFRESH_DELAY,
+        )
+
+
+# --- 8. Authentication State ---
+# Any user save may change what CachedJWTAuthentication checks tokens against
+# (User.save bumps auth_version when it does); this process drops its copy at once.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    authentication.states.discard(instance.pk)
+
+
+# --- 9. Facet Counts ---
+# Move a game between the stored facet counts (core/facets.py) when its genre, developer,
+# publisher or release date changes; bulk writes run `manage.py rebuild_facets` instead.
+@receiver(pre_save, sender=Game)
+def game_facets_loading(sender, instance, raw=False, update_fields=None, **kwargs):
+    # A game built in memory (not loaded by from_db) still needs its stored values to compute the delta
+    if raw or instance.pk is None or hasattr(instance, '_loaded_facets'):
+        return
+    if update_fields is not None and not set(update_fields) & set(Game.FACET_FIELDS):
+        return
+    stored = Game.objects.filter(pk=instance.pk).values(*Game.FACET_FIELDS).first()
+    if stored is not None:
+        instance._loaded_facets = stored
+
+
+@receiver(post_save, sender=Game)
+def game_facets_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(Game.FACET_FIELDS):
+        # e.g. rating aggregate refreshes
+        return
+
+    loaded = getattr(instance, '_loaded_facets', None)
+    if created or loaded is None:
+        # New row (or one pre_save found no stored row for): nothing to move it from
+        names = [name for name in Game.FACET_FIELDS if name not in instance.get_deferred_fields()]
+        old = {}
+    else:
+        # Only the loaded fields were saved
+        names = list(loaded)
+        old = loaded
+    new = {name: getattr(instance, name) for name in names}
+    facets.apply_change(facets.game_values(old), facets.game_values(new))
+    instance._loaded_facets = new
+
+
+@receiver(post_delete, sender=Game)
+def game_facets_deleted(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_facets', None)
+    if loaded is None:
+        loaded = {name: getattr(instance, name) for name in Game.FACET_FIELDS}
+    facets.apply_change(facets.game_values(loaded), {})
+
+
+# --- 10. Review Helpfulness ---
+# Keep Review.helpful_count in step with the review's votes, one UPDATE per vote
+# computed from the stored value. update() sends no Review signals, so the
+# rating aggregates and the feed are left alone.
+@receiver(post_save, sender=ReviewVote)
+def review_vote_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Review.objects.filter(pk=instance.review_id).update(helpful_count=F('helpful_count') + 1)
+
+
+@receiver(post_delete, sender=ReviewVote)
+def review_vote_deleted(sender, instance, **kwargs):
+    Review.objects.filter(pk=instance.review_id, helpful_count__gt=0).update(helpful_count=F('helpful_count') - 1)
+
+
+# --- 11. SQLite Connection Tuning ---
+@receiver(connection_created)
+def configure_sqlite_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,184 @@
+import heapq
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import Follow, User
+
+# Follow ids kept in the in-process adjacency cache, summed over all cached sets
+GRAPH_CACHE_MAX_EDGES = getattr(settings, 'SOCIAL_GRAPH_CACHE_MAX_EDGES', 500_000)
+# Cached sets are reloaded after this long, bounding staleness across processes
+GRAPH_CACHE_TTL = getattr(settings, 'SOCIAL_GRAPH_CACHE_TTL', 300)
+SUGGESTION_LIMIT = 20
+# Friends-of-friends walk at most this many of the user's follows (the most recent ones)
+SUGGESTION_MAX_FRIENDS = 200
+
+FOLLOWING = 'following'
+FOLLOWERS = 'followers'
+
+
+class SelfFollow(Exception):
+    pass
+
+
+class UserNotFound(Exception):
+    pass
+
+
+# --- Write path ---
+
+def follow(follower_id, following_id):
+    """
+    Makes `follower_id` follow `following_id` and bumps both counters, in one
+    transaction. Returns False, changing nothing, when the edge already exists.
+    """
+    if follower_id == following_id:
+        raise SelfFollow()
+    with transaction.atomic():
+        try:
+            # unique_follow decides, so concurrent follows of the same user cannot both count
+            with transaction.atomic():
+                Follow.objects.create(follower_id=follower_id, following_id=following_id)
+        except IntegrityError:
+            return False
+        # The UPDATE doubles as the existence check (the FK is only checked at commit)
+        if not User.objects.filter(pk=following_id).update(follower_count=F('follower_count') + 1):
+            raise UserNotFound()
+        User.objects.filter(pk=follower_id).update(following_count=F('following_count') + 1)
+    return True
+
+
+def unfollow(follower_id, following_id):
+    """Removes the edge and decrements both counters. Returns False when there was none."""
+    with transaction.atomic():
+        deleted, _ = Follow.objects.filter(follower_id=follower_id, following_id=following_id).delete()
+        if not deleted:
+            return False
+        User.objects.filter(pk=following_id, follower_count__gt=0).update(follower_count=F('follower_count') - 1)
+        User.objects.filter(pk=follower_id, following_count__gt=0).update(following_count=F('following_count') - 1)
+    return True
+
+
+def refresh_counts(user_ids=None):
+    """
+    Recomputes follower_count / following_count from the Follow table. Only
+    needed after bulk writes (or cascading user deletes) that bypass follow().
+    """
+    from django.db.models import Count, OuterRef, Subquery
+    from django.db.models.functions import Coalesce
+    users = User.objects.all() if user_ids is None else User.objects.filter(pk__in=user_ids)
+    updates = {}
+    for field, column in (('follower_count', 'following'), ('following_count', 'follower')):
+        edges = Follow.objects.filter(**{column: OuterRef('pk')}).order_by().values(column)
+        updates[field] = Coalesce(Subquery(edges.annotate(total=Count('id')).values('total')), 0)
+    return users.update(**updates)
+
+
+# --- Adjacency cache ---
+
+class AdjacencyCache:
+    """
+    Per-process LRU cache of follow sets: (direction, user_id) -> frozenset of
+    user ids. Its size is bounded by the total number of ids held, so a few
+    accounts with huge follower sets cannot crowd out everyone else; sets
+    larger than the whole budget are returned but never cached. Misses for
+    many users are loaded with one query.
+    """
+
+    def __init__(self, max_edges=GRAPH_CACHE_MAX_EDGES, ttl=GRAPH_CACHE_TTL):
+        self.max_edges = max_edges
+        self.ttl = ttl
+        self._sets = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_many(self, direction, user_ids):
+        """{user_id: frozenset} for every id in `user_ids`."""
+        found, now = {}, time.monotonic()
+        with self._lock:
+            for user_id in user_ids:
+                entry = self._sets.get((direction, user_id))
+                if entry is not None and entry[0] > now:
+                    self._sets.move_to_end((direction, user_id))
+                    found[user_id] = entry[1]
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        if missing:
+            loaded = self._load(direction, missing)
+            with self._lock:
+                for user_id, ids in loaded.items():
+                    self._put((direction, user_id), ids, now + self.ttl)
+            found.update(loaded)
+        return found
+
+    def get(self, direction, user_id):
+        return self.get_many(direction, [user_id])[user_id]
+
+    def edge_changed(self, follower_id, following_id):
+        # Called by the Follow signals: only the two sets containing the edge change
+        with self._lock:
+            self._discard((FOLLOWING, follower_id))
+            self._discard((FOLLOWERS, following_id))
+
+    def clear(self):
+        with self._lock:
+            self._sets.clear()
+            self._size = 0
+
+    @staticmethod
+    def _load(direction, user_ids):
+        key, value = ('follower_id', 'following_id') if direction == FOLLOWING else ('following_id', 'follower_id')
+        sets = {user_id: set() for user_id in user_ids}
+        edges = Follow.objects.filter(**{f'{key}__in': user_ids}).values_list(key, value)
+        for user_id, other_id in edges.iterator(chunk_size=10_000):
+            sets[user_id].add(other_id)
+        return {user_id: frozenset(ids) for user_id, ids in sets.items()}
+
+    def _put(self, key, ids, expires):
+        self._discard(key)
+        if len(ids) > self.max_edges:
+            return
+        self._sets[key] = (expires, ids)
+        self._size += len(ids)
+        while self._size > self.max_edges:
+            _, (_, evicted) = self._sets.popitem(last=False)
+            self._size -= len(evicted)
+
+    def _discard(self, key):
+        entry = self._sets.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+
+graph = AdjacencyCache()
+
+
+# --- Graph queries ---
+
+def mutual_follows(user_id):
+    """Ids of the users `user_id` follows who follow them back."""
+    return graph.get(FOLLOWING, user_id) & graph.get(FOLLOWERS, user_id)
+
+
+def suggestions(user_id, limit=SUGGESTION_LIMIT):
+    """
+    People you may know: users followed by the people `user_id` follows,
+    ranked by how many of them follow each one. Returns (user_id, mutual_count)
+    pairs, best first, excluding the user and everyone they already follow.
+    """
+    following = graph.get(FOLLOWING, user_id)
+    friends = list(
+        Follow.objects.filter(follower_id=user_id).order_by('-created_at', '-id')
+        .values_list('following_id', flat=True)[:SUGGESTION_MAX_FRIENDS]
+    ) if len(following) > SUGGESTION_MAX_FRIENDS else list(following)
+
+    scores = Counter()
+    for friend_following in graph.get_many(FOLLOWING, friends).values():
+        scores.update(friend_following)
+    for excluded in (*following, user_id):
+        scores.pop(excluded, None)
+    # Ties broken by id, so results are stable
+    return heapq.nsmallest(limit, scores.items(), key=lambda pair: (-pair[1], pair[0]))
@@ -0,0 +1,199 @@
+import logging
+import traceback
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import cache, feed, recommendations
+from .models import Game, Job
+
+logger = logging.getLogger(__name__)
+
+# 'queue': side effects are stored as jobs when the write commits and run by `manage.py run_workers`
+# 'sync': they run inline in the writing request
+QUEUE_MODE = getattr(settings, 'TASK_QUEUE_MODE', 'queue')
+# A failing job is retried this many times in total, backing off exponentially
+MAX_ATTEMPTS = getattr(settings, 'TASK_MAX_ATTEMPTS', 5)
+RETRY_BACKOFF = timedelta(seconds=getattr(settings, 'TASK_RETRY_BACKOFF_SECONDS', 5))
+# A RUNNING job whose worker died is handed to another worker after this long
+LOCK_TIMEOUT = timedelta(seconds=getattr(settings, 'TASK_LOCK_TIMEOUT_SECONDS', 300))
+# Jobs claimed per batch; claimed jobs with the same name are handled together
+BATCH_SIZE = 100
+
+_handlers = {}
+
+
+def task(name):
+    """
+    Registers a job handler. A handler receives the payloads of every claimed
+    job with its name at once, so it can batch work (one query for many games).
+    """
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+# --- Producer side ---
+
+def enqueue(name, payload, key=None, run_after=None):
+    """Stores a job. While a job with the same key is pending, the new one is dropped."""
+    # INSERT ... ON CONFLICT DO NOTHING against unique_pending_job_key: no lookup, no race
+    Job.objects.bulk_create(
+        [Job(name=name, payload=payload, key=key, run_after=run_after or timezone.now())],
+        ignore_conflicts=True,
+    )
+
+
+def defer(name, payload, key=None, delay=None):
+    """
+    Schedules a side effect of the current write: enqueued once the
+    transaction commits (nothing is queued if it rolls back), or run
+    immediately with TASK_QUEUE_MODE = 'sync'. With a `delay` (timedelta)
+    the job waits that long, so keyed jobs of a burst of writes collapse.
+    """
+    if QUEUE_MODE != 'queue':
+        _handlers[name]([payload])
+        return
+    transaction.on_commit(lambda: enqueue(name, payload, key=key, run_after=timezone.now() + delay if delay else None))
+
+
+def defer_in_transaction(name, payload):
+    """
+    defer() for jobs that must commit together with their write: the job row
+    is inserted in the current transaction, so whoever reads the write also
+    sees its job (a recount can discard the rating deltas it already covers).
+    Run immediately with TASK_QUEUE_MODE = 'sync'.
+    """
+    if QUEUE_MODE != 'queue':
+        _handlers[name]([payload])
+        return
+    enqueue(name, payload)
+
+
+# --- Worker side ---
+
+def claim(limit=BATCH_SIZE, now=None):
+    """
+    Marks up to `limit` due jobs as RUNNING for this worker and returns them.
+    A keyed job is not claimed while another job with its key is running:
+    unique_pending_job_key only covers pending jobs, so a new one can be queued
+    behind it, and the two must not run side by side.
+    """
+    now = now or timezone.now()
+    running_keys = Job.objects.filter(
+        state=Job.States.RUNNING, locked_at__gte=now - LOCK_TIMEOUT, key__isnull=False,
+    ).values('key')
+    due = (
+        Q(state=Job.States.PENDING, run_after__lte=now)
+        | Q(state=Job.States.RUNNING, locked_at__lt=now - LOCK_TIMEOUT)
+    ) & (Q(key__isnull=True) | ~Q(key__in=running_keys))
+    with transaction.atomic():
+        # SKIP LOCKED keeps PostgreSQL workers apart; SQLite serializes them at BEGIN IMMEDIATE
+        ids = list(
+            Job.objects.filter(due).select_for_update(skip_locked=True)
+            .order_by('run_after', 'id').values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+        Job.objects.filter(pk__in=ids).update(state=Job.States.RUNNING, locked_at=now, attempts=F('attempts') + 1)
+    return list(Job.objects.filter(pk__in=ids).order_by('id'))
+
+
+def run_batch(limit=BATCH_SIZE):
+    """Claims and runs one batch of due jobs. Returns the number of jobs claimed."""
+    jobs = claim(limit)
+    by_name = defaultdict(list)
+    for job in jobs:
+        by_name[job.name].append(job)
+
+    for name, group in by_name.items():
+        try:
+            handler = _handlers[name]
+        except KeyError:
+            _fail(group, f'No handler registered for {name!r}', retry=False)
+            continue
+        try:
+            with transaction.atomic():
+                # Deleted with the handler's writes, so a job's effects commit exactly once. Only
+                # jobs still held by this claim: an expired lock may have been claimed again, and
+                # a recount may have discarded rating deltas (Game.refresh_rating_aggregates).
+                owned = set(
+                    Job.objects.select_for_update()
+                    .filter(pk__in=[job.pk for job in group], state=Job.States.RUNNING, locked_at=group[0].locked_at)
+                    .values_list('id', flat=True)
+                )
+                Job.objects.filter(pk__in=owned).delete()
+                if owned:
+                    handler([job.payload for job in group if job.pk in owned])
+        except Exception as exc:
+            logger.exception('Job %s failed (%d jobs)', name, len(group))
+            _fail(group, ''.join(traceback.format_exception_only(exc)).strip())
+    return len(jobs)
+
+
+def run_pending(limit=BATCH_SIZE):
+    """Runs batches until no job is due. Returns the number of jobs claimed."""
+    total = 0
+    while True:
+        claimed = run_batch(limit)
+        if not claimed:
+            return total
+        total += claimed
+
+
+def _fail(jobs, error, retry=True):
+    now = timezone.now()
+    for job in jobs:
+        if not retry or job.attempts >= MAX_ATTEMPTS:
+            Job.objects.filter(pk=job.pk).update(state=Job.States.FAILED, last_error=error, locked_at=None)
+            continue
+        try:
+            with transaction.atomic():
+                Job.objects.filter(pk=job.pk).update(
+                    state=Job.States.PENDING, locked_at=None, last_error=error,
+                    run_after=now + RETRY_BACKOFF * 2 ** (job.attempts - 1),
+                )
+        except IntegrityError:
+            # A newer job with the same key is already pending and covers this one
+            Job.objects.filter(pk=job.pk).delete()
+
+
+# --- Handlers ---
+
+@task('ratings.apply')
+def apply_ratings(payloads):
+    # Every delta of a game in the batch goes into one UPDATE
+    changes = defaultdict(list)
+    for payload in payloads:
+        changes[payload['game_id']].append((payload.get('old'), payload.get('new')))
+    for game_id, game_changes in changes.items():
+        Game.apply_rating_changes(game_id, game_changes)
+        cache.invalidate_game(game_id)
+
+
+@task('ratings.refresh')
+def refresh_ratings(payloads):
+    game_ids = {payload['game_id'] for payload in payloads}
+    Game.refresh_rating_aggregates(game_ids)
+    for game_id in game_ids:
+        cache.invalidate_game(game_id)
+
+
+@task('feed.publish')
+def publish_activity(payloads):
+    for payload in payloads:
+        feed.publish(
+            payload['actor_id'], payload['verb'], payload['game_id'],
+            datetime.fromisoformat(payload['created_at']),
+            rating=payload.get('rating'), status=payload.get('status', ''),
+        )
+
+
+@task('recommendations.refresh')
+def refresh_recommendations(payloads):
+    recommendations.refresh_games({payload['game_id'] for payload in payloads})
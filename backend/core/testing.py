@@ -0,0 +1,77 @@
+"""
+Query budget helpers for tests.
+
+    class GameListBudgetTests(QueryBudgetMixin, APITestCase):
+        def test_list(self):
+            self.assertWithinQueryBudget('/api/games/?page_size=100')
+
+The budget defaults to the `query_budget` declared on the view the URL resolves to.
+Any other request a QueryBudgetMixin test makes fails it too when it goes over
+its view's budget (QUERY_BUDGET_STRICT, see core/middleware.py).
+Side effects queued on commit (core/tasks.py) are run with:
+
+    with run_deferred_jobs(self):
+        Review.objects.create(...)
+The helpers only use Django's test utilities, so they work under manage.py test and pytest alike.
+"""
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import resolve
+
+from . import tasks
+from .profiling import QueryBudgetExceeded, get_query_budget
+
+
+def view_query_budget(url, method='get'):
+    """The query_budget declared on the view serving `url` for `method`, or None."""
+    view_class = getattr(resolve(urlsplit(url).path).func, 'view_class', None)
+    return get_query_budget(view_class, method)
+
+
+@contextmanager
+def query_budget(budget, label='block'):
+    """Fail with the captured SQL when the block runs more than `budget` queries."""
+    with CaptureQueriesContext(connection) as captured:
+        yield captured
+    if len(captured) > budget:
+        statements = '\n'.join(f'  {i}. {query["sql"]}' for i, query in enumerate(captured.captured_queries, 1))
+        raise QueryBudgetExceeded(f'{label} ran {len(captured)} queries, budget is {budget}:\n{statements}')
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin: request a URL and fail if it goes over the view's query
+    budget. Every request the test makes is held to its view's budget.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.enterClassContext(override_settings(QUERY_BUDGET_STRICT=True))
+        super().setUpClass()
+
+    def assertWithinQueryBudget(self, url, budget=None, method='get', **kwargs):
+        if budget is None:
+            budget = view_query_budget(url, method)
+            if budget is None:
+                self.fail(f'No query_budget declared for {method.upper()} on the view serving {url}')
+        # Checked here instead, against `budget` and with the captured SQL in the failure
+        with override_settings(QUERY_BUDGET_STRICT=False), query_budget(budget, label=f'{method.upper()} {url}'):
+            response = getattr(self.client, method)(url, **kwargs)
+            if response.streaming:
+                # Streamed responses query while they are consumed
+                b''.join(response.streaming_content)
+        return response
+
+
+@contextmanager
+def run_deferred_jobs(test_case):
+    """
+    Runs the block's on_commit callbacks (TestCase never commits), then every
+    job they queued, as `manage.py run_workers` would.
+    """
+    with test_case.captureOnCommitCallbacks(execute=True):
+        yield
+    tasks.run_pending()
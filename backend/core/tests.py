@@ -1,3 +1,1889 @@
-from django.test import TestCase
+import base64
+import csv
+import importlib
+import io
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.db import close_old_connections, connection, transaction
+from asgiref.sync import async_to_sync
+from django.test import AsyncRequestFactory, TestCase, TransactionTestCase
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db.models import F, QuerySet
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from . import cache as cache_module
+from . import authentication, facets, feed, library, passwords, recommendations, renderers, search, social, tasks, trending
+from .async_views import AsyncActivityFeedView, AsyncGameDetailView, AsyncGameListView
+from .prefetch import aprefetch_game_context, prefetch_game_context
+from .profiling import get_query_budget, registry
+from .throttling import LoginAccountThrottle, TokenBucketThrottle
+from .testing import QueryBudgetExceeded, QueryBudgetMixin, query_budget, run_deferred_jobs, view_query_budget
+from .views import GameReviewListView
+from .management.commands.generate_load_data import PowerLaw
+from .management.commands.import_catalog import Command as ImportCatalog
+from .models import FeedItem, Follow, ForumPost, ForumThread, Game, GameFacetCount, GameSimilarity, GameTrendingScore, Job, LibraryEntry, Review, ReviewVote, TimelineEntry, User
+from .serializers import GameSerializer
+
+
+# --- 1. Database Configuration ---
+class ConcurrentWritersTests(TransactionTestCase):
+    """
+    Several threads (each with its own connection) write reviews and library
+    entries for the same game at once. Runs against whichever database is
+    configured: the default SQLite file, or PostgreSQL with DB_ENGINE=postgresql.
+    """
+    WRITERS = 8
+    WRITES_PER_WRITER = 10
+
+    def setUp(self):
+        self.game = Game.objects.create(title='Contended Game')
+        self.users = User.objects.bulk_create(
+            User(username=f'writer{i}', email=f'writer{i}@example.com')
+            for i in range(self.WRITERS * self.WRITES_PER_WRITER)
+        )
+
+    def write(self, users, errors):
+        try:
+            for user in users:
+                with transaction.atomic():
+                    LibraryEntry.objects.create(user=user, game=self.game)
+                    Review.objects.create(user=user, game=self.game, rating=user.pk % 10 + 1)
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            close_old_connections()
+            connection.close()
+
+    def test_concurrent_review_and_library_writes(self):
+        errors = []
+        chunks = [self.users[i::self.WRITERS] for i in range(self.WRITERS)]
+        threads = [threading.Thread(target=self.write, args=(chunk, errors)) for chunk in chunks]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        # One rating delta per review, committed with it
+        self.assertEqual(Job.objects.filter(name='ratings.apply').count(), len(self.users))
+        tasks.run_pending()
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.review_count, len(self.users))
+        self.assertEqual(self.game.rating_sum, sum(user.pk % 10 + 1 for user in self.users))
+        self.assertEqual(LibraryEntry.objects.filter(game=self.game).count(), len(self.users))
+
+
+class SQLitePragmaTests(TestCase):
+    def test_connection_pragmas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite only')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            self.assertEqual(cursor.fetchone()[0].lower(), 'wal')
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+
+# --- 2. Query Plans ---
+class QueryPlanTests(TestCase):
+    """
+    Runs the hot endpoints, EXPLAINs every SELECT they issued and fails when one
+    of them reads a large table without an index. New queries added to
+    core/views.py are covered automatically.
+    """
+    # Tables that grow with users x games and must never be scanned in full
+    HOT_TABLES = [
+        'core_review', 'core_libraryentry', 'core_forumthread', 'core_follow',
+        'core_feeditem', 'core_timelineentry', 'core_gamesimilarity',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='viewer', email='viewer@example.com')
+        cls.friends = User.objects.bulk_create(
+            User(username=f'friend{i}', email=f'friend{i}@example.com') for i in range(3)
+        )
+        cls.games = [Game.objects.create(title=f'Game {i}', genre='RPG' if i % 2 else 'Action') for i in range(6)]
+        for friend in cls.friends:
+            Follow.objects.create(follower=cls.user, following=friend)
+            for game in cls.games[:4]:
+                Review.objects.create(user=friend, game=game, rating=7)
+                LibraryEntry.objects.create(user=friend, game=game)
+            thread = ForumThread.objects.create(user=friend, game=cls.games[0], title='Thread', content='...')
+            ForumPost.objects.create(user=cls.user, thread=thread, content='Reply')
+        LibraryEntry.objects.create(user=cls.user, game=cls.games[0])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def explain(self, sql):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+            # Tiny test tables make sequential scans cheapest; forbid them to see the available plan
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql)
+            return '\n'.join(row[0] for row in cursor.fetchall())
+
+    def full_scans(self, plan):
+        if connection.vendor == 'sqlite':
+            pattern = r'SCAN (%s)(?! USING)\b' % '|'.join(self.HOT_TABLES)
+        else:
+            pattern = r'Seq Scan on (%s)\b' % '|'.join(self.HOT_TABLES)
+        return re.findall(pattern, plan)
+
+    def request_plans(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return [
+            (query['sql'], self.explain(query['sql']))
+            for query in queries.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+        ]
+
+    def assertNoFullScans(self, url):
+        for sql, plan in self.request_plans(url):
+            self.assertEqual(self.full_scans(plan), [], f'{url} scans a hot table:\n{sql}\n{plan}')
+
+    def assertUsesIndex(self, url, index_name):
+        plans = [plan for _, plan in self.request_plans(url)]
+        self.assertTrue(any(index_name in plan for plan in plans), f'{url} does not use {index_name}:\n' + '\n'.join(plans))
+
+    def test_game_list(self):
+        self.assertNoFullScans('/api/games/')
+        self.assertUsesIndex('/api/games/', 'review_game_recent_idx')
+
+    def test_game_list_genre_filter(self):
+        self.assertUsesIndex('/api/games/?genre=rpg&compact=true', 'game_genre_lower_idx')
+
+    def test_game_list_trending(self):
+        self.assertUsesIndex('/api/games/?trending=true&compact=true', 'trending_score_idx')
+
+    def test_game_detail(self):
+        self.assertNoFullScans(f'/api/games/{self.games[0].pk}/')
+
+    def test_library(self):
+        self.assertNoFullScans('/api/library/')
+
+    def test_forum_threads(self):
+        self.assertNoFullScans(f'/api/games/{self.games[0].pk}/threads/')
+        self.assertUsesIndex(f'/api/games/{self.games[0].pk}/threads/', 'thread_game_activity_idx')
+
+    def test_forum_posts(self):
+        thread = ForumThread.objects.first()
+        self.assertNoFullScans(f'/api/threads/{thread.pk}/posts/')
+
+    def test_social_graph(self):
+        social.graph.clear()
+        for url in ('followers', 'following'):
+            self.assertNoFullScans(f'/api/users/{self.friends[0].pk}/{url}/')
+        self.assertUsesIndex(f'/api/users/{self.friends[0].pk}/followers/', 'follow_followers_recent_idx')
+        self.assertNoFullScans('/api/social/mutuals/')
+        self.assertNoFullScans('/api/social/suggestions/')
+
+    def test_recommendations(self):
+        recommendations.build_all(min_overlap=1)
+        self.assertUsesIndex(f'/api/games/{self.games[0].pk}/similar/', 'similarity_game_score_idx')
+        self.assertNoFullScans('/api/users/me/recommendations/')
+
+    def test_activity_feed(self):
+        self.assertNoFullScans('/api/social/feed/')
+        self.assertUsesIndex('/api/social/feed/', 'timeline_owner_recent_idx')
+
+    def test_pull_activity_feed(self):
+        original = feed.FEED_READ_MODE
+        feed.FEED_READ_MODE = 'pull'
+        try:
+            self.assertNoFullScans('/api/social/feed/')
+            self.assertUsesIndex('/api/social/feed/', 'review_user_recent_idx')
+            self.assertUsesIndex('/api/social/feed/', 'library_user_recent_idx')
+        finally:
+            feed.FEED_READ_MODE = original
+
+
+# --- 3. Query Budgets & Profiling ---
+class QueryBudgetTests(QueryBudgetMixin, TestCase):
+    """Endpoints stay within the query_budget declared on their views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='viewer', email='viewer@example.com')
+        cls.friend = User.objects.create(username='friend', email='friend@example.com')
+        Follow.objects.create(follower=cls.user, following=cls.friend)
+        cls.games = Game.objects.bulk_create(Game(title=f'Game {i}', genre='RPG') for i in range(40))
+        for game in cls.games:
+            Review.objects.create(user=cls.friend, game=game, rating=6)
+            LibraryEntry.objects.create(user=cls.user, game=game)
+
+    def setUp(self):
+        # A real token, so the authentication queries count against the budget too
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def test_game_list_budget_is_independent_of_page_size(self):
+        for page_size in (1, 10, 40):
+            self.assertWithinQueryBudget(f'/api/games/?page_size={page_size}')
+        self.client.credentials()
+        for page_size in (1, 10, 40):
+            self.assertWithinQueryBudget(f'/api/games/?page_size={page_size}&nocache={page_size}')
+
+    def test_game_detail_budget(self):
+        self.assertWithinQueryBudget(f'/api/games/{self.games[0].pk}/')
+
+    def test_library_budget(self):
+        self.assertWithinQueryBudget('/api/library/')
+
+    def test_activity_feed_budget(self):
+        self.assertWithinQueryBudget('/api/social/feed/')
+        with mock.patch.object(feed, 'FEED_READ_MODE', 'pull'):
+            self.assertWithinQueryBudget('/api/social/feed/')
+            self.assertEqual(view_query_budget('/api/social/feed/'), 5)
+        self.assertEqual(view_query_budget('/api/social/feed/'), 3)
+
+    def test_over_budget_requests_fail_the_test(self):
+        with mock.patch.object(GameReviewListView, 'query_budget', 0):
+            with self.assertRaisesMessage(QueryBudgetExceeded, 'budget is 0'):
+                self.client.get(f'/api/games/{self.games[0].pk}/reviews/')
+
+    def test_budget_failure_lists_queries(self):
+        with self.assertRaisesMessage(QueryBudgetExceeded, 'ran 1 queries, budget is 0'):
+            with query_budget(0):
+                list(Game.objects.all()[:1])
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/games/')
+        timing = response['Server-Timing']
+        for metric in ('db;dur=', 'serialize;dur=', 'render;dur=', 'total;dur='):
+            self.assertIn(metric, timing)
+
+    def test_metrics_endpoint(self):
+        registry.reset()
+        self.client.get('/api/games/')
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 403)
+
+        admin = User.objects.create(username='admin', email='admin@example.com', role='ADMIN')
+        self.client.force_authenticate(admin)
+        data = self.client.get('/api/_metrics').json()['data']
+        self.assertEqual(data['/api/games/']['requests'], 1)
+        self.assertEqual(sum(data['/api/games/']['queries']['buckets'].values()), 1)
+
+
+
+# --- 4. Library Listing, Import / Export ---
+class LibraryImportExportTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='migrant', email='migrant@example.com')
+        cls.games = Game.objects.bulk_create(Game(title=f'Game {i}') for i in range(5))
+        LibraryEntry.objects.create(user=cls.user, game=cls.games[0], status='COMPLETED')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_json_import(self):
+        items = [
+            {'game': self.games[0].pk, 'status': 'PLAYING'},
+            {'game': self.games[1].pk, 'status': 'wishlist'},
+            {'game': self.games[1].pk, 'status': 'PLAYING'},
+            {'game': self.games[2].pk},
+            {'game': 0, 'status': 'PLAYING'},
+            {'game': self.games[3].pk, 'status': 'BORED'},
+            {'status': 'PLAYING'},
+        ]
+        response = self.client.post('/api/library/import/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual([r['result'] for r in data['results']], [
+            'exists', 'created', 'exists', 'created', 'invalid', 'invalid', 'invalid',
+        ])
+        self.assertEqual((data['created'], data['exists'], data['invalid']), (2, 2, 3))
+        statuses = dict(LibraryEntry.objects.filter(user=self.user).values_list('game_id', 'status'))
+        self.assertEqual(statuses, {
+            self.games[0].pk: 'COMPLETED', self.games[1].pk: 'WISHLIST', self.games[2].pk: 'PLAYING',
+        })
+
+    def test_streamed_ndjson_and_csv_import(self):
+        body = f'{{"game": {self.games[1].pk}, "status": "DROPPED"}}\nnot json\n\n{{"game": {self.games[2].pk}}}\n'
+        response = self.client.post('/api/library/import/', body, content_type='application/x-ndjson')
+        self.assertEqual([r['result'] for r in response.json()['data']['results']], ['created', 'invalid', 'created'])
+
+        body = f'game,status\n{self.games[3].pk},COMPLETED\n{self.games[4].pk},\n'
+        response = self.client.post('/api/library/import/', body, content_type='text/csv')
+        self.assertEqual(response.json()['data']['created'], 2)
+        self.assertEqual(LibraryEntry.objects.get(user=self.user, game=self.games[3]).status, 'COMPLETED')
+
+    def test_import_rejects_non_list_and_oversized_bodies(self):
+        response = self.client.post('/api/library/import/', {'game': self.games[1].pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        with self.assertRaises(library.ImportTooLarge):
+            library.import_entries(self.user, [{'game': game.pk} for game in self.games], max_items=2)
+        self.assertEqual(LibraryEntry.objects.filter(user=self.user).count(), 1)
+
+    def test_concurrently_added_games_are_reported_as_existing(self):
+        bulk_create = LibraryEntry.objects.bulk_create
+
+        def racing_bulk_create(entries, **kwargs):
+            # Another request adds the game between the lookup and the INSERT
+            LibraryEntry.objects.create(user=self.user, game=self.games[2], status='DROPPED')
+            return bulk_create(entries, **kwargs)
+
+        items = [{'game': self.games[1].pk}, {'game': self.games[2].pk, 'status': 'PLAYING'}]
+        with mock.patch.object(LibraryEntry.objects, 'bulk_create', side_effect=racing_bulk_create):
+            results = library.import_entries(self.user, items)
+        self.assertEqual([r['result'] for r in results], ['created', 'exists'])
+        self.assertEqual(LibraryEntry.objects.get(user=self.user, game=self.games[2]).status, 'DROPPED')
+
+    def test_import_query_count_is_independent_of_size(self):
+        def import_queries(size):
+            games = Game.objects.bulk_create(Game(title=f'Bulk {i}') for i in range(size))
+            with CaptureQueriesContext(connection) as captured:
+                library.import_entries(self.user, [{'game': game.pk, 'status': 'WISHLIST'} for game in games])
+            return len(captured)
+
+        self.assertEqual(import_queries(5), import_queries(library.IMPORT_BATCH_SIZE))
+        self.assertEqual(LibraryEntry.objects.filter(user=self.user).count(), 1 + 5 + library.IMPORT_BATCH_SIZE)
+
+    def test_export_formats(self):
+        LibraryEntry.objects.create(user=self.user, game=self.games[1], status='WISHLIST')
+        self.assertWithinQueryBudget('/api/library/export/')
+        response = self.client.get('/api/library/export/')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['game'] for line in lines], [self.games[0].pk, self.games[1].pk])
+
+        response = self.client.get('/api/library/export/?format=csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual([row['status'] for row in rows], ['COMPLETED', 'WISHLIST'])
+        self.assertEqual(rows[0]['title'], 'Game 0')
+
+        response = self.client.get('/api/library/export/?format=json')
+        data = json.loads(b''.join(response.streaming_content))['data']
+        self.assertEqual(len(data), 2)
+
+
+class LibraryListingTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='collector', email='collector@example.com')
+        cls.other = User.objects.create(username='reviewer', email='reviewer@example.com')
+        cls.games = Game.objects.bulk_create(Game(title=f'Game {i}', genre='RPG') for i in range(30))
+        statuses = ['PLAYING', 'COMPLETED', 'WISHLIST']
+        for i, game in enumerate(cls.games):
+            LibraryEntry.objects.create(user=cls.user, game=game, status=statuses[i % 3])
+            Review.objects.create(user=cls.other, game=game, rating=8)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get_library(self, url='/api/library/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))['data']
+
+    def test_slim_entries_and_counts(self):
+        data = self.get_library()
+        self.assertEqual(data['counts'], {'total': 30, 'PLAYING': 10, 'COMPLETED': 10, 'DROPPED': 0, 'WISHLIST': 10})
+        self.assertEqual(len(data['results']), 30)
+        entry = data['results'][0]
+        self.assertEqual(entry['game_details']['title'], 'Game 29')
+        self.assertNotIn('reviews', entry['game_details'])
+        self.assertNotIn('description', entry['game_details'])
+
+    def test_status_filter(self):
+        data = self.get_library('/api/library/?status=completed,wishlist')
+        self.assertEqual({entry['status'] for entry in data['results']}, {'COMPLETED', 'WISHLIST'})
+        self.assertEqual(len(data['results']), 20)
+        self.assertEqual(data['counts']['total'], 30)
+        self.assertEqual(self.client.get('/api/library/?status=bored').status_code, 400)
+
+    def test_query_count_is_independent_of_library_size(self):
+        with CaptureQueriesContext(connection) as large:
+            self.get_library()
+        LibraryEntry.objects.filter(user=self.user).exclude(game=self.games[0]).delete()
+        with CaptureQueriesContext(connection) as small:
+            self.get_library()
+        self.assertEqual(len(large), len(small))
+        self.assertWithinQueryBudget('/api/library/', budget=2)
+
+
+# --- 5. Background Jobs ---
+class TaskQueueTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='critic', email='critic@example.com')
+        cls.follower = User.objects.create(username='fan', email='fan@example.com')
+        Follow.objects.create(follower=cls.follower, following=cls.user)
+        cls.game = Game.objects.create(title='Queued Game')
+        cls.reviewers = User.objects.bulk_create(
+            User(username=f'reviewer{i}', email=f'reviewer{i}@example.com') for i in range(3)
+        )
+
+    def test_review_side_effects_run_after_commit(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/reviews/', {'game_id': self.game.pk, 'rating': 9})
+        self.assertEqual(response.status_code, 201)
+
+        # The request only stored the review and queued its side effects
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.review_count, 0)
+        self.assertEqual(sorted(Job.objects.values_list('name', flat=True)), ['feed.publish', 'ratings.apply'])
+
+        self.assertEqual(tasks.run_pending(), 2)
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_9_count, float(self.game.average_rating)), (1, 1, 9.0))
+        self.assertTrue(TimelineEntry.objects.filter(owner=self.follower, item__verb=FeedItem.Verbs.REVIEW).exists())
+        self.assertFalse(Job.objects.exists())
+
+    def test_rating_deltas_are_batched(self):
+        with run_deferred_jobs(self):
+            for i, reviewer in enumerate(self.reviewers):
+                Review.objects.create(user=reviewer, game=self.game, rating=i + 6)
+            self.assertEqual(Job.objects.filter(name='ratings.apply').count(), 3)
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_sum), (3, 21))
+
+        for reviewer in self.reviewers:
+            Review.objects.filter(user=reviewer).get().delete()
+        with CaptureQueriesContext(connection) as queries:
+            tasks.run_pending()
+        game_updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "core_game"')]
+        self.assertEqual(len(game_updates), 1)
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_sum, self.game.rating_7_count), (0, 0, 0))
+
+    def test_unknown_previous_ratings_are_recounted_once(self):
+        reviews = [Review.objects.create(user=reviewer, game=self.game, rating=5) for reviewer in self.reviewers]
+        with self.captureOnCommitCallbacks(execute=True):
+            for review in reviews:
+                # Not loaded from the database: the previous rating is unknown
+                Review(pk=review.pk, user=review.user, game=self.game, rating=8, created_at=review.created_at).save()
+        self.assertEqual(Job.objects.filter(name='ratings.refresh').count(), 1)
+        tasks.run_pending()
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_sum, self.game.rating_5_count), (3, 24, 0))
+
+    def test_recount_discards_the_deltas_it_covers(self):
+        for reviewer in self.reviewers:
+            Review.objects.create(user=reviewer, game=self.game, rating=4)
+        Game.refresh_rating_aggregates([self.game.pk])
+        self.assertFalse(Job.objects.filter(name='ratings.apply').exists())
+        tasks.run_pending()
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_sum), (3, 12))
+
+    def test_recount_keeps_deltas_written_after_it_read(self):
+        Review.objects.create(user=self.reviewers[0], game=self.game, rating=4)
+        union = QuerySet.union
+
+        def read_then_write(*args, **kwargs):
+            # Another review commits once the recount has read reviews and deltas
+            rows = list(union(*args, **kwargs))
+            Review.objects.create(user=self.reviewers[1], game=self.game, rating=10)
+            return rows
+
+        with mock.patch.object(QuerySet, 'union', read_then_write):
+            Game.refresh_rating_aggregates([self.game.pk])
+        self.assertEqual(Job.objects.filter(name='ratings.apply').count(), 1)
+        tasks.run_pending()
+        self.game.refresh_from_db()
+        self.assertEqual((self.game.review_count, self.game.rating_sum, self.game.rating_10_count), (2, 14, 1))
+
+    def test_jobs_of_an_expired_claim_are_not_run_twice(self):
+        Review.objects.create(user=self.user, game=self.game, rating=9)
+        jobs = tasks.claim()
+        # The lock expired and another worker claimed the job again
+        Job.objects.update(locked_at=timezone.now() + timedelta(seconds=1))
+        with mock.patch.object(tasks, 'claim', return_value=jobs):
+            tasks.run_batch()
+        self.game.refresh_from_db()
+        self.assertEqual(self.game.review_count, 0)
+        self.assertEqual(Job.objects.get().state, Job.States.RUNNING)
+
+    def test_running_keys_are_not_claimed_again(self):
+        tasks.enqueue('test.keyed', {}, key='same')
+        self.assertEqual(len(tasks.claim()), 1)
+        # A new job for the key can be queued while the first one runs, but not claimed
+        tasks.enqueue('test.keyed', {}, key='same')
+        tasks.enqueue('test.keyed', {}, key='other')
+        self.assertEqual([job.key for job in tasks.claim()], ['other'])
+        later = timezone.now() + tasks.LOCK_TIMEOUT * 2
+        self.assertEqual([job.key for job in tasks.claim(now=later)], ['same', 'same', 'other'])
+
+    def test_rolled_back_writes_queue_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                Review.objects.create(user=self.user, game=self.game, rating=5)
+                transaction.set_rollback(True)
+        self.assertEqual(callbacks, [])
+
+    def test_failing_jobs_are_retried_then_marked_failed(self):
+        calls = []
+
+        @tasks.task('test.flaky')
+        def flaky(payloads):
+            calls.append(payloads)
+            raise RuntimeError('boom')
+
+        tasks.enqueue('test.flaky', {'n': 1})
+        with self.assertLogs('core.tasks', level='ERROR'):
+            self.assertEqual(tasks.run_pending(), 1)
+        job = Job.objects.get()
+        self.assertEqual((job.state, job.attempts), (Job.States.PENDING, 1))
+        self.assertIn('RuntimeError: boom', job.last_error)
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.update(run_after=timezone.now(), attempts=tasks.MAX_ATTEMPTS - 1)
+        with self.assertLogs('core.tasks', level='ERROR'):
+            tasks.run_pending()
+        self.assertEqual(Job.objects.get().state, Job.States.FAILED)
+        self.assertEqual(len(calls), 2)
+
+
+# --- 6. Async Views ---
+class AsyncViewTests(TestCase):
+    """The async versions served under ASGI return the same payloads as the sync views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='viewer', email='viewer@example.com')
+        cls.friend = User.objects.create(username='friend', email='friend@example.com')
+        Follow.objects.create(follower=cls.user, following=cls.friend)
+        cls.games = [Game.objects.create(title=f'Game {i}', genre='RPG' if i % 2 else 'Action') for i in range(6)]
+        for game in cls.games[:4]:
+            Review.objects.create(user=cls.friend, game=game, rating=7)
+            LibraryEntry.objects.create(user=cls.friend, game=game)
+            tasks.publish_activity([{
+                'actor_id': cls.friend.pk, 'verb': 'REVIEW', 'game_id': game.pk,
+                'created_at': timezone.now().isoformat(), 'rating': 7,
+            }])
+        LibraryEntry.objects.create(user=cls.user, game=cls.games[0], status='COMPLETED')
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def async_get(self, view_class, url, authenticated=True, **kwargs):
+        headers = {'Authorization': f'Bearer {self.token}'} if authenticated else {}
+        request = AsyncRequestFactory().get(url, headers=headers)
+        return async_to_sync(view_class.as_view())(request, **kwargs)
+
+    def assertSamePayload(self, view_class, url, authenticated=True, **kwargs):
+        if not authenticated:
+            self.client.credentials()
+        expected = self.client.get(url)
+        actual = self.async_get(view_class, url, authenticated, **kwargs)
+        self.assertEqual(actual.status_code, expected.status_code)
+        self.assertEqual(json.loads(actual.content), expected.json())
+
+    def test_game_list(self):
+        self.assertSamePayload(AsyncGameListView, '/api/games/')
+        self.assertSamePayload(AsyncGameListView, '/api/games/?genre=rpg&compact=true&ordering=-title&page_size=2')
+
+    def test_game_list_anonymous(self):
+        self.assertSamePayload(AsyncGameListView, '/api/games/?page_size=3&async=1', authenticated=False)
+
+    def test_game_detail(self):
+        self.assertSamePayload(AsyncGameDetailView, f'/api/games/{self.games[0].pk}/', pk=self.games[0].pk)
+        self.assertSamePayload(AsyncGameDetailView, '/api/games/0/', pk=0)
+
+    def test_activity_feed(self):
+        self.assertSamePayload(AsyncActivityFeedView, '/api/social/feed/?page_size=3')
+        original = feed.FEED_READ_MODE
+        feed.FEED_READ_MODE = 'pull'
+        try:
+            self.assertSamePayload(AsyncActivityFeedView, '/api/social/feed/')
+        finally:
+            feed.FEED_READ_MODE = original
+
+    def test_activity_feed_budget(self):
+        for mode in ('timeline', 'pull'):
+            with mock.patch.object(feed, 'FEED_READ_MODE', mode):
+                budget = get_query_budget(AsyncActivityFeedView, 'GET')
+                self.assertEqual(budget, view_query_budget('/api/social/feed/'))
+                with query_budget(budget):
+                    self.assertEqual(self.async_get(AsyncActivityFeedView, '/api/social/feed/').status_code, 200)
+
+    def test_activity_feed_requires_authentication(self):
+        response = self.async_get(AsyncActivityFeedView, '/api/social/feed/', authenticated=False)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(json.loads(response.content)['success'], False)
+
+    def test_profiling_middleware_counts_async_queries(self):
+        response = async_to_sync(self.async_client.get)('/api/games/', headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+
+# --- 7. Forum ---
+class ForumTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='viewer', email='viewer@example.com')
+        cls.game = Game.objects.create(title='Busy Game')
+        cls.threads = [
+            ForumThread.objects.create(user=cls.user, game=cls.game, title=f'Thread {i}', content='...')
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = f'/api/games/{self.game.pk}/threads/'
+
+    def reply(self, thread, content='Reply'):
+        response = self.assertWithinQueryBudget(f'/api/threads/{thread.pk}/posts/', method='post', data={'content': content})
+        self.assertEqual(response.status_code, 201)
+        return response.json()['data']
+
+    def test_replies_update_counters_and_bump_the_thread(self):
+        oldest = self.threads[0]
+        self.reply(oldest)
+        self.reply(oldest)
+
+        threads = self.client.get(self.url).json()['data']['results']
+        self.assertEqual(threads[0]['id'], oldest.pk)
+        self.assertEqual(threads[0]['reply_count'], 2)
+        self.assertEqual([t['id'] for t in threads[1:]], [t.pk for t in reversed(self.threads[1:])])
+
+        posts = self.client.get(f'/api/threads/{oldest.pk}/posts/').json()['data']['results']
+        self.assertEqual([post['username'] for post in posts], ['viewer', 'viewer'])
+
+        ForumPost.objects.filter(thread=oldest).first().delete()
+        oldest.refresh_from_db()
+        self.assertEqual(oldest.reply_count, 1)
+
+    def test_cursor_pagination_walks_every_thread_once(self):
+        seen, url = [], f'{self.url}?page_size=2'
+        while url:
+            page = self.assertWithinQueryBudget(url).json()['data']
+            seen += [thread['id'] for thread in page['results']]
+            url = page['next']
+        self.assertEqual(seen, [thread.pk for thread in reversed(self.threads)])
+
+    def test_query_count_is_independent_of_thread_count(self):
+        ForumThread.objects.bulk_create(
+            ForumThread(user=User.objects.create(username=f'poster{i}', email=f'poster{i}@example.com'),
+                        game=self.game, title='More', content='...')
+            for i in range(30)
+        )
+        self.assertWithinQueryBudget(f'{self.url}?page_size=100')
+
+    def test_reply_to_missing_thread(self):
+        response = self.client.post('/api/threads/0/posts/', {'content': 'Reply'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_refresh_reply_counters_repairs_drift(self):
+        thread = self.threads[1]
+        post = ForumPost.objects.create(user=self.user, thread=thread, content='Reply')
+        ForumThread.objects.filter(pk=thread.pk).update(reply_count=7, last_activity_at=thread.created_at)
+
+        ForumThread.refresh_reply_counters([thread.pk])
+        thread.refresh_from_db()
+        self.assertEqual(thread.reply_count, 1)
+        self.assertEqual(thread.last_activity_at, post.created_at)
+
+
+# --- 8. Social Graph ---
+class SocialGraphTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.me, cls.alice, cls.bob, cls.carol, cls.dave = User.objects.bulk_create(
+            User(username=name, email=f'{name}@example.com') for name in ('me', 'alice', 'bob', 'carol', 'dave')
+        )
+
+    def setUp(self):
+        social.graph.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.me)}')
+
+    def follow(self, follower, following):
+        self.assertTrue(social.follow(follower.pk, following.pk))
+
+    def test_follow_is_idempotent_and_counted(self):
+        for _ in range(2):
+            response = self.client.post(f'/api/users/{self.alice.pk}/follow/')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(Follow.objects.filter(follower=self.me).count(), 1)
+        self.assertEqual(User.objects.get(pk=self.alice.pk).follower_count, 1)
+        self.assertEqual(self.client.get('/api/users/me/').json()['data']['following_count'], 1)
+
+        for _ in range(2):
+            response = self.client.delete(f'/api/users/{self.alice.pk}/unfollow/')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(pk=self.alice.pk).follower_count, 0)
+        self.assertEqual(User.objects.get(pk=self.me.pk).following_count, 0)
+
+    def test_follow_errors(self):
+        self.assertEqual(self.client.post(f'/api/users/{self.me.pk}/follow/').status_code, 400)
+        self.assertEqual(self.client.post('/api/users/0/follow/').status_code, 404)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_follower_lists_are_paginated_newest_first(self):
+        for user in (self.alice, self.bob, self.carol, self.dave):
+            self.follow(user, self.me)
+        seen, url = [], f'/api/users/{self.me.pk}/followers/?page_size=3'
+        while url:
+            page = self.assertWithinQueryBudget(url).json()['data']
+            seen += [row['user']['username'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(seen, ['dave', 'carol', 'bob', 'alice'])
+
+        self.follow(self.me, self.bob)
+        following = self.assertWithinQueryBudget(f'/api/users/{self.me.pk}/following/').json()['data']['results']
+        self.assertEqual([row['user']['username'] for row in following], ['bob'])
+
+    def test_mutual_follows(self):
+        for user in (self.alice, self.bob, self.carol):
+            self.follow(self.me, user)
+        self.follow(self.alice, self.me)
+        self.follow(self.carol, self.me)
+
+        data = self.assertWithinQueryBudget('/api/social/mutuals/?page_size=1').json()['data']
+        self.assertEqual([user['username'] for user in data['results']], ['alice'])
+        data = self.client.get(data['next']).json()['data']
+        self.assertEqual([user['username'] for user in data['results']], ['carol'])
+        self.assertIsNone(data['next'])
+
+        # Writes evict the cached sets
+        social.unfollow(self.carol.pk, self.me.pk)
+        self.assertEqual(social.mutual_follows(self.me.pk), {self.alice.pk})
+
+    def test_suggestions_rank_friends_of_friends(self):
+        self.follow(self.me, self.alice)
+        self.follow(self.me, self.bob)
+        self.follow(self.alice, self.carol)
+        self.follow(self.bob, self.carol)
+        self.follow(self.bob, self.dave)
+        self.follow(self.bob, self.me)
+
+        data = self.assertWithinQueryBudget('/api/social/suggestions/').json()['data']
+        self.assertEqual([(user['username'], user['mutual_count']) for user in data], [('carol', 2), ('dave', 1)])
+        with query_budget(2):
+            # Warm cache: only the JWT user and the suggested users are read
+            self.client.get('/api/social/suggestions/')
+
+    def test_adjacency_cache_is_bounded(self):
+        self.follow(self.alice, self.me)
+        self.follow(self.alice, self.bob)
+        self.follow(self.carol, self.me)
+        cache = social.AdjacencyCache(max_edges=2)
+        cache.get(social.FOLLOWING, self.alice.pk)
+        cache.get(social.FOLLOWING, self.carol.pk)
+        # alice's set (2 ids) is evicted to make room for carol's
+        self.assertEqual(list(cache._sets), [(social.FOLLOWING, self.carol.pk)])
+        self.assertLessEqual(cache._size, 2)
+
+    def test_refresh_counts_repairs_drift(self):
+        Follow.objects.create(follower=self.alice, following=self.bob)
+        social.refresh_counts()
+        self.assertEqual(User.objects.get(pk=self.bob.pk).follower_count, 1)
+        self.assertEqual(User.objects.get(pk=self.alice.pk).following_count, 1)
+
+
+# --- 9. Recommendations ---
+class RecommendationTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.a, cls.b, cls.c, cls.d, cls.e = Game.objects.bulk_create(Game(title=title) for title in 'ABCDE')
+        cls.users = User.objects.bulk_create(User(username=f'u{i}', email=f'u{i}@example.com') for i in range(4))
+        libraries = [[cls.a, cls.b, cls.c], [cls.a, cls.b], [cls.a, cls.b, cls.d], [cls.c, cls.d]]
+        LibraryEntry.objects.bulk_create(
+            LibraryEntry(user=user, game=game) for user, games in zip(cls.users, libraries) for game in games
+        )
+        # Dropped games are not interactions
+        LibraryEntry.objects.create(user=cls.users[3], game=cls.e, status='DROPPED')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.users[1])}')
+
+    def stored(self, game):
+        return [
+            (similar_id, round(score, 3))
+            for similar_id, score in GameSimilarity.objects.filter(game=game).order_by('-score', 'similar_id').values_list('similar_id', 'score')
+        ]
+
+    def test_cosine_neighbours(self):
+        recommendations.build_all(engine='python', min_overlap=1)
+        # co(A, B) = 3 of n(A) = n(B) = 3; A and C share one of 3 x 2 libraries
+        self.assertEqual(self.stored(self.a), [(self.b.pk, 1.0), (self.c.pk, 0.408), (self.d.pk, 0.408)])
+        self.assertEqual(self.stored(self.c), [(self.d.pk, 0.5), (self.a.pk, 0.408), (self.b.pk, 0.408)])
+        self.assertEqual(self.stored(self.e), [])
+
+        recommendations.build_all(engine='python', min_overlap=2, top_k=1)
+        self.assertEqual(self.stored(self.a), [(self.b.pk, 1.0)])
+        self.assertEqual(self.stored(self.c), [])
+
+    @skipIf(recommendations.np is None, 'NumPy / SciPy not installed')
+    def test_numpy_engine_matches_python(self):
+        recommendations.build_all(engine='python', min_overlap=1)
+        expected = {game.pk: self.stored(game) for game in (self.a, self.b, self.c, self.d, self.e)}
+        recommendations.build_all(engine='numpy', min_overlap=1)
+        self.assertEqual({game.pk: self.stored(game) for game in (self.a, self.b, self.c, self.d, self.e)}, expected)
+
+    def test_similar_and_recommendations_endpoints(self):
+        recommendations.build_all(min_overlap=1)
+        similar = self.assertWithinQueryBudget(f'/api/games/{self.a.pk}/similar/?page_size=2').json()['data']
+        self.assertEqual([(row['game']['title'], round(row['score'], 3)) for row in similar], [('B', 1.0), ('C', 0.408)])
+
+        # u1 has A and B: C and D are both similar to each of them
+        recommended = self.assertWithinQueryBudget('/api/users/me/recommendations/').json()['data']
+        self.assertEqual([game['title'] for game in recommended], ['C', 'D'])
+        self.assertAlmostEqual(recommended[0]['recommendation_score'], 0.816, places=3)
+
+    def test_library_changes_refresh_neighbours(self):
+        recommendations.build_all()
+        self.assertEqual(self.stored(self.a), [(self.b.pk, 1.0)])
+        newcomer = User.objects.create(username='newcomer', email='newcomer@example.com')
+        with mock.patch.object(recommendations, 'REFRESH_DELAY', timedelta(0)), run_deferred_jobs(self):
+            LibraryEntry.objects.create(user=newcomer, game=self.a)
+            LibraryEntry.objects.create(user=newcomer, game=self.c)
+        # One refresh job per game; A and C now share two libraries
+        self.assertEqual(self.stored(self.a), [(self.b.pk, 0.866), (self.c.pk, 0.577)])
+        self.assertEqual(self.stored(self.c), [(self.a.pk, 0.577)])
+        # B was not refreshed, but its row for A carries A's new score
+        self.assertEqual(self.stored(self.b), [(self.a.pk, 0.866)])
+
+    def test_refresh_removes_pairs_that_no_longer_qualify(self):
+        recommendations.build_all(engine='python', min_overlap=1)
+        LibraryEntry.objects.filter(game=self.c).delete()
+        recommendations.refresh_games([self.c.pk], min_overlap=1)
+        self.assertEqual(self.stored(self.c), [])
+        self.assertNotIn(self.c.pk, [similar_id for similar_id, _ in self.stored(self.a) + self.stored(self.d)])
+
+
+# --- 10. Authentication ---
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        authentication.states.clear()
+        self.user = User.objects.create_user(username='player', email='player@example.com', password='secret-password')
+        self.client = APIClient()
+
+    def login(self):
+        tokens = self.client.post('/api/auth/login/', {'username': 'player', 'password': 'secret-password'}).json()['data']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access"]}')
+        return tokens
+
+    def refresh(self, tokens):
+        return self.client.post('/api/auth/refresh/', {'refresh': tokens['refresh']})
+
+    def user_queries(self, url):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return [query['sql'] for query in captured if '"core_user"' in query['sql']]
+
+    def test_warm_requests_do_not_read_the_user(self):
+        self.login()
+        self.assertEqual(len(self.user_queries('/api/social/mutuals/')), 1)
+        self.assertEqual(self.user_queries('/api/social/mutuals/'), [])
+        # The profile still reads the whole row
+        self.assertEqual(self.client.get('/api/users/me/').json()['data']['username'], 'player')
+
+    def test_claims_and_role_changes(self):
+        tokens = self.login()
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 403)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.role = 'ADMIN'
+        user.save(update_fields=['role'])
+        self.assertEqual(User.objects.get(pk=self.user.pk).auth_version, 1)
+        # The old token's claims are stale, but the request runs with the current ones
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 200)
+        # Refreshing stamps them into the new access token
+        access = self.refresh(tokens).json()['data']['access']
+        self.assertEqual(AccessToken(access)['role'], 'ADMIN')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(self.client.get('/api/_metrics').status_code, 200)
+
+    def test_renaming_keeps_the_session(self):
+        self.login()
+        response = self.client.patch('/api/users/me/', {'username': 'renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(User.objects.get(pk=self.user.pk).auth_version, 1)
+        self.assertEqual(self.client.get('/api/users/me/').json()['data']['username'], 'renamed')
+        self.assertEqual(authentication.states.get(self.user.pk).db, 'default')
+
+    def test_unrelated_changes_keep_tokens(self):
+        self.login()
+        self.client.patch('/api/users/me/', {'bio': 'Hello'}, format='json')
+        # A password check that rehashes saves the user too
+        self.assertTrue(User.objects.get(pk=self.user.pk).check_password('secret-password'))
+        self.assertEqual(User.objects.get(pk=self.user.pk).auth_version, 0)
+        self.assertEqual(self.client.get('/api/social/mutuals/').status_code, 200)
+
+    def test_revoke_and_deactivate(self):
+        old = self.login()
+        self.assertEqual(self.client.post('/api/auth/revoke/').status_code, 200)
+        self.assertEqual(self.client.get('/api/social/mutuals/').status_code, 401)
+        self.assertEqual(self.refresh(old).status_code, 401)
+
+        # Logging in again works at once
+        tokens = self.login()
+        self.assertEqual(self.client.get('/api/social/mutuals/').status_code, 200)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        response = self.client.get('/api/social/mutuals/')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.refresh(tokens).status_code, 401)
+
+
+# --- 11. Login & Registration ---
+class AuthPipelineTests(TestCase):
+    def setUp(self):
+        # Throttle buckets live in the cache
+        cache.clear()
+        self.client = APIClient()
+
+    def login(self, username, password):
+        return self.client.post('/api/auth/login/', {'username': username, 'password': password})
+
+    def test_register_and_login_through_the_pool(self):
+        response = self.client.post('/api/auth/register/', {
+            'username': 'newcomer', 'email': 'NEWCOMER@Example.com', 'password': 'secret-password',
+        })
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='newcomer')
+        self.assertEqual(user.email, 'NEWCOMER@example.com')
+        self.assertEqual(identify_hasher(user.password).algorithm, identify_hasher(make_password('x')).algorithm)
+        self.assertEqual(self.login('newcomer', 'secret-password').status_code, 200)
+        self.assertEqual(self.login('newcomer', 'wrong-password').status_code, 401)
+        self.assertEqual(self.login('nobody', 'secret-password').status_code, 401)
+
+    def test_outdated_hashes_are_upgraded_on_login(self):
+        user = User.objects.create(username='veteran', email='veteran@example.com')
+        User.objects.filter(pk=user.pk).update(password=make_password('secret-password', hasher='pbkdf2_sha256'))
+        self.assertEqual(self.login('veteran', 'secret-password').status_code, 200)
+        upgraded = User.objects.get(pk=user.pk).password
+        self.assertNotEqual(identify_hasher(upgraded).algorithm, 'pbkdf2_sha256')
+        self.assertEqual(self.login('veteran', 'secret-password').status_code, 200)
+        self.assertEqual(User.objects.get(pk=user.pk).password, upgraded)
+
+    def test_token_bucket(self):
+        class Throttle(TokenBucketThrottle):
+            rate = '2/min'
+
+            def get_cache_key(self, request, view):
+                return 'throttle_test'
+
+        throttle = Throttle()
+        now = 1000.0
+        throttle.timer = lambda: now
+        # A full bucket lets a burst through, then refills at 2 per minute
+        self.assertEqual([throttle.allow_request(None, None) for _ in range(3)], [True, True, False])
+        self.assertAlmostEqual(throttle.wait(), 30)
+        now += 30
+        self.assertEqual([throttle.allow_request(None, None) for _ in range(2)], [True, False])
+
+    def test_login_throttles_per_account(self):
+        User.objects.create_user(username='target', email='target@example.com', password='secret-password')
+        with mock.patch.object(LoginAccountThrottle, 'THROTTLE_RATES', {'login_account': '2/min'}):
+            self.assertEqual(self.login('target', 'guess-1').status_code, 401)
+            self.assertEqual(self.login('TARGET', 'guess-2').status_code, 401)
+            response = self.login('target', 'secret-password')
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+            # Other accounts are not affected
+            self.assertEqual(self.login('someone-else', 'guess').status_code, 401)
+
+    def test_refuses_logins_when_the_pool_is_saturated(self):
+        User.objects.create_user(username='player', email='player@example.com', password='secret-password')
+        with mock.patch.object(passwords, 'pool', passwords.HashPool(max_pending=0)), \
+                mock.patch.object(passwords, 'HASH_MODE', 'pool'):
+            response = self.login('player', 'secret-password')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_login_with_a_non_object_body(self):
+        for body in ([], ['player'], 'player', 7):
+            response = self.client.post('/api/auth/login/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+        with mock.patch.object(LoginAccountThrottle, 'THROTTLE_RATES', {'login_account': '1/min'}):
+            cache.clear()
+            self.assertEqual(self.client.post('/api/auth/login/', [], format='json').status_code, 400)
+            self.assertEqual(self.client.post('/api/auth/login/', {'password': 'x'}, format='json').status_code, 429)
+
+
+# --- 12. Catalog Import ---
+class CatalogImportTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, content):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w', newline='') as fh:
+            fh.write(content)
+        return path
+
+    def import_catalog(self, *args, **options):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        call_command('import_catalog', *args, stdout=stdout, stderr=stderr, **options)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv_upserts_on_external_id(self):
+        path = self.write('catalog.csv', (
+            'id,title,developer,release_date,genre\n'
+            '1,Star Knight,Studio A,2020-05-01,RPG\n'
+            '2,Moon Racer,Studio B,1999,Racing\n'
+            ',No Id,,,\n'
+            '3,Bad Date,,2020-13-01,\n'
+            '1,Star Knight Remastered,Studio A,2021-01-01,RPG\n'
+        ))
+        _, errors = self.import_catalog(path, batch_size=10)
+        self.assertIn('record 3: missing external_id / id', errors)
+        self.assertIn('record 4: invalid release_date', errors)
+        # The later record of an id wins
+        self.assertEqual(
+            list(Game.objects.order_by('external_id').values_list('external_id', 'title', 'release_date')),
+            [('1', 'Star Knight Remastered', date(2021, 1, 1)), ('2', 'Moon Racer', date(1999, 1, 1))],
+        )
+
+        # Importing again updates in place; new games are searchable and have a trending row
+        self.import_catalog(self.write('update.csv', 'external_id,title\n2,Moon Racer Deluxe\n'))
+        game = Game.objects.get(external_id='2')
+        self.assertEqual((game.title, game.developer), ('Moon Racer Deluxe', ''))
+        self.assertEqual(Game.objects.count(), 2)
+        self.assertEqual(list(search.search_games(Game.objects.all(), 'deluxe')), [game])
+        self.assertTrue(hasattr(Game.objects.get(pk=game.pk), 'trending'))
+
+    def test_ndjson_with_workers(self):
+        lines = [json.dumps({'external_id': i, 'title': f'Game {i}', 'publisher': None}) for i in range(25)]
+        path = self.write('catalog.ndjson', '\n'.join([*lines, '', '[1, 2]']) + '\n')
+        output, errors = self.import_catalog(path, batch_size=4, workers=2, id_prefix='dump:')
+        self.assertIn('25 new games', output)
+        self.assertIn('record 27: expected a JSON object', errors)
+        self.assertEqual(Game.objects.filter(external_id__startswith='dump:').count(), 25)
+        self.assertEqual(Game.objects.get(external_id='dump:7').title, 'Game 7')
+
+    def test_resume_after_failure(self):
+        path = self.write('catalog.csv', 'id,title\n' + ''.join(f'{i},Game {i}\n' for i in range(10)))
+        upsert = ImportCatalog.upsert
+        calls = []
+
+        def failing_upsert(command, games):
+            calls.append(len(games))
+            if len(calls) == 3:
+                raise RuntimeError('connection lost')
+            return upsert(command, games)
+
+        with mock.patch.object(ImportCatalog, 'upsert', failing_upsert), self.assertRaises(RuntimeError):
+            self.import_catalog(path, batch_size=3)
+        self.assertEqual(Game.objects.count(), 6)
+
+        output, _ = self.import_catalog(path, batch_size=3, resume=True)
+        self.assertIn('resuming after record 6', output)
+        self.assertEqual(sorted(Game.objects.values_list('title', flat=True)), sorted(f'Game {i}' for i in range(10)))
+        # A completed import leaves no checkpoint behind
+        self.assertFalse(os.path.exists(f'{path}.import-state'))
+
+
+
+# --- 13. Facet Counts ---
+class FacetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for title, genre, developer, year in [
+            ('A', 'RPG', 'Studio A', 2020), ('B', 'RPG', 'Studio B', 2021),
+            ('C', 'Racing', 'Studio A', 2020), ('D', 'Racing', '', None),
+        ]:
+            Game.objects.create(
+                title=title, genre=genre, developer=developer,
+                release_date=date(year, 3, 1) if year else None,
+            )
+
+    def stored(self, facet):
+        return dict(GameFacetCount.objects.filter(facet=facet, count__gt=0).values_list('value', 'count'))
+
+    def facets(self, query=''):
+        response = self.assertWithinQueryBudget(f'/api/games/facets/{query}')
+        self.assertEqual(response.status_code, 200)
+        return {
+            facet: [(row['value'], row['count']) for row in rows]
+            for facet, rows in response.json()['data'].items()
+        }
+
+    def test_counts_follow_game_writes(self):
+        self.assertEqual(self.stored('genre'), {'rpg': 2, 'racing': 2})
+        self.assertEqual(self.stored('year'), {'2020': 2, '2021': 1})
+
+        game = Game.objects.get(title='D')
+        game.genre, game.release_date = 'RPG', date(2021, 1, 1)
+        game.save()
+        self.assertEqual(self.stored('genre'), {'rpg': 3, 'racing': 1})
+        self.assertEqual(self.stored('year'), {'2020': 2, '2021': 2})
+        # Saves that touch no facet field leave the counters alone
+        with CaptureQueriesContext(connection) as queries:
+            game.save(update_fields=['average_rating'])
+        self.assertEqual(len(queries), 1)
+
+        Game.objects.filter(genre='RPG').delete()
+        self.assertEqual(self.stored('genre'), {'racing': 1})
+        self.assertEqual(self.stored('developer'), {'Studio A': 1})
+
+        # Drift from writes that skip the signals is repaired by a rebuild
+        Game.objects.update(genre='Puzzle')
+        call_command('rebuild_facets', stdout=io.StringIO())
+        self.assertEqual(self.stored('genre'), {'puzzle': 1})
+
+    def test_genres_are_counted_case_insensitively(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Game.objects.create(title='E', genre='rpg')
+        self.assertEqual(self.stored('genre'), {'rpg': 3, 'racing': 2})
+        # Shown in the spelling they were first counted under
+        self.assertEqual(self.facets()['genre'], [('RPG', 3), ('Racing', 2)])
+        self.assertEqual(self.facets('?developer=Studio A')['genre'], [('RPG', 1), ('Racing', 1)])
+
+        # A rebuild labels every value with its most common spelling
+        with self.captureOnCommitCallbacks(execute=True):
+            for title in 'FG':
+                Game.objects.create(title=title, genre='rpg')
+            Game.objects.create(title='H', genre='racing')
+        call_command('rebuild_facets', stdout=io.StringIO())
+        self.assertEqual(self.stored('genre'), {'rpg': 5, 'racing': 3})
+        labels = dict(GameFacetCount.objects.filter(facet='genre').values_list('value', 'label'))
+        self.assertEqual(labels, {'rpg': 'rpg', 'racing': 'Racing'})
+
+    def test_saving_a_game_built_in_memory_applies_the_delta(self):
+        stored = Game.objects.get(title='D')
+        game = Game(pk=stored.pk, title='D', genre='RPG', developer='Studio B')
+        with CaptureQueriesContext(connection) as queries:
+            game.save()
+        # No rebuild: the stored row is read once and only the changed counters are touched
+        self.assertFalse(any('DELETE FROM "core_gamefacetcount"' in query['sql'] for query in queries))
+        self.assertEqual(self.stored('genre'), {'rpg': 3, 'racing': 1})
+        self.assertEqual(self.stored('developer'), {'Studio A': 2, 'Studio B': 2})
+
+    def test_endpoint(self):
+        self.assertEqual(self.facets(), {
+            'genre': [('RPG', 2), ('Racing', 2)],
+            'developer': [('Studio A', 2), ('Studio B', 1)],
+            'publisher': [],
+            'year': [('2020', 2), ('2021', 1)],
+        })
+        # A facet ignores its own filter, and is narrowed by the others
+        self.assertEqual(self.facets('?genre=rpg&facet_limit=1'), {
+            'genre': [('RPG', 2)],
+            'developer': [('Studio A', 1)],
+            'publisher': [],
+            'year': [('2020', 1)],
+        })
+        self.assertEqual(self.facets('?genre=racing&year=2020')['genre'], [('RPG', 1), ('Racing', 1)])
+        self.assertEqual(self.facets('?search=c')['developer'], [('Studio A', 1)])
+
+        # The game list takes the same filters
+        games = self.client.get('/api/games/?developer=Studio A&year=2020').json()['data']['results']
+        self.assertEqual(sorted(game['title'] for game in games), ['A', 'C'])
+        self.assertEqual(self.client.get('/api/games/facets/?year=soon').status_code, 400)
+
+
+# --- 14. Game Reviews ---
+class GameReviewTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.game = Game.objects.create(title='Reviewed')
+        self.users = User.objects.bulk_create(User(username=f'r{i}', email=f'r{i}@example.com') for i in range(5))
+        start = timezone.now() - timedelta(days=1)
+        self.reviews = []
+        with run_deferred_jobs(self):
+            for i, (user, rating) in enumerate(zip(self.users, [7, 9, 7, 3, 10])):
+                review = Review.objects.create(user=user, game=self.game, rating=rating)
+                # Distinct, increasing timestamps (auto_now_add is set on insert)
+                Review.objects.filter(pk=review.pk).update(created_at=start + timedelta(minutes=i))
+                self.reviews.append(review)
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def walk(self, ordering):
+        # Every page of the list, two reviews at a time
+        ratings, url = [], f'/api/games/{self.game.pk}/reviews/?page_size=2&ordering={ordering}'
+        while url:
+            page = self.assertWithinQueryBudget(url).json()['data']
+            ratings += [(review['username'], review['rating'], review['helpful_count']) for review in page['results']]
+            url = page['next']
+        return ratings
+
+    def test_keyset_orderings(self):
+        self.assertEqual([name for name, _, _ in self.walk('-created_at')], ['r4', 'r3', 'r2', 'r1', 'r0'])
+        # Ties on the ordering value are broken by id, in the same direction
+        self.assertEqual([name for name, _, _ in self.walk('-rating')], ['r4', 'r1', 'r2', 'r0', 'r3'])
+        self.assertEqual([name for name, _, _ in self.walk('rating')], ['r3', 'r0', 'r2', 'r1', 'r4'])
+
+    def test_helpful_votes(self):
+        first, second = self.reviews[0], self.reviews[1]
+        for voter in self.users[2:]:
+            self.authenticate(voter)
+            self.assertEqual(self.assertWithinQueryBudget(f'/api/reviews/{second.pk}/helpful/', method='post').status_code, 200)
+        # Voting twice counts once
+        self.assertWithinQueryBudget(f'/api/reviews/{second.pk}/helpful/', method='post')
+        self.assertWithinQueryBudget(f'/api/reviews/{first.pk}/helpful/', method='post')
+        self.assertEqual(ReviewVote.objects.count(), 4)
+
+        self.client.credentials()
+        self.assertEqual(self.walk('-helpful_count')[:3], [('r1', 9, 3), ('r0', 7, 1), ('r4', 10, 0)])
+
+        self.authenticate(self.users[4])
+        self.assertWithinQueryBudget(f'/api/reviews/{second.pk}/helpful/', method='delete')
+        self.assertWithinQueryBudget(f'/api/reviews/{second.pk}/helpful/', method='delete')
+        self.assertEqual(Review.objects.get(pk=second.pk).helpful_count, 2)
+
+        self.authenticate(self.users[0])
+        self.assertEqual(self.client.post(f'/api/reviews/{first.pk}/helpful/').status_code, 400)
+        # Deleting a review takes its votes along
+        first.delete()
+        self.assertFalse(ReviewVote.objects.filter(review_id=first.pk).exists())
+
+    def test_summary_from_stored_counters(self):
+        url = f'/api/games/{self.game.pk}/reviews/summary/'
+        with CaptureQueriesContext(connection) as queries:
+            summary = self.assertWithinQueryBudget(url).json()['data']
+        self.assertNotIn('core_review', ' '.join(query['sql'] for query in queries))
+        self.assertEqual((summary['review_count'], float(summary['average_rating'])), (5, 7.2))
+        self.assertEqual({rating: count for rating, count in summary['histogram'].items() if count}, {'3': 1, '7': 2, '9': 1, '10': 1})
+        self.assertEqual(self.client.get('/api/games/0/reviews/summary/').status_code, 404)
+
+
+# --- 15. Rating Aggregates ---
+@mock.patch.object(tasks, 'QUEUE_MODE', 'sync')
+class RatingAggregateTests(TestCase):
+    """Review writes move the stored aggregates by their delta (inline here; queued jobs: section 5)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.game, cls.other_game = Game.objects.bulk_create([Game(title='Rated'), Game(title='Other')])
+        cls.users = User.objects.bulk_create(User(username=f'rater{i}', email=f'rater{i}@example.com') for i in range(3))
+
+    def aggregates(self, game):
+        game.refresh_from_db()
+        histogram = {rating: count for rating, count in game.rating_histogram().items() if count}
+        return game.review_count, game.rating_sum, float(game.average_rating), histogram
+
+    def assertMatchesReviews(self, game):
+        # The stored aggregates equal a full recount
+        stored = self.aggregates(game)
+        game.update_average_rating()
+        self.assertEqual(self.aggregates(game), stored)
+
+    def test_create_update_move_delete(self):
+        reviews = [Review.objects.create(user=user, game=self.game, rating=rating) for user, rating in zip(self.users, [8, 6, 6])]
+        self.assertEqual(self.aggregates(self.game), (3, 20, 6.67, {6: 2, 8: 1}))
+
+        reviews[0].rating = 10
+        reviews[0].save()
+        self.assertEqual(self.aggregates(self.game), (3, 22, 7.33, {6: 2, 10: 1}))
+
+        reviews[1].game = self.other_game
+        reviews[1].save()
+        self.assertEqual(self.aggregates(self.game), (2, 16, 8.0, {6: 1, 10: 1}))
+        self.assertEqual(self.aggregates(self.other_game), (1, 6, 6.0, {6: 1}))
+
+        reviews[2].delete()
+        reviews[0].delete()
+        self.assertEqual(self.aggregates(self.game), (0, 0, 0.0, {}))
+        self.assertMatchesReviews(self.other_game)
+
+    def test_delta_is_one_update(self):
+        review = Review.objects.create(user=self.users[0], game=self.game, rating=7)
+        review = Review.objects.get(pk=review.pk)
+        review.rating = 9
+        with CaptureQueriesContext(connection) as queries:
+            review.save(update_fields=['rating'])
+        game_updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "core_game"')]
+        self.assertEqual(len(game_updates), 1)
+        self.assertNotIn('core_review', game_updates[0])
+        self.assertEqual(self.aggregates(self.game), (1, 9, 9.0, {9: 1}))
+
+    def test_partially_loaded_reviews(self):
+        review = Review.objects.create(user=self.users[0], game=self.game, rating=8)
+        # The rating is not loaded: a save is neither a new review nor a rating change
+        partial = Review.objects.only('comment').get(pk=review.pk)
+        partial.comment = 'Edited'
+        partial.save()
+        self.assertEqual(self.aggregates(self.game), (1, 8, 8.0, {8: 1}))
+
+        Review.objects.only('comment').get(pk=review.pk).delete()
+        self.assertEqual(self.aggregates(self.game), (0, 0, 0.0, {}))
+
+    def test_rebuild_command_repairs_drift(self):
+        for user, rating in zip(self.users, [4, 5, 9]):
+            Review.objects.create(user=user, game=self.game, rating=rating)
+        Game.objects.update(review_count=0, rating_sum=1, average_rating=0, rating_4_count=7)
+        call_command('rebuild_rating_aggregates', stdout=io.StringIO())
+        self.assertEqual(self.aggregates(self.game), (3, 18, 6.0, {4: 1, 5: 1, 9: 1}))
+        self.assertEqual(self.aggregates(self.other_game), (0, 0, 0.0, {}))
+
+    def test_migration_backfills_existing_games(self):
+        from django.apps import apps
+        migration = importlib.import_module('core.migrations.0004_game_rating_aggregates')
+        for user, rating in zip(self.users, [3, 10, 10]):
+            Review.objects.create(user=user, game=self.game, rating=rating)
+        # Columns as 0004 adds them: zero, whatever the reviews say
+        Game.objects.update(review_count=0, rating_sum=0, rating_3_count=0, rating_10_count=0)
+        migration.backfill_rating_aggregates(apps, None)
+        self.assertEqual(self.aggregates(self.game), (3, 23, 7.67, {3: 1, 10: 2}))
+        self.assertEqual(self.aggregates(self.other_game), (0, 0, 0.0, {}))
+
+
+# --- 16. Batched Prefetch ---
+class PrefetchTests(TestCase):
+    """GameSerializer renders the same data from the batched context as from its per-game queries."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username='collector', email='collector@example.com')
+        cls.games = Game.objects.bulk_create(Game(title=f'Prefetched {i}') for i in range(3))
+        reviewers = User.objects.bulk_create(User(username=f'critic{i}', email=f'critic{i}@example.com') for i in range(7))
+        start = timezone.now() - timedelta(days=30)
+        for i, reviewer in enumerate(reviewers):
+            Review.objects.create(user=reviewer, game=cls.games[0], rating=i + 1)
+        for i, review in enumerate(Review.objects.filter(game=cls.games[0]).order_by('pk')):
+            Review.objects.filter(pk=review.pk).update(created_at=start + timedelta(days=i))
+        Review.objects.create(user=reviewers[0], game=cls.games[1], rating=5)
+        LibraryEntry.objects.create(user=cls.user, game=cls.games[1], status='PLAYING')
+
+    def serialize(self, context):
+        request = mock.Mock(user=self.user)
+        return GameSerializer(self.games, many=True, context={'request': request, **context}).data
+
+    def test_batched_output_matches_per_game_queries(self):
+        context = prefetch_game_context(self.games, self.user)
+        self.assertEqual(self.serialize(context), self.serialize({}))
+
+    def test_newest_reviews_per_game(self):
+        context = prefetch_game_context(self.games, self.user)
+        reviews = context['recent_reviews_by_game']
+        self.assertEqual([review.rating for review in reviews[self.games[0].pk]], [7, 6, 5, 4, 3])
+        self.assertEqual(len(reviews[self.games[1].pk]), 1)
+        self.assertNotIn(self.games[2].pk, reviews)
+        self.assertEqual(list(context['library_entries_by_game']), [self.games[1].pk])
+
+    def test_two_queries_for_any_number_of_games(self):
+        for games in (self.games[:1], self.games):
+            with self.assertNumQueries(2):
+                prefetch_game_context(games, self.user)
+
+    def test_skips_data_of_fields_not_rendered(self):
+        with self.assertNumQueries(1):
+            context = prefetch_game_context(self.games, self.user, include_reviews=False)
+        self.assertEqual(context['recent_reviews_by_game'], {})
+        with self.assertNumQueries(1):
+            prefetch_game_context(self.games, AnonymousUser())
+        with self.assertNumQueries(0):
+            prefetch_game_context([], self.user)
+
+    def test_async_prefetch(self):
+        context = async_to_sync(aprefetch_game_context)(self.games, self.user)
+        self.assertEqual(self.serialize(context), self.serialize({}))
+
+
+# --- 17. Keyset Pagination ---
+class KeysetPaginationTests(TestCase):
+    """Cursor pages cover every row once, in order, whatever the ordering field."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Tied ratings and missing release dates, so ties and NULLs cross page boundaries
+        cls.games = Game.objects.bulk_create(
+            Game(
+                title=f'Paged {i:02d}',
+                average_rating=[5, 7, 7, 9][i % 4],
+                release_date=date(2000 + i % 3, 1, 1) if i % 5 else None,
+            )
+            for i in range(23)
+        )
+
+    def walk(self, query):
+        ids, url = [], f'/api/games/?page_size=4&fields=id&{query}'
+        while url:
+            data = self.client.get(url).json()['data']
+            self.assertLessEqual(len(data['results']), 4)
+            ids.extend(game['id'] for game in data['results'])
+            url = data['next']
+        return ids
+
+    def test_pages_follow_the_ordering(self):
+        by_pk = sorted(game.pk for game in self.games)
+        self.assertEqual(self.walk(''), by_pk)
+        expected = [game.pk for game in sorted(self.games, key=lambda game: (game.average_rating, game.pk), reverse=True)]
+        self.assertEqual(self.walk('ordering=-average_rating'), expected)
+        expected = [game.pk for game in sorted(self.games, key=lambda game: (game.title, game.pk))]
+        self.assertEqual(self.walk('ordering=title'), expected)
+
+    def test_nulls_sort_last_in_both_directions(self):
+        dated = [game for game in self.games if game.release_date]
+        undated = sorted(game.pk for game in self.games if not game.release_date)
+        ascending = [game.pk for game in sorted(dated, key=lambda game: (game.release_date, game.pk))]
+        self.assertEqual(self.walk('ordering=release_date'), ascending + undated)
+        descending = [game.pk for game in sorted(dated, key=lambda game: (game.release_date, game.pk), reverse=True)]
+        self.assertEqual(self.walk('ordering=-release_date'), descending + undated[::-1])
+
+    def test_bad_cursors_are_not_found(self):
+        def cursor(position):
+            return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+        for bad in ('%%%', 'bm90IGpzb24', cursor({'a': 1}), cursor(['x', 'y']), cursor(['not a date', 1])):
+            response = self.client.get('/api/games/', {'ordering': 'release_date', 'cursor': bad})
+            self.assertEqual(response.status_code, 404, bad)
+        response = self.client.get('/api/games/', {'ordering': '-average_rating', 'cursor': cursor(['NaN?', 1])})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/api/games/', {'ordering': 'release_date', 'cursor': cursor(['2001-01-01', 1])})
+        self.assertEqual(response.status_code, 200)
+
+
+# --- 18. Full-Text Search ---
+class SearchTests(TestCase):
+    """Every search term matches as a prefix of a title, developer or publisher word."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.zelda = Game.objects.create(title='The Legend of Zelda', developer='Nintendo', publisher='Nintendo')
+        cls.zeal = Game.objects.create(title='Zeal', developer='Zelig Studio', publisher='Indie Co')
+        cls.pokemon = Game.objects.create(title='Pokémon Legends', developer='Game Freak', publisher='Nintendo')
+
+    def search(self, query):
+        return list(search.search_games(Game.objects.all(), query).order_by('search_rank', 'pk'))
+
+    def test_prefix_terms(self):
+        self.assertEqual(self.search('zel'), [self.zelda, self.zeal])
+        self.assertEqual(self.search('leg zel'), [self.zelda])
+        self.assertEqual(self.search('NINT'), [self.zelda, self.pokemon])
+        self.assertEqual(self.search('pokemon'), [self.pokemon])
+        self.assertEqual(self.search('mario'), [])
+        self.assertEqual(self.search('  ?! '), [])
+
+    def test_title_matches_rank_first(self):
+        # "zel" is in the title of Zelda, but only in the developer of Zeal
+        self.assertEqual(self.search('zel')[0], self.zelda)
+
+    def test_index_follows_writes(self):
+        self.zeal.title = 'Mario Kart'
+        self.zeal.save()
+        self.assertEqual(self.search('mario'), [self.zeal])
+        self.assertEqual(self.search('zeal'), [])
+        self.pokemon.delete()
+        self.assertEqual(self.search('legends'), [])
+
+    def test_reindex_after_bulk_writes(self):
+        # update() skips the signals; the command rebuilds the index from the table
+        Game.objects.filter(pk=self.zeal.pk).update(title='Metroid')
+        self.assertEqual(self.search('metroid'), [])
+        call_command('reindex_search', stdout=io.StringIO())
+        self.assertEqual(self.search('metroid'), [self.zeal])
+
+    def test_list_endpoint_orders_by_relevance(self):
+        results = self.client.get('/api/games/', {'search': 'zel', 'fields': 'id'}).json()['data']['results']
+        self.assertEqual([game['id'] for game in results], [self.zelda.pk, self.zeal.pk])
+
+    def test_query_without_terms(self):
+        response = self.client.get('/api/games/', {'search': '?!'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['results'], [])
+
+
+# --- 19. Trending Scores ---
+class TrendingTests(TestCase):
+    """Incremental refreshes decay the stored scores and agree with a full recount."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.game, cls.other_game = Game.objects.bulk_create([Game(title='Hot'), Game(title='Cold')])
+        cls.users = User.objects.bulk_create(User(username=f'player{i}', email=f'player{i}@example.com') for i in range(4))
+        cls.start = timezone.now() - timedelta(days=30)
+
+    def add_event(self, user, game, at, review=False):
+        # Timestamps are set afterwards, as if the row had been written at `at`
+        if review:
+            Review.objects.create(user=user, game=game, rating=7)
+            Review.objects.filter(user=user, game=game).update(created_at=at)
+        else:
+            LibraryEntry.objects.create(user=user, game=game)
+            LibraryEntry.objects.filter(user=user, game=game).update(added_at=at)
+
+    def scores(self):
+        return dict(GameTrendingScore.objects.values_list('game_id', 'score'))
+
+    def test_scores_decay_by_half_life(self):
+        self.add_event(self.users[0], self.game, self.start, review=True)
+        self.add_event(self.users[1], self.game, self.start)
+        trending.refresh_trending(full=True, now=self.start)
+        self.assertAlmostEqual(self.scores()[self.game.pk], 3.0)
+        trending.refresh_trending(now=self.start + trending.HALF_LIFE)
+        self.assertAlmostEqual(self.scores()[self.game.pk], 1.5)
+        self.assertEqual(self.scores()[self.other_game.pk], 0.0)
+
+    def test_incremental_refreshes_match_a_full_refresh(self):
+        trending.refresh_trending(full=True, now=self.start)
+        for day, (user, game) in enumerate([(0, self.game), (1, self.game), (2, self.other_game), (3, self.game)]):
+            at = self.start + timedelta(days=day, hours=day)
+            self.add_event(self.users[user], game, at, review=day % 2 == 0)
+            trending.refresh_trending(now=at + timedelta(minutes=day))
+        end = self.start + timedelta(days=5)
+        trending.refresh_trending(now=end)
+        incremental = self.scores()
+        trending.refresh_trending(full=True, now=end)
+        for game_id, score in self.scores().items():
+            self.assertAlmostEqual(incremental[game_id], score)
+
+    def test_late_commits_are_counted_once(self):
+        now = self.start + timedelta(days=1)
+        trending.refresh_trending(full=True, now=now)
+        # Stamped before the refresh, committed after it
+        self.add_event(self.users[0], self.game, now - timedelta(seconds=30), review=True)
+        later = now + timedelta(minutes=1)
+        trending.refresh_trending(now=later)
+        score = self.scores()[self.game.pk]
+        self.assertAlmostEqual(score, 2.0 * trending.decay_factor(timedelta(seconds=90)))
+        trending.refresh_trending(now=later)
+        self.assertAlmostEqual(self.scores()[self.game.pk], score)
+
+        end = later + trending.SETTLE_WINDOW * 3
+        trending.refresh_trending(now=end)
+        incremental = self.scores()[self.game.pk]
+        trending.refresh_trending(full=True, now=end)
+        self.assertAlmostEqual(incremental, self.scores()[self.game.pk])
+
+    def test_trending_list_order(self):
+        self.add_event(self.users[0], self.other_game, timezone.now())
+        call_command('refresh_trending', stdout=io.StringIO())
+        results = self.client.get('/api/games/', {'trending': 'true', 'fields': 'id'}).json()['data']['results']
+        self.assertEqual([game['id'] for game in results], [self.other_game.pk, self.game.pk])
+
+
+# --- 20. Activity Feed Fan-out ---
+class FeedFanoutTests(TestCase):
+    """Activities are copied into followers' timelines, except for accounts with too many followers."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.other_reader, cls.author, cls.celebrity, cls.stranger = User.objects.bulk_create(
+            User(username=name, email=f'{name}@example.com')
+            for name in ('reader', 'other_reader', 'author', 'celebrity', 'stranger')
+        )
+        cls.game = Game.objects.create(title='Shared')
+        Follow.objects.bulk_create([
+            Follow(follower=cls.reader, following=cls.author),
+            Follow(follower=cls.other_reader, following=cls.author),
+            Follow(follower=cls.reader, following=cls.celebrity),
+            Follow(follower=cls.other_reader, following=cls.celebrity),
+        ])
+        cls.start = timezone.now() - timedelta(hours=1)
+
+    def publish(self, actor, minutes):
+        return feed.publish(actor.pk, FeedItem.Verbs.REVIEW, self.game.pk, self.start + timedelta(minutes=minutes), rating=8)
+
+    def read_all(self, user, limit):
+        items, cursor = [], None
+        while True:
+            page, next_cursor = feed.read_feed(user, cursor=cursor and feed.decode_cursor(cursor), limit=limit)
+            items.extend(page)
+            if next_cursor is None:
+                return items
+            cursor = next_cursor
+
+    def test_publish_fans_out_to_followers(self):
+        item = self.publish(self.author, 0)
+        self.assertTrue(item.fanned_out)
+        owners = set(TimelineEntry.objects.filter(item=item).values_list('owner_id', flat=True))
+        self.assertEqual(owners, {self.reader.pk, self.other_reader.pk})
+        self.assertEqual(feed.read_feed(self.stranger)[0], [])
+
+    @mock.patch.object(feed, 'FANOUT_MAX_FOLLOWERS', 1)
+    def test_large_accounts_are_merged_at_read_time(self):
+        pulled = self.publish(self.celebrity, 1)
+        self.assertFalse(pulled.fanned_out)
+        self.assertFalse(TimelineEntry.objects.filter(item=pulled).exists())
+
+        follower = User.objects.create(username='lone_follower', email='lone@example.com')
+        Follow.objects.create(follower=follower, following=self.stranger)
+        Follow.objects.create(follower=self.reader, following=self.stranger)
+        self.assertFalse(self.publish(self.stranger, 2).fanned_out)
+        pushed = [self.publish(self.author, minutes) for minutes in (0, 3)]
+        items, _ = feed.read_feed(self.reader)
+        self.assertEqual([item.actor_id for item in items], [self.author.pk, self.stranger.pk, self.celebrity.pk, self.author.pk])
+        self.assertEqual(items[0], pushed[1])
+
+    @mock.patch.object(feed, 'FANOUT_MAX_FOLLOWERS', 1)
+    def test_pages_cover_tied_timestamps_once(self):
+        # Pushed and pulled items share timestamps; the (created_at, id) cursor splits ties
+        published = [self.publish(actor, minutes) for minutes in (0, 0, 1) for actor in (self.author, self.celebrity)]
+        expected = sorted(published, key=lambda item: (item.created_at, item.pk), reverse=True)
+        for limit in (1, 2, 4, 6):
+            self.assertEqual(self.read_all(self.reader, limit), expected)
+
+    def test_follow_backfills_and_unfollow_prunes(self):
+        items = [self.publish(self.stranger, minutes) for minutes in range(3)]
+        follow = Follow.objects.create(follower=self.reader, following=self.stranger)
+        self.assertEqual(set(feed.read_feed(self.reader)[0]), set(items))
+        follow.delete()
+        self.assertEqual(feed.read_feed(self.reader)[0], [])
+
+    def test_feed_endpoint(self):
+        self.publish(self.author, 0)
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        data = client.get('/api/social/feed/').json()['data']
+        self.assertEqual(data['data'], [{
+            'type': 'REVIEW', 'user': 'author', 'game': 'Shared', 'rating': 8,
+            'timestamp': data['data'][0]['timestamp'],
+        }])
+        self.assertIsNone(data['next'])
+
+
+# --- 21. Pulled Activity Feed ---
+class PullFeedTests(TestCase):
+    """pull_feed() merges the source tables newest first and pages through ties without gaps."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reader, cls.friend, cls.other_friend = User.objects.bulk_create(
+            User(username=name, email=f'{name}@example.com') for name in ('puller', 'friend_a', 'friend_b')
+        )
+        Follow.objects.bulk_create([Follow(follower=cls.reader, following=cls.friend), Follow(follower=cls.reader, following=cls.other_friend)])
+        cls.games = Game.objects.bulk_create(Game(title=f'Pulled {i}') for i in range(4))
+        # Every source has rows on the same timestamps, e.g. a bulk import
+        cls.tie = timezone.now() - timedelta(hours=1)
+        for i, game in enumerate(cls.games):
+            for user in (cls.friend, cls.other_friend):
+                Review.objects.create(user=user, game=game, rating=5 + i)
+                LibraryEntry.objects.create(user=user, game=game)
+                ForumThread.objects.create(user=user, game=game, title=f'Thread {i}')
+        Review.objects.update(created_at=cls.tie)
+        LibraryEntry.objects.update(added_at=cls.tie)
+        ForumThread.objects.filter(game=cls.games[0]).update(created_at=cls.tie + timedelta(minutes=1))
+        ForumThread.objects.exclude(game=cls.games[0]).update(created_at=cls.tie)
+
+    def pull_all(self, limit):
+        items, before = [], None
+        while True:
+            page, next_before = feed.pull_feed(self.reader, before=before and feed.parse_before(before), limit=limit)
+            items.extend(page)
+            if next_before is None:
+                return items
+            before = next_before
+
+    def test_pages_cover_tied_rows_once(self):
+        everything, _ = feed.pull_feed(self.reader, limit=100)
+        self.assertEqual(len(everything), 24)
+        self.assertEqual([item['type'] for item in everything[:2]], ['THREAD', 'THREAD'])
+        timestamps = [item['timestamp'] for item in everything]
+        self.assertEqual(timestamps, sorted(timestamps, reverse=True))
+        for limit in (1, 5, 8, 24):
+            self.assertEqual(self.pull_all(limit), everything)
+
+    def test_async_pages_match(self):
+        page, next_before = feed.pull_feed(self.reader, limit=7)
+        self.assertEqual(async_to_sync(feed.apull_feed)(self.reader, limit=7), (page, next_before))
+        before = feed.parse_before(next_before)
+        self.assertEqual(async_to_sync(feed.apull_feed)(self.reader, before=before, limit=7), feed.pull_feed(self.reader, before=before, limit=7))
+
+    def test_timestamp_cursors_and_bad_cursors(self):
+        page, _ = feed.pull_feed(self.reader, before=feed.parse_before(self.tie.isoformat()), limit=100)
+        self.assertEqual(page, [])
+        page, _ = feed.pull_feed(self.reader, before=feed.parse_before((self.tie + timedelta(seconds=1)).isoformat()), limit=100)
+        self.assertEqual(len(page), 22)
+        for bad in ('yesterday', 'WyJ4Il0', '%%%'):
+            with self.assertRaises(NotFound):
+                feed.parse_before(bad)
+
+    def test_endpoint_in_pull_mode(self):
+        client = APIClient()
+        client.force_authenticate(self.reader)
+        with mock.patch.object(feed, 'FEED_READ_MODE', 'pull'):
+            first = client.get('/api/social/feed/', {'page_size': 20}).json()['data']
+            second = client.get('/api/social/feed/', {'page_size': 20, 'before': first['next_before']}).json()['data']
+        self.assertEqual(len(first['data']) + len(second['data']), 24)
+        self.assertIsNone(second['next_before'])
+
+
+# --- 22. Response Cache ---
+class ResponseCacheTests(TestCase):
+    """Anonymous game responses are served from the versioned cache and revalidate with ETags."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.game = Game.objects.create(title='Cached')
+        cls.user = User.objects.create(username='cache_reader', email='cache_reader@example.com')
+
+    def setUp(self):
+        cache.clear()
+        self.detail = f'/api/games/{self.game.pk}/'
+
+    def test_hits_skip_the_database(self):
+        first = self.client.get(self.detail)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_conditional_get_returns_304(self):
+        etag = self.client.get('/api/games/').headers['ETag']
+        self.assertEqual(self.client.get('/api/games/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get('/api/games/', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_writes_invalidate_cached_responses(self):
+        self.client.get(self.detail)
+        list_etag = self.client.get('/api/games/').headers['ETag']
+        self.game.title = 'Renamed'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.game.save()
+        self.assertEqual(self.client.get(self.detail).json()['data']['title'], 'Renamed')
+        response = self.client.get('/api/games/', HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_lost_version_counter_does_not_revive_old_entries(self):
+        self.client.get(self.detail)
+        Game.objects.filter(pk=self.game.pk).update(title='Changed behind the cache')
+        cache_module.invalidate_game(self.game.pk)
+        # The counter is evicted; reseeding must not land on a version with stored responses
+        cache.delete(cache_module.game_version_key(self.game.pk))
+        self.assertEqual(self.client.get(self.detail).json()['data']['title'], 'Changed behind the cache')
+
+    def test_authenticated_requests_are_not_cached(self):
+        self.client.get(self.detail)
+        client = APIClient()
+        client.force_authenticate(self.user)
+        Game.objects.filter(pk=self.game.pk).update(title='Fresh')
+        response = client.get(self.detail)
+        self.assertEqual(response.json()['data']['title'], 'Fresh')
+        self.assertNotIn('ETag', response.headers)
+
+
+# --- 23. JSON Renderers ---
+@skipIf(renderers.orjson is None, 'orjson not installed')
+class RendererTests(TestCase):
+    """The orjson fast path writes the same bytes as the stdlib encoder."""
+
+    DATA = [{
+        'id': 1,
+        'title': 'Pokémon ✨ "quoted"',
+        'average_rating': Decimal('7.50'),
+        'release_date': date(2020, 2, 29),
+        'created_at': datetime(2026, 10, 17, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        'tags': ['rpg', None, True, 1.5],
+        'nested': {'empty': {}, 'list': []},
+    }]
+
+    def render(self, fast, data, status=200, indent=None):
+        renderer = renderers.GameSpaceJSONRenderer()
+        renderer.fast = fast
+        media_type = f'application/json; indent={indent}' if indent else 'application/json'
+        return renderer.render(data, media_type, {'response': mock.Mock(status_code=status)})
+
+    def stream(self, fast, chunks, envelope=None):
+        renderer = renderers.GameSpaceJSONRenderer()
+        renderer.fast = fast
+        return b''.join(renderer.iter_render(chunks, envelope=envelope))
+
+    def test_fast_path_output_matches_stdlib(self):
+        for data, status in ((self.DATA, 200), ({'results': self.DATA, 'next': None}, 200), ({'detail': 'Nope'}, 404)):
+            self.assertEqual(self.render(True, data, status), self.render(False, data, status))
+        body = json.loads(self.render(True, self.DATA))
+        self.assertEqual(body['data'][0]['created_at'], '2026-10-17T12:30:15.123456Z')
+        self.assertEqual(body['data'][0]['average_rating'], 7.5)
+        self.assertFalse(json.loads(self.render(True, {'detail': 'Nope'}, 404))['success'])
+
+    def test_indented_output_uses_stdlib(self):
+        self.assertIn(b'\n  ', self.render(True, self.DATA, indent=2))
+
+    def test_streamed_output_matches_rendered(self):
+        chunks = [self.DATA, [], self.DATA]
+        for fast in (True, False):
+            self.assertEqual(self.stream(fast, chunks), self.render(fast, self.DATA * 2))
+            self.assertEqual(
+                self.stream(fast, chunks, envelope={'counts': {'all': 2}}),
+                self.render(fast, {'counts': {'all': 2}, 'results': self.DATA * 2}),
+            )
+            self.assertEqual(json.loads(self.stream(fast, [])), {'success': True, 'data': []})
+
+    def test_ndjson_lines(self):
+        lines = renderers.NDJSONRenderer().render(self.DATA * 2).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])['title'], self.DATA[0]['title'])
+
+
+# --- 24. Load Data Generator ---
+class LoadDataTests(TestCase):
+    """generate_load_data writes consistent, reproducible data and rebuilds what the signals would have."""
+
+    OPTIONS = {
+        'users': 30, 'games': 15, 'reviews': 120, 'library_entries': 150, 'follows': 90,
+        'threads': 8, 'posts': 40, 'days': 30, 'batch_size': 25,
+    }
+
+    def generate(self, **options):
+        call_command('generate_load_data', stdout=io.StringIO(), **{**self.OPTIONS, **options})
+
+    def test_generates_consistent_data(self):
+        self.generate()
+        self.assertEqual(User.objects.filter(username__startswith='load_').count(), 30)
+        self.assertEqual(Game.objects.count(), 15)
+        self.assertTrue(Review.objects.exists() and LibraryEntry.objects.exists() and Follow.objects.exists())
+        self.assertFalse(Follow.objects.filter(follower=F('following')).exists())
+
+        # Timestamps spread over the requested window instead of all being "now"
+        oldest = Review.objects.order_by('created_at').values_list('created_at', flat=True).first()
+        self.assertLess(oldest, timezone.now() - timedelta(days=1))
+        self.assertFalse(ForumPost.objects.filter(created_at__lt=F('thread__created_at')).exists())
+
+        # Derived data matches the rows
+        self.assertEqual(sum(Game.objects.values_list('review_count', flat=True)), Review.objects.count())
+        self.assertEqual(sum(ForumThread.objects.values_list('reply_count', flat=True)), ForumPost.objects.count())
+        self.assertEqual(sum(User.objects.values_list('follower_count', flat=True)), Follow.objects.count())
+        self.assertEqual(GameTrendingScore.objects.count(), 15)
+        self.assertTrue(search.search_games(Game.objects.all(), Game.objects.first().title.split()[0]).exists())
+
+    def test_reply_counters_are_refreshed_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.generate(threads=8, batch_size=3)
+        refreshes = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "core_forumthread"')]
+        self.assertEqual(len(refreshes), 3)
+        self.assertEqual(sum(ForumThread.objects.values_list('reply_count', flat=True)), ForumPost.objects.count())
+
+    def test_same_seed_same_shape(self):
+        self.generate(prefix='first', skip_derived=True)
+        first = (Review.objects.count(), LibraryEntry.objects.count(), Follow.objects.count())
+        self.generate(prefix='second', skip_derived=True)
+        self.assertEqual((Review.objects.count(), LibraryEntry.objects.count(), Follow.objects.count()), tuple(2 * n for n in first))
+
+    def test_existing_prefix_is_refused(self):
+        self.generate(users=2, games=2, reviews=2, library_entries=2, follows=2, threads=1, posts=1, skip_derived=True)
+        with self.assertRaisesMessage(CommandError, "Users prefixed 'load_' already exist"):
+            self.generate(skip_derived=True)
+
+    def test_power_law_draws_distinct_indexes(self):
+        popularity = PowerLaw(random.Random(1), 50, 1.1)
+        picked = popularity.distinct(10)
+        self.assertEqual(len(picked), 10)
+        self.assertTrue(all(0 <= index < 50 for index in picked))
+        # Capped at n; rejection sampling may stop short of it
+        self.assertLessEqual(len(popularity.distinct(500)), 50)
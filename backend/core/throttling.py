@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Token bucket over DRF's "N/period" rates (DEFAULT_THROTTLE_RATES): a
+    bucket holds up to N tokens and refills at N per period, so a burst of N
+    requests passes at once and the sustained rate is N per period. Buckets
+    live in the default cache: set CACHE_DIR to share them between server
+    processes, otherwise each process enforces its own.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        refill_rate = self.num_requests / self.duration
+        tokens, updated_at = self.cache.get(self.key, (self.num_requests, now))
+        tokens = min(self.num_requests, tokens + (now - updated_at) * refill_rate)
+        if tokens < 1:
+            self.wait_seconds = (1 - tokens) / refill_rate
+            return False
+        # Kept until a full bucket would be back, after which a missing key means the same
+        self.cache.set(self.key, (tokens - 1, now), self.duration)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPThrottle(TokenBucketThrottle):
+    """Buckets per client address (REST_FRAMEWORK NUM_PROXIES decides which one)."""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginIPThrottle(IPThrottle):
+    scope = 'login_ip'
+
+
+class RegisterIPThrottle(IPThrottle):
+    scope = 'register_ip'
+
+
+class LoginAccountThrottle(TokenBucketThrottle):
+    """Buckets per username tried, wherever the attempts come from."""
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        # The body may be any JSON value, e.g. an array
+        username = request.data.get('username') if isinstance(request.data, Mapping) else None
+        if not isinstance(username, str) or not username:
+            # No account to bucket by: count the attempt against the client address
+            return self.cache_format % {'scope': self.scope, 'ident': f'ip:{self.get_ident(request)}'}
+        return self.cache_format % {'scope': self.scope, 'ident': username.lower()}
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from . import cache
+from .models import Game, GameTrendingScore, LibraryEntry, Review
+
+# A library add or review counts half as much after every half-life
+HALF_LIFE = timedelta(days=getattr(settings, 'TRENDING_HALF_LIFE_DAYS', 7))
+# Events older than this many half-lives (< 0.1% weight) are ignored by full rebuilds
+LOOKBACK_HALF_LIVES = 10
+# Events this recent may still be joined by earlier-stamped ones committing late (see refresh_trending)
+SETTLE_WINDOW = timedelta(seconds=getattr(settings, 'TRENDING_SETTLE_SECONDS', 300))
+# Reviews signal more engagement than adding a game to a library
+EVENT_SOURCES = [
+    (LibraryEntry, 'added_at', getattr(settings, 'TRENDING_LIBRARY_WEIGHT', 1.0)),
+    (Review, 'created_at', getattr(settings, 'TRENDING_REVIEW_WEIGHT', 2.0)),
+]
+
+
+def decay_factor(elapsed):
+    return 0.5 ** (elapsed / HALF_LIFE)
+
+
+def _event_contributions(since, until, now):
+    # Weight of every event in (since, until], decayed to `now` and summed per game
+    totals = defaultdict(float)
+    for model, field, weight in EVENT_SOURCES:
+        events = model.objects.filter(**{f'{field}__gt': since, f'{field}__lte': until}).values_list('game_id', field)
+        for game_id, timestamp in events.iterator(chunk_size=2000):
+            totals[game_id] += weight * decay_factor(now - timestamp)
+    return totals
+
+
+def refresh_trending(full=False, now=None):
+    """
+    Brings every game's trending score up to `now`.
+
+    Exponential decay lets the refresh be incremental: all stored scores are
+    multiplied by the decay since the last refresh (one UPDATE in the
+    database), then only the events recorded since then are added. A full
+    refresh recomputes the scores from the lookback window instead.
+
+    Event timestamps are taken before their transactions commit, so an event
+    can become visible after a refresh has already passed its timestamp.
+    Only events older than SETTLE_WINDOW are folded into `settled_score`;
+    the newer ones are read again by every refresh and added on top, so a
+    late commit is counted by the next refresh, and exactly once.
+    Returns the number of games whose score received new events.
+    """
+    now = now or timezone.now()
+    settled_until = now - SETTLE_WINDOW
+    with transaction.atomic():
+        # Games created outside the ORM save path (bulk imports) have no row yet
+        missing = Game.objects.filter(trending__isnull=True).values_list('id', flat=True)
+        GameTrendingScore.objects.bulk_create(
+            (GameTrendingScore(game_id=game_id, score=0.0, refreshed_at=now) for game_id in missing.iterator()),
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+        # Rows created since the last refresh carry a later timestamp, so the oldest one marks it
+        last_refresh = GameTrendingScore.objects.aggregate(last=Min('refreshed_at'))['last']
+        if full or last_refresh is None or last_refresh >= now:
+            since = now - HALF_LIFE * LOOKBACK_HALF_LIVES
+            GameTrendingScore.objects.update(settled_score=0.0, refreshed_at=now)
+        else:
+            since = last_refresh - SETTLE_WINDOW
+            GameTrendingScore.objects.update(
+                settled_score=F('settled_score') * decay_factor(now - last_refresh), refreshed_at=now,
+            )
+
+        settled = _event_contributions(since, settled_until, now)
+        for game_id, delta in settled.items():
+            GameTrendingScore.objects.filter(pk=game_id).update(settled_score=F('settled_score') + delta)
+
+        # The unsettled events are recounted every time, so running this again changes nothing
+        GameTrendingScore.objects.update(score=F('settled_score'))
+        unsettled = _event_contributions(max(since, settled_until), now, now)
+        for game_id, delta in unsettled.items():
+            GameTrendingScore.objects.filter(pk=game_id).update(score=F('settled_score') + delta)
+
+    # The trending order may have changed
+    cache.invalidate_game_lists()
+    return len(settled.keys() | unsettled.keys())
@@ -1,33 +1,58 @@
+from django.conf import settings
 from django.urls import path
-from rest_framework_simplejwt.views import TokenRefreshView
 from .views import (
     RegisterView, 
-    CustomTokenObtainPairView, 
+    CustomTokenObtainPairView, CustomTokenRefreshView, RevokeTokensView,
     UserProfileView,
     # Add these imports if you are in Phase 3 or later:
-    GameListView, GameDetailView, LibraryEntryCreateView, LibraryEntryDetailView, 
-    ReviewCreateView, FollowUserView, UnfollowUserView, ActivityFeedView, ForumThreadListCreateView
+    GameListView, GameFacetsView, GameDetailView, LibraryEntryCreateView, LibraryEntryDetailView, 
+    LibraryImportView, LibraryExportView,
+    ReviewCreateView, GameReviewListView, GameReviewSummaryView, ReviewHelpfulView, FollowUserView, UnfollowUserView, FollowListView, FollowingListView,
+    MutualFollowsView, FollowSuggestionsView, SimilarGamesView, RecommendationsView, ActivityFeedView, ForumThreadListCreateView, ForumPostListCreateView,
+    MetricsView,
 )
 
+# Under ASGI (game_space/asgi.py sets ASYNC_VIEWS) the read-heavy endpoints are served by async views
+if settings.ASYNC_VIEWS:
+    from .async_views import AsyncActivityFeedView, AsyncGameDetailView, AsyncGameListView
+    GameListView, GameDetailView, ActivityFeedView = AsyncGameListView, AsyncGameDetailView, AsyncActivityFeedView
+
 urlpatterns = [
     # Auth Endpoints (Note the trailing slash '/')
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', CustomTokenObtainPairView.as_view(), name='login'),
-    path('auth/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/refresh/', CustomTokenRefreshView.as_view(), name='token_refresh'),
+    path('auth/revoke/', RevokeTokensView.as_view(), name='token-revoke'),
     path('users/me/', UserProfileView.as_view(), name='user-profile'),
+    path('users/me/recommendations/', RecommendationsView.as_view(), name='user-recommendations'),
 
     # Game & Library Endpoints
     path('games/', GameListView.as_view(), name='game-list'),
+    path('games/facets/', GameFacetsView.as_view(), name='game-facets'),
     path('games/<int:pk>/', GameDetailView.as_view(), name='game-detail'), # If you have a detail view logic reusing list view or separate
+    path('games/<int:pk>/similar/', SimilarGamesView.as_view(), name='game-similar'),
     path('library/', LibraryEntryCreateView.as_view(), name='library-list-create'),
+    path('library/import/', LibraryImportView.as_view(), name='library-import'),
+    path('library/export/', LibraryExportView.as_view(), name='library-export'),
     path('library/<int:pk>/', LibraryEntryDetailView.as_view(), name='library-detail'),
 
     # Review & Social Endpoints
     path('reviews/', ReviewCreateView.as_view(), name='create-review'),
+    path('reviews/<int:pk>/helpful/', ReviewHelpfulView.as_view(), name='review-helpful'),
+    path('games/<int:pk>/reviews/', GameReviewListView.as_view(), name='game-reviews'),
+    path('games/<int:pk>/reviews/summary/', GameReviewSummaryView.as_view(), name='game-review-summary'),
     path('users/<int:user_id>/follow/', FollowUserView.as_view(), name='follow-user'),
     path('users/<int:user_id>/unfollow/', UnfollowUserView.as_view(), name='unfollow-user'),
+    path('users/<int:user_id>/followers/', FollowListView.as_view(), name='user-followers'),
+    path('users/<int:user_id>/following/', FollowingListView.as_view(), name='user-following'),
     path('social/feed/', ActivityFeedView.as_view(), name='activity-feed'),
+    path('social/mutuals/', MutualFollowsView.as_view(), name='social-mutuals'),
+    path('social/suggestions/', FollowSuggestionsView.as_view(), name='social-suggestions'),
     path('games/<int:game_id>/threads/', ForumThreadListCreateView.as_view(), name='forum-threads'),
+    path('threads/<int:thread_id>/posts/', ForumPostListCreateView.as_view(), name='forum-posts'),
+
+    # Instrumentation (admin only)
+    path('_metrics', MetricsView.as_view(), name='metrics'),
 ]
 
 
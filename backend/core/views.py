@@ -1,20 +1,42 @@
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.contrib.auth import get_user_model
 from .serializers import (
     UserRegistrationSerializer, 
     CustomTokenObtainPairSerializer,
+    CustomTokenRefreshSerializer,
     UserProfileSerializer
 )
-from django.db.models import Count, Q
+from django.db.models import F
 from .models import Game, LibraryEntry
-from .serializers import GameSerializer, LibraryEntrySerializer
+from .serializers import GameSerializer, LibraryEntryListSerializer, LibraryEntrySerializer
 from itertools import chain
 from operator import attrgetter
-from .models import Follow, ForumThread
-from .serializers import ForumThreadSerializer
+from .models import Follow, ForumPost, ForumThread
+from .serializers import (
+    FollowerSerializer, FollowingSerializer, ForumPostSerializer, ForumThreadSerializer, SocialUserSerializer,
+    LibraryGameSerializer, RecommendedGameSerializer, SimilarGameSerializer,
+)
+from .prefetch import GamePrefetchMixin
+from .pagination import ForumPagination, GameCursorPagination, ReviewPagination, SocialPagination
+from rest_framework.utils.urls import replace_query_param
+from bisect import bisect_right
+from .search import search_games
+from . import authentication, facets, feed
+from .cache import CachedGameDetailMixin, CachedResponseMixin
+from .renderers import CSVRenderer, GameSpaceJSONRenderer, NDJSONRenderer
+from .parsers import CSVParser, NDJSONParser
+from rest_framework.parsers import JSONParser
+from rest_framework.views import APIView
+from rest_framework.exceptions import ValidationError
+from . import library, recommendations, social
+from django.http import StreamingHttpResponse
+from .permissions import IsAdmin
+from .throttling import LoginAccountThrottle, LoginIPThrottle, RegisterIPThrottle
+from .profiling import registry
+from django.utils.functional import classproperty
 
 User = get_user_model()
 
@@ -23,10 +45,26 @@ class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     permission_classes = (AllowAny,)
     serializer_class = UserRegistrationSerializer
+    # Checked before the password is hashed (core/passwords.py)
+    throttle_classes = (RegisterIPThrottle,)
 
 # --- 2. Login View ---
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_classes = (LoginIPThrottle, LoginAccountThrottle)
+
+
+class CustomTokenRefreshView(TokenRefreshView):
+    serializer_class = CustomTokenRefreshSerializer
+
+
+class RevokeTokensView(APIView):
+    """Log out everywhere: every token issued to the user so far stops working."""
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request):
+        authentication.revoke_tokens(request.user)
+        return Response({"success": True, "message": "Logged out on all devices."})
 
 # --- 3. User Profile View ---
 class UserProfileView(generics.RetrieveUpdateAPIView):
@@ -34,65 +72,264 @@ class UserProfileView(generics.RetrieveUpdateAPIView):
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        # Returns the currently logged-in user
-        return self.request.user
+        # request.user only holds the token's fields (core/authentication.py): read the whole row
+        return User.objects.get(pk=self.request.user.pk)
     
 
-class GameListView(generics.ListAPIView):
-    serializer_class = GameSerializer
-    permission_classes = (AllowAny,) # Publicly accessible
+class GameListQueryMixin:
+    """
+    Query-string handling of the game list (search, trending, facet filters,
+    ordering, field selection), shared by GameListView, its async version
+    (core/async_views.py) and GameFacetsView. Only reads self.request; never queries.
+    """
+    ORDERING_FIELDS = ['release_date', 'average_rating', 'title']
 
     def get_queryset(self):
+        queryset = self.get_filtered_queryset()
+
+        # D. Compact mode never reads the description column
+        fields = self.get_serializer_fields()
+        if fields is not None and 'description' not in fields:
+            queryset = queryset.defer('description')
+
+        return queryset
+
+    def get_filtered_queryset(self, skip_facet=None):
+        # The games the query string selects, leaving out the filter on `skip_facet`
         queryset = Game.objects.all()
-        
-        # A. Filtering (Genre/Platform would strictly need fields in Model, 
-        # but here we search text fields for simplicity based on your doc)
-        search_query = self.request.query_params.get('search', None)
+
+        # A. Full-text search over title/developer/publisher (see core/search.py),
+        # prefix-matched and annotated with a relevance rank
+        search_query = self.get_search_query()
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | 
-                Q(developer__icontains=search_query) |
-                Q(publisher__icontains=search_query)
-            )
+            queryset = search_games(queryset, search_query)
 
         # B. Trending Logic (Wireframe Requirement)
-        # Sort by number of library entries (popularity)
-        trending = self.request.query_params.get('trending', None)
-        if trending == 'true':
-            queryset = queryset.annotate(
-                popularity=Count('library_entries')
-            ).order_by('-popularity')
-
-        # C. Filter by Genre
-        genre = self.request.query_params.get('genre', None)
-        if genre:
-            queryset = queryset.filter(genre__iexact=genre)
-
-        # D. Ordering
-        ordering = self.request.query_params.get('ordering', None)
-        if ordering in ['release_date', '-release_date', 'average_rating', '-average_rating', 'title', '-title']:
-            queryset = queryset.order_by(ordering)
-            
-        return queryset
+        # Popularity = materialized, time-decayed score (core/trending.py),
+        # read through the trending score index; sorted by in get_keyset_ordering()
+        if self.is_trending():
+            queryset = queryset.filter(trending__isnull=False).annotate(popularity=F('trending__score'))
+
+        # C. Facet filters: genre (case-insensitive, written as LOWER(genre) = ... to use
+        # game_genre_lower_idx), developer, publisher and release year (core/facets.py)
+        return facets.filter_games(queryset, self.get_facet_filters(), skip=skip_facet)
+
+    def get_facet_filters(self):
+        params = self.request.query_params
+        filters = {facet: params[facet].strip() for facet in facets.FACETS if params.get(facet, '').strip()}
+        if 'year' in filters and not filters['year'].isdigit():
+            raise ValidationError({'year': 'Expected a year, e.g. 2015.'})
+        return filters
 
-class GameDetailView(generics.RetrieveAPIView):
+    def is_filtered(self):
+        return bool(self.get_search_query() or self.is_trending() or self.get_facet_filters())
+
+    def get_search_query(self):
+        return self.request.query_params.get('search', '').strip()
+
+    def is_trending(self):
+        return self.request.query_params.get('trending', None) == 'true'
+
+    def get_keyset_ordering(self):
+        # Explicit ordering wins over trending, as before; ties are broken by id
+        ordering = self.request.query_params.get('ordering', None)
+        if ordering and ordering.lstrip('-') in self.ORDERING_FIELDS:
+            return ordering
+        if self.is_trending():
+            return '-popularity'
+        if self.get_search_query():
+            # Most relevant first
+            return 'search_rank'
+        return 'id'
+
+    def get_keyset_tiebreak(self):
+        # Same value as the game id, but lets trending pages walk the score index
+        if self.get_keyset_ordering() == '-popularity':
+            return 'trending__game'
+        return 'pk'
+
+    def get_serializer_fields(self):
+        # ?compact=true drops the heavy fields, ?fields=a,b,c picks fields explicitly
+        params = self.request.query_params
+        all_fields = list(GameSerializer().fields)
+        if params.get('fields'):
+            requested = [name.strip() for name in params['fields'].split(',')]
+            return [name for name in all_fields if name in requested] or None
+        if params.get('compact') == 'true':
+            return [name for name in all_fields if name not in GameSerializer.COMPACT_EXCLUDE]
+        return None
+
+
+class GameListView(CachedResponseMixin, GameListQueryMixin, GamePrefetchMixin, generics.ListAPIView):
+    serializer_class = GameSerializer
+    permission_classes = (AllowAny,) # Publicly accessible
+    # Cursor pagination keeps every page bounded (?page_size=, max 100)
+    pagination_class = GameCursorPagination
+    # JWT user + page + library entries + recent reviews, whatever the page size (core/middleware.py)
+    query_budget = 4
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_serializer_fields()
+        if fields is not None:
+            kwargs['fields'] = fields
+        return super().get_serializer(*args, **kwargs)
+
+class GameFacetsView(CachedResponseMixin, GameListQueryMixin, generics.RetrieveAPIView):
+    """
+    Games per genre, developer, publisher and release year under the list's
+    filters (same query string as GameListView), top ?facet_limit= values of
+    each (default 20, max 100). Unfiltered counts come from the stored table.
+    """
+    permission_classes = (AllowAny,)
+    # JWT user (when sent) + one query for every facet
+    query_budget = 2
+
+    def retrieve(self, request, *args, **kwargs):
+        limit = facets.parse_limit(request.query_params.get('facet_limit'))
+        if not self.is_filtered():
+            return Response(facets.stored_facets(limit))
+        return Response(facets.count_facets(
+            {facet: self.get_filtered_queryset(skip_facet=facet) for facet in facets.FACETS}, limit,
+        ))
+
+class GameDetailView(CachedGameDetailMixin, generics.RetrieveAPIView):
     queryset = Game.objects.all()
     serializer_class = GameSerializer
     permission_classes = (AllowAny,)
+    query_budget = 4
+
+# --- 4b. Recommendations ---
+# Served from the neighbours stored by `manage.py build_recommendations` (core/recommendations.py)
+class SimilarGamesView(generics.ListAPIView):
+    serializer_class = SimilarGameSerializer
+    permission_classes = (AllowAny,)
+    pagination_class = None
+    # JWT user (when sent) + the game's neighbours, joined to the games (similarity_game_score_idx)
+    query_budget = 2
+
+    def get_queryset(self):
+        limit = min(feed.parse_page_size(self.request.query_params.get('page_size')), recommendations.TOP_K)
+        return recommendations.similar_games(self.kwargs['pk'], limit).only(*SimilarGameSerializer.only_fields())
+
+
+class RecommendationsView(generics.ListAPIView):
+    serializer_class = RecommendedGameSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = None
+    # JWT user + one query over the user's library and its games' neighbours
+    query_budget = 2
+
+    def get_queryset(self):
+        limit = feed.parse_page_size(self.request.query_params.get('page_size'))
+        return recommendations.recommend(self.request.user, limit).only(*LibraryGameSerializer.Meta.fields)
 
 # --- 5. Library Management View (Page 16) ---
+# GET streams the slim library listing (LibraryEntryListSerializer) with per-status counts;
+# ?status=PLAYING,COMPLETED narrows the entries (the counts always cover the whole library).
 class LibraryEntryCreateView(generics.ListCreateAPIView):
     serializer_class = LibraryEntrySerializer
     permission_classes = (IsAuthenticated,)
+    # JWT user + entries + status counts, whatever the library size
+    query_budget = {'GET': 3}
 
     def get_queryset(self):
-        # Return only the current user's library
-        return LibraryEntry.objects.filter(user=self.request.user)
+        # Return only the current user's library, newest first (library_user_recent_idx)
+        queryset = (
+            LibraryEntry.objects.filter(user=self.request.user)
+            .select_related('game')
+            .only(*LibraryEntryListSerializer.only_fields())
+            .order_by('-added_at', '-id')
+        )
+        statuses = self.get_status_filter()
+        if statuses:
+            queryset = queryset.filter(status__in=statuses)
+        return queryset
+
+    def get_status_filter(self):
+        value = self.request.query_params.get('status', '')
+        statuses = [status.strip().upper() for status in value.split(',') if status.strip()]
+        invalid = [status for status in statuses if status not in LibraryEntry.Status.values]
+        if invalid:
+            raise ValidationError({'status': f'Invalid status: {", ".join(invalid)}.'})
+        return statuses
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return LibraryEntryListSerializer
+        # Creating still answers with the full nested game
+        return LibraryEntrySerializer
+
+    # Entries serialized and sent per chunk when streaming the library
+    stream_chunk_size = 200
+
+    def list(self, request, *args, **kwargs):
+        # Libraries are unpaginated, so the JSON response is streamed chunk by chunk
+        queryset = self.filter_queryset(self.get_queryset())
+        counts = library.status_counts(request.user)
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, GameSpaceJSONRenderer):
+            return Response({'counts': counts, 'results': self.get_serializer(queryset, many=True).data})
+        return StreamingHttpResponse(
+            renderer.iter_render(self.iter_chunks(queryset), envelope={'counts': counts}),
+            content_type='application/json',
+        )
+
+    def iter_chunks(self, queryset):
+        chunk = []
+        for entry in queryset.iterator(chunk_size=self.stream_chunk_size):
+            chunk.append(entry)
+            if len(chunk) == self.stream_chunk_size:
+                yield self.get_serializer(chunk, many=True).data
+                chunk = []
+        if chunk:
+            yield self.get_serializer(chunk, many=True).data
 
     def perform_create(self, serializer):
         # Automatically associate the entry with the logged-in user
         serializer.save(user=self.request.user)
 
+# --- 5b. Library Import / Export ---
+# POST a JSON array of {game, status}, or stream NDJSON (application/x-ndjson) / CSV (text/csv) with the same fields.
+class LibraryImportView(APIView):
+    permission_classes = (IsAuthenticated,)
+    parser_classes = (JSONParser, NDJSONParser, CSVParser)
+    # JWT user + BEGIN + per batch of 200 items: game lookup, library lookup, INSERT, re-read (core/library.py)
+    query_budget = 6
+
+    def post(self, request):
+        rows = request.data
+        if isinstance(rows, dict):
+            rows = rows.get('entries')
+        if rows is None or isinstance(rows, (dict, str)):
+            return Response(
+                {"error": "Expected a list of {game, status} items."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            results = library.import_entries(request.user, rows)
+        except library.ImportTooLarge as e:
+            return Response({"error": str(e)}, status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        return Response({**library.summarize(results), "results": results})
+
+
+# Streams the user's library; ?format=ndjson (default), csv or json
+class LibraryExportView(APIView):
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = (NDJSONRenderer, CSVRenderer, GameSpaceJSONRenderer)
+    query_budget = 2
+
+    def get(self, request):
+        renderer = request.accepted_renderer
+        chunks = library.iter_export(request.user)
+        if isinstance(renderer, CSVRenderer):
+            body = renderer.iter_render(chunks, header=library.EXPORT_FIELDS)
+        else:
+            body = renderer.iter_render(chunks)
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+        response = StreamingHttpResponse(body, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="library.{renderer.format}"'
+        return response
+
+
 # --- 6. Library Detail View (Update/Delete) ---
 class LibraryEntryDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = LibraryEntrySerializer
@@ -106,7 +343,8 @@ from django.db import transaction
 from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView # Using APIView for custom transaction logic
 from rest_framework import status
-from .models import Review
+from .models import Review, ReviewVote
+from .serializers import ReviewListSerializer, ReviewSummarySerializer
 
 # ... existing views ...
 
@@ -123,6 +361,13 @@ class ReviewCreateView(APIView):
         if not game_id:
             return Response({"error": "Game ID is required"}, status=status.HTTP_400_BAD_REQUEST)
 
+        try:
+            rating = int(data.get('rating'))
+        except (TypeError, ValueError):
+            return Response({"error": "Rating must be a number between 1 and 10."}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= rating <= 10:
+            return Response({"error": "Rating must be a number between 1 and 10."}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             # 2. ATOMIC BLOCK (The Core Logic)
             with transaction.atomic():
@@ -130,18 +375,17 @@ class ReviewCreateView(APIView):
                 if Review.objects.filter(user=user, game_id=game_id).exists():
                     raise ValueError("You have already reviewed this game.")
 
-                # Create the review
+                # Create the review.
+                # 3. The game's rating aggregates, the followers' feeds and the
+                # cached responses are updated after commit by background jobs
+                # (core/signals.py, core/tasks.py), off this request.
                 review = Review.objects.create(
                     user=user,
                     game_id=game_id,
-                    rating=data['rating'],
+                    rating=rating,
                     comment=data.get('comment', '')
                 )
 
-                # 3. Trigger Game Update
-                game = Game.objects.get(id=game_id)
-                game.update_average_rating()
-
                 return Response({
                     "success": True, 
                     "data": {"id": review.id, "rating": review.rating}
@@ -151,100 +395,245 @@ class ReviewCreateView(APIView):
             return Response({"success": False, "error": str(e)}, status=status.HTTP_409_CONFLICT)
         except Exception as e:
             return Response({"success": False, "error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
-        
+
+
+# --- 7b. Game Reviews ---
+class GameReviewListView(generics.ListAPIView):
+    """
+    A game's reviews, newest first. ?ordering= also takes created_at, -rating,
+    rating and -helpful_count ("most helpful first").
+    """
+    serializer_class = ReviewListSerializer
+    permission_classes = (AllowAny,)
+    pagination_class = ReviewPagination
+    # JWT user (when sent) + one page (username joined in)
+    query_budget = 2
+    ORDERING_FIELDS = ['created_at', 'rating', 'helpful_count']
+
+    def get_queryset(self):
+        return (
+            Review.objects.filter(game_id=self.kwargs['pk'])
+            .select_related('user')
+            .only(*ReviewListSerializer.only_fields())
+        )
+
+    def get_keyset_ordering(self):
+        # Every ordering walks one of the game's review indexes (Review.Meta), however many reviews it has
+        ordering = self.request.query_params.get('ordering', '')
+        if ordering.lstrip('-') in self.ORDERING_FIELDS:
+            return ordering
+        return '-created_at'
+
+
+class GameReviewSummaryView(CachedGameDetailMixin, generics.RetrieveAPIView):
+    """Review count, average and rating histogram of a game, from its stored counters."""
+    queryset = Game.objects.only(*ReviewSummarySerializer.only_fields())
+    serializer_class = ReviewSummarySerializer
+    permission_classes = (AllowAny,)
+    # JWT user (when sent) + the game row
+    query_budget = 2
+
+
+class ReviewHelpfulView(APIView):
+    """POST marks a review as helpful, DELETE takes the vote back; both are idempotent."""
+    permission_classes = (IsAuthenticated,)
+    # POST: user + review + vote lookup, then BEGIN / INSERT / counter UPDATE / COMMIT;
+    # DELETE: user + vote lookup, then BEGIN / DELETE / counter UPDATE / COMMIT
+    query_budget = {'POST': 7, 'DELETE': 6}
+
+    def post(self, request, pk):
+        review = get_object_or_404(Review.objects.only('id', 'user_id'), pk=pk)
+        if review.user_id == request.user.pk:
+            return Response({"error": "You cannot vote on your own review."}, status=status.HTTP_400_BAD_REQUEST)
+        # Review.helpful_count is bumped by core/signals.py
+        _, created = ReviewVote.objects.get_or_create(review=review, user=request.user)
+        message = "Marked as helpful." if created else "You already marked this review as helpful."
+        return Response({"success": True, "message": message})
+
+    def delete(self, request, pk):
+        deleted, _ = ReviewVote.objects.filter(review_id=pk, user=request.user).delete()
+        message = "Vote removed." if deleted else "You had not marked this review as helpful."
+        return Response({"success": True, "message": message})
+
 
 # --- 8. Follow User View (Page 17) ---
 class FollowUserView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def post(self, request, user_id):
-        # 1. Prevent Self-Follow (Sad Path Page 17)
-        if request.user.id == user_id:
-            return Response(
-                {"error": "You cannot follow yourself."}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # 2. Check if already following
-        if Follow.objects.filter(follower=request.user, following_id=user_id).exists():
+        # Idempotent: following someone twice is not an error (core/social.py)
+        try:
+            created = social.follow(request.user.id, user_id)
+        except social.SelfFollow:
+            # Sad Path Page 17
             return Response(
-                {"error": "You are already following this user."},
+                {"error": "You cannot follow yourself."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        # 3. Create Follow
-        try:
-            Follow.objects.create(follower=request.user, following_id=user_id)
-            return Response({"success": True, "message": "Followed successfully."})
-        except Exception as e:
+        except social.UserNotFound:
             return Response({"error": "User not found or invalid ID."}, status=status.HTTP_404_NOT_FOUND)
+        message = "Followed successfully." if created else "You are already following this user."
+        return Response({"success": True, "message": message})
 
 class UnfollowUserView(APIView):
     permission_classes = (IsAuthenticated,)
 
     def delete(self, request, user_id):
-        deleted_count, _ = Follow.objects.filter(
-            follower=request.user, 
-            following_id=user_id
-        ).delete()
-        
-        if deleted_count > 0:
+        if social.unfollow(request.user.id, user_id):
             return Response({"success": True, "message": "Unfollowed successfully."})
-        return Response({"error": "You were not following this user."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({"success": True, "message": "You were not following this user."})
 
 
-# --- 9. Activity Feed View (Page 17 Complex Query) ---
-class ActivityFeedView(APIView):
+class FollowListView(generics.ListAPIView):
+    """A user's followers (or, with FollowingListView, the users they follow), most recent first."""
+    serializer_class = FollowerSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = SocialPagination
+    # JWT user + one page, the other user joined in
+    query_budget = 2
+    # Follow column matching the user in the URL
+    lookup_field = 'following'
 
-    def get(self, request):
-        # 1. Get list of user IDs I am following
-        following_ids = request.user.following.values_list('following_id', flat=True)
+    def get_queryset(self):
+        serializer_class = self.get_serializer_class()
+        return (
+            Follow.objects.filter(**{self.lookup_field: self.kwargs['user_id']})
+            .select_related(serializer_class.user_field)
+            .only(*serializer_class.only_fields())
+        )
 
-        # 2. Fetch recent Reviews from these users
-        recent_reviews = Review.objects.filter(user_id__in=following_ids).select_related('user', 'game').order_by('-created_at')[:10]
+    def get_keyset_ordering(self):
+        # Served by follow_followers_recent_idx / follow_following_recent_idx
+        return '-created_at'
 
-        # 3. Fetch recent Library Updates from these users
-        recent_library = LibraryEntry.objects.filter(user_id__in=following_ids).select_related('user', 'game').order_by('-added_at')[:10]
 
-        # 4. Combine and Sort in Python
-        # We transform them into a standardized dictionary format
-        feed_data = []
+class FollowingListView(FollowListView):
+    serializer_class = FollowingSerializer
+    lookup_field = 'follower'
 
-        for r in recent_reviews:
-            feed_data.append({
-                "type": "REVIEW",
-                "user": r.user.username,
-                "game": r.game.title,
-                "rating": r.rating,
-                "timestamp": r.created_at
-            })
 
-        for l in recent_library:
-            feed_data.append({
-                "type": "STATUS",
-                "user": l.user.username,
-                "game": l.game.title,
-                "status": l.status,
-                "timestamp": l.added_at
-            })
+class MutualFollowsView(APIView):
+    """Users the current user follows who follow them back, by id (?after=<id> for the next page)."""
+    permission_classes = (IsAuthenticated,)
+    # JWT user + both follow sets (when not cached) + the page's users
+    query_budget = 4
 
-        # Sort combined list by timestamp descending (newest first)
-        feed_data.sort(key=lambda x: x['timestamp'], reverse=True)
+    def get(self, request):
+        limit = SocialPagination().get_page_size(request)
+        try:
+            after = int(request.query_params.get('after', 0))
+        except ValueError:
+            raise ValidationError({'after': 'Expected a user id.'})
+        ids = sorted(social.mutual_follows(request.user.id))
+        page = ids[bisect_right(ids, after):][:limit + 1]
+        users = User.objects.only(*SocialUserSerializer.Meta.fields).in_bulk(page[:limit])
+        next_link = None
+        if len(page) > limit:
+            next_link = replace_query_param(request.build_absolute_uri(), 'after', page[limit - 1])
+        return Response({
+            'next': next_link,
+            'results': SocialUserSerializer([users[pk] for pk in page[:limit] if pk in users], many=True).data,
+        })
+
+
+class FollowSuggestionsView(APIView):
+    """People you may know: friends of friends, ranked by mutual connections."""
+    permission_classes = (IsAuthenticated,)
+    # JWT user + own follows + friends' follows (when not cached) + most recent friends + users
+    query_budget = 5
+
+    def get(self, request):
+        limit = min(feed.parse_page_size(request.query_params.get('page_size')), social.SUGGESTION_LIMIT)
+        ranked = social.suggestions(request.user.id, limit=limit)
+        users = User.objects.only(*SocialUserSerializer.Meta.fields).in_bulk([pk for pk, _ in ranked])
+        return Response([
+            {**SocialUserSerializer(users[pk]).data, 'mutual_count': mutual_count}
+            for pk, mutual_count in ranked if pk in users
+        ])
+
+
+# --- 9. Activity Feed View (Page 17 Complex Query) ---
+# Served from the fan-out-on-write timeline (core/feed.py); pass ?cursor= from `next` for older items.
+# With FEED_READ_MODE = 'pull' the feed is merged from the source tables instead (?before= from next_before).
+class ActivityFeedView(APIView):
+    permission_classes = (IsAuthenticated,)
+    # Depends on FEED_READ_MODE, which can change at runtime
+    query_budget = classproperty(lambda cls: feed.read_query_budget())
+
+    def get(self, request):
+        limit = feed.parse_page_size(request.query_params.get('page_size'))
+
+        if feed.FEED_READ_MODE == 'pull':
+            before = request.query_params.get('before')
+            feed_data, next_before = feed.pull_feed(
+                request.user,
+                before=feed.parse_before(before) if before else None,
+                limit=limit,
+            )
+            return Response({"success": True, "data": feed_data, "next_before": next_before})
 
-        return Response({"success": True, "data": feed_data})
+        cursor = request.query_params.get('cursor')
+        items, next_cursor = feed.read_feed(
+            request.user,
+            cursor=feed.decode_cursor(cursor) if cursor else None,
+            limit=limit,
+        )
+        feed_data = [feed.serialize_item(item) for item in items]
+
+        return Response({"success": True, "data": feed_data, "next": next_cursor})
 
 
 # --- 10. Forum Views ---
 class ForumThreadListCreateView(generics.ListCreateAPIView):
     serializer_class = ForumThreadSerializer
     permission_classes = (IsAuthenticated,)
+    pagination_class = ForumPagination
+    # GET: JWT user + one page (username joined in); POST: user + game + insert
+    query_budget = {'GET': 2, 'POST': 3}
 
     def get_queryset(self):
         game_id = self.kwargs['game_id']
-        return ForumThread.objects.filter(game_id=game_id).order_by('-created_at')
+        return (
+            ForumThread.objects.filter(game_id=game_id)
+            .select_related('user')
+            .only(*ForumThreadSerializer.only_fields())
+        )
+
+    def get_keyset_ordering(self):
+        # Served by thread_game_activity_idx, however many threads the game has
+        return '-last_activity_at'
 
     def perform_create(self, serializer):
         game_id = self.kwargs['game_id']
         game = get_object_or_404(Game, pk=game_id)
-        serializer.save(user=self.request.user, game=game)
\ No newline at end of file
+        serializer.save(user=self.request.user, game=game)
+
+
+class ForumPostListCreateView(generics.ListCreateAPIView):
+    """A thread's replies, oldest first."""
+    serializer_class = ForumPostSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = ForumPagination
+    # POST: user + thread, then BEGIN / INSERT / counter UPDATE / COMMIT
+    query_budget = {'GET': 2, 'POST': 6}
+
+    def get_queryset(self):
+        return (
+            ForumPost.objects.filter(thread_id=self.kwargs['thread_id'])
+            .select_related('user')
+            .only(*ForumPostSerializer.only_fields())
+        )
+
+    def perform_create(self, serializer):
+        thread = get_object_or_404(ForumThread.objects.only('id'), pk=self.kwargs['thread_id'])
+        with transaction.atomic():
+            serializer.save(user=self.request.user, thread=thread)
+
+
+# --- 11. Metrics View ---
+# Per-route query and latency histograms collected by QueryProfilingMiddleware (this process only)
+class MetricsView(APIView):
+    permission_classes = (IsAdmin,)
+
+    def get(self, request):
+        return Response(registry.snapshot())
@@ -1,3 +1,5 @@
+import importlib.util
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -32,6 +34,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so Server-Timing covers the whole stack (core/middleware.py)
+    'core.middleware.QueryProfilingMiddleware',
+
     # CORS MIDDLEWARE: Must be placed BEFORE CommonMiddleware
     'corsheaders.middleware.CorsMiddleware', 
 
@@ -65,11 +70,58 @@ TEMPLATES = [
 WSGI_APPLICATION = 'game_space.wsgi.application'
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# Chosen from the environment: DB_ENGINE=sqlite (default, local development) or postgresql (production)
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    # DB_POOL=1 uses psycopg's connection pool, which replaces persistent connections
+    DB_POOL = os.environ.get('DB_POOL', '0') == '1'
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'gamespace'),
+            'USER': os.environ.get('DB_USER', 'gamespace'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Reuse connections across requests instead of reconnecting every time
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            # Verify a reused connection before the request uses it
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+                    'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+                    'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+                },
+            } if DB_POOL else {},
+        }
+    }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+            'OPTIONS': {
+                # Seconds to wait for a lock before failing with "database is locked"
+                'timeout': 20,
+                # Take the write lock at BEGIN, so concurrent writers queue on busy_timeout
+                # instead of failing when a read transaction tries to upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+            # File-backed test database, so tests run with the same WAL/locking behaviour
+            'TEST': {
+                'NAME': os.environ.get('DB_TEST_NAME', BASE_DIR / 'test_db.sqlite3'),
+            },
+        }
     }
+
+# Applied to every new SQLite connection by core.signals.configure_sqlite_connection
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',    # readers no longer block the writer (and vice versa)
+    'busy_timeout': 20000,    # milliseconds
+    'synchronous': 'NORMAL',  # safe with WAL, avoids an fsync on every commit
 }
 
 # Password validation
@@ -97,6 +149,9 @@ USE_TZ = True
 # Static files
 STATIC_URL = 'static/'
 
+# Default primary key field type
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
 # --- CUSTOM CONFIGURATIONS ---
 
 # 1. Use Custom User Model
@@ -118,12 +173,94 @@ REST_FRAMEWORK = {
         'rest_framework.renderers.BrowsableAPIRenderer',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.CachedJWTAuthentication',
     ),
+    # Token buckets in front of password hashing (core/throttling.py): N requests at once, refilled at N per period
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_account': '10/min',
+        'register_ip': '10/hour',
+    },
 }
 
 # 4. JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
-}
\ No newline at end of file
+}
+# 5. Activity Feed
+# 'timeline' = fan-out-on-write timelines, 'pull' = merge followed users' activity at read time
+FEED_READ_MODE = 'timeline'
+# Accounts with more followers than this are merged at read time instead of fanned out
+FEED_FANOUT_MAX_FOLLOWERS = 5000
+
+# 6. Trending (see core/trending.py)
+TRENDING_HALF_LIFE_DAYS = 7
+# Events younger than this are re-read by every refresh, so late commits are still counted
+TRENDING_SETTLE_SECONDS = 300
+
+# 7. Cache
+# Local-memory by default; set CACHE_DIR to share cached responses between worker processes
+if os.environ.get('CACHE_DIR'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'game-space',
+        }
+    }
+# Seconds a rendered public game response may be served from the cache (core/cache.py)
+RESPONSE_CACHE_TIMEOUT = 300
+
+# 8. JSON rendering
+# GameSpaceJSONRenderer encodes with orjson when it is installed; set False to force the stdlib encoder
+JSON_FAST_RENDERER = True
+
+# 9. Profiling
+# Query count / SQL / serialize / render timings per request: Server-Timing header + /api/_metrics
+PROFILING_ENABLED = True
+# Raise instead of logging when a request runs more queries than its view's query_budget
+# (QueryBudgetMixin turns this on for its tests)
+QUERY_BUDGET_STRICT = False
+
+# 10. Background jobs (core/tasks.py)
+# 'queue': rating aggregate updates and feed fan-out are stored as jobs and run by
+# `manage.py run_workers`; 'sync': they run inline in the writing request
+TASK_QUEUE_MODE = os.environ.get('TASK_QUEUE_MODE', 'queue')
+TASK_MAX_ATTEMPTS = 5
+
+# 11. Async views (core/async_views.py)
+# Serve the game list, game detail and activity feed with async views; game_space/asgi.py turns this on
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+
+# 12. Authentication (core/authentication.py)
+# Per-process cache of the user state JWTs are checked against; a user change made by
+# another process is seen within the TTL (seconds)
+AUTH_STATE_CACHE_SIZE = 10_000
+AUTH_STATE_CACHE_TTL = 60
+
+# 13. Password hashing (core/passwords.py)
+# New hashes use the first hasher: Argon2 when argon2-cffi is installed, else scrypt (both far
+# cheaper per request than PBKDF2 at equal strength). The others still verify existing hashes,
+# which are upgraded as their users log in. PASSWORD_HASHER=pbkdf2 keeps Django's default.
+PASSWORD_HASHER = os.environ.get('PASSWORD_HASHER', 'argon2' if importlib.util.find_spec('argon2') else 'scrypt')
+_PASSWORD_HASHERS = {
+    'argon2': 'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'scrypt': 'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER], *(
+    hasher for name, hasher in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+)]
+AUTHENTICATION_BACKENDS = ['core.backends.PooledModelBackend']
+# 'pool': hash on a process pool of PASSWORD_HASH_WORKERS processes (per server process), refusing
+# logins with a 503 once PASSWORD_HASH_MAX_PENDING are waiting; 'inline': on the request thread
+PASSWORD_HASH_MODE = os.environ.get('PASSWORD_HASH_MODE', 'pool')
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+PASSWORD_HASH_MAX_PENDING = 16
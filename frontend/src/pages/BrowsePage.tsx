@@ -15,6 +15,11 @@ interface Game {
     release_date: string;
 }
 
+interface PaginatedGames {
+    next: string | null;
+    results: Game[];
+}
+
 const GENRES = ["Action", "RPG", "Adventure", "Shooter", "Strategy", "Puzzle", "Sports", "Racing"];
 const SORT_OPTIONS = [
     { label: "Newest Releases", value: "-release_date" },
@@ -36,8 +41,10 @@ export default function BrowsePage() {
             if (search) params.append('search', search);
             if (genre) params.append('genre', genre);
             if (ordering) params.append('ordering', ordering);
+            params.append('compact', 'true');
+            params.append('page_size', '100');
             const response = await apiClient.get(`/games/?${params.toString()}`);
-            return response as unknown as Game[];
+            return (response as unknown as PaginatedGames).results;
         }
     });
 
@@ -14,20 +14,25 @@ interface Game {
     release_date: string;
 }
 
+interface PaginatedGames {
+    next: string | null;
+    results: Game[];
+}
+
 export default function HomePage() {
     const { data: trendingGames, isLoading: trendingLoading } = useQuery({
         queryKey: ['trendingGames'],
         queryFn: async () => {
-            const response = await apiClient.get('/games/?trending=true');
-            return response as unknown as Game[];
+            const response = await apiClient.get('/games/?trending=true&compact=true');
+            return (response as unknown as PaginatedGames).results;
         }
     });
 
     const { data: allGames, isLoading: allLoading } = useQuery({
         queryKey: ['allGames'],
         queryFn: async () => {
-            const response = await apiClient.get('/games/?ordering=-release_date');
-            return response as unknown as Game[];
+            const response = await apiClient.get('/games/?ordering=-release_date&compact=true');
+            return (response as unknown as PaginatedGames).results;
         }
     });
 